@@ -1,57 +1,159 @@
 """
 collect_results.py
 
-Parse raw timing data produced by run_tests.sh and compute average
-execution time and standard deviation for each workload, implementation
-and thread count.  The script reads files named caseX_results.csv
-in the data/ directory and writes corresponding summary files
-named caseX_summary.csv.  Each summary CSV contains columns:
-implementation, threads, average, stddev.
+Summarize the execution time of each workload, implementation and
+thread count, and write the summaries to caseX_summary.csv files in the
+data/ directory for inspection and for other tools.  The workloads are
+the cases of the experiment spec (experiments.json, including the
+points of its sweeps), plus any other case the database has samples
+for.  The samples come from the latest series of runs in
+data/results.db (see results_db.py); data directories from before the
+database are read from their caseX_results.csv files instead.  Each
+summary CSV contains columns: implementation, threads, metric, average,
+stddev, count, median, min, p95, ci95.
+
+metric names what the statistics describe: time (seconds per trial),
+or ops_per_sec for a series run with --duration, whose trials all take
+the same time.  count is the number of samples, p95 their 95th
+percentile (linearly interpolated) and ci95 the half-width of the 95%
+confidence interval of the mean, in the metric's unit.
+
+Any further columns of the samples (for example the latency percentiles
+recorded with run_experiments.py --latency, or the lock counters
+recorded with --lockstat) are averaged over the samples of each
+configuration and appended to the summary under the same names.
+Samples that left a column blank are skipped.
+
+A raw CSV is read once, in chunks of CHUNK_ROWS rows, with pandas.
+Each chunk is grouped by configuration in one vectorized step: the
+extra columns are reduced to per-group sums and counts that are merged
+across chunks, and only the times are kept, as packed doubles for the
+order statistics.  Long sweeps with millions of samples and dozens of
+columns therefore summarize in a single pass and in a few bytes per
+sample.
 
 Usage:
-    python3 collect_results.py
+    python3 collect_results.py [--data-dir DIR] [--spec FILE]
 
 This script expects to be executed from within the scripts/ directory
-or with the project root on the PYTHONPATH.  It uses only the
-standard library.
+or with the project root on the PYTHONPATH.
 """
 
+import argparse
 import csv
 import os
-import statistics
 
-def process_case(case_number: int, data_dir: str) -> None:
+import numpy as np
+import pandas as pd
+
+from experiments import load_spec, spec_path
+from results_db import KEY_COLUMNS, STAT_COLUMNS, Z_95, ResultsDB, db_path
+
+GROUP_COLUMNS = ['implementation', 'threads']
+# Rows read from a raw CSV at a time; bounds the memory of everything
+# but the packed times.
+CHUNK_ROWS = 1 << 20
+
+
+def read_groups(input_path):
+    """Read a results CSV chunk by chunk into per-configuration statistics.
+
+    Returns the times of each (implementation, threads) as one array,
+    and a frame of the mean of every extra column per configuration.
+    """
+    times = {}
+    sums = counts = None
+    for chunk in pd.read_csv(input_path, chunksize=CHUNK_ROWS, dtype={'implementation': str}):
+        extra = [c for c in chunk.columns if c not in KEY_COLUMNS]
+        chunk[['threads', 'time', *extra]] = chunk[['threads', 'time', *extra]].apply(pd.to_numeric,
+                                                                                      errors='coerce')
+        # A partially written final line from an interrupted run
+        chunk = chunk.dropna(subset=KEY_COLUMNS)
+        chunk['threads'] = chunk['threads'].astype(int)
+        grouped = chunk.groupby(GROUP_COLUMNS)
+        for key, values in grouped['time']:
+            times.setdefault(key, []).append(values.to_numpy(dtype=float))
+        if extra:
+            sums = grouped[extra].sum() if sums is None else sums.add(grouped[extra].sum(), fill_value=0)
+            counts = grouped[extra].count() if counts is None else counts.add(grouped[extra].count(), fill_value=0)
+    times = {key: np.concatenate(parts) for key, parts in times.items()}
+    means = sums / counts.where(counts > 0) if sums is not None else pd.DataFrame()
+    return times, means
+
+
+def summarize(times):
+    """Return the STAT_COLUMNS values of a non-empty array of times."""
+    n = len(times)
+    stddev = float(times.std(ddof=1)) if n > 1 else 0.0
+    median, p95 = np.quantile(times, (0.5, 0.95))
+    return (float(times.mean()), stddev, n, float(median), float(times.min()), float(p95),
+            Z_95 * stddev / np.sqrt(n))
+
+
+def write_summary(output_path, rows, extra_columns):
+    with open(output_path, 'w', newline='') as out:
+        writer = csv.writer(out)
+        writer.writerow(['implementation', 'threads', 'metric', *STAT_COLUMNS] + extra_columns)
+        for row in rows:
+            stats = [row['average'], row['stddev'], row['count'], row['median'], row['min'], row['p95'], row['ci95']]
+            writer.writerow([row['implementation'], row['threads'], row['metric']] +
+                            [v if isinstance(v, int) else f"{v:.6f}" for v in stats] +
+                            [f"{row[c]:.6f}" if row[c] is not None else '' for c in extra_columns])
+    print(f"Wrote summary to {output_path}")
+
+
+def process_db(db, case_number: int, data_dir: str, warn: bool = True) -> None:
+    rows = db.summary(case_number)
+    if not rows:
+        if warn:
+            print(f"Warning: no samples for case {case_number} in the latest series. Skipping.")
+        return
+    extra_columns = [c for c in rows[0] if c not in ('implementation', 'threads', 'metric', *STAT_COLUMNS)]
+    write_summary(os.path.join(data_dir, f"case{case_number}_summary.csv"), rows, extra_columns)
+
+
+def process_case(case_number: int, data_dir: str, warn: bool = True) -> None:
     input_path = os.path.join(data_dir, f"case{case_number}_results.csv")
     output_path = os.path.join(data_dir, f"case{case_number}_summary.csv")
     if not os.path.exists(input_path):
-        print(f"Warning: {input_path} does not exist. Skipping.")
+        if warn:
+            print(f"Warning: {input_path} does not exist. Skipping.")
         return
-    # Map (implementation, threads) -> list of times
-    results = {}
-    with open(input_path, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            impl = row['implementation']
-            threads = int(row['threads'])
-            time_val = float(row['time'])
-            results.setdefault((impl, threads), []).append(time_val)
-    # Write summary
-    with open(output_path, 'w', newline='') as out:
-        writer = csv.writer(out)
-        writer.writerow(['implementation', 'threads', 'average', 'stddev'])
-        for (impl, threads), times in sorted(results.items(), key=lambda x: (x[0][0], x[0][1])):
-            avg = sum(times) / len(times)
-            stddev = statistics.stdev(times) if len(times) > 1 else 0.0
-            writer.writerow([impl, threads, f"{avg:.6f}", f"{stddev:.6f}"])
-    print(f"Wrote summary to {output_path}")
+    times, means = read_groups(input_path)
+    extra_columns = list(means.columns)
+    rows = []
+    for impl, threads in sorted(times):
+        row = {'implementation': impl, 'threads': threads, 'metric': 'time'}
+        row.update(zip(STAT_COLUMNS, summarize(times[impl, threads])))
+        for c in extra_columns:
+            mean = means.at[(impl, threads), c] if (impl, threads) in means.index else np.nan
+            row[c] = None if pd.isna(mean) else float(mean)
+        rows.append(row)
+    write_summary(output_path, rows, extra_columns)
+
 
 def main():
     # Determine the project root based on this script's location
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.abspath(os.path.join(script_dir, '..'))
-    data_dir = os.path.join(project_root, 'data')
-    for case_number in (1, 2, 3):
-        process_case(case_number, data_dir)
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data'))
+    parser.add_argument('--spec', default=spec_path(project_root))
+    args = parser.parse_args()
+    data_dir = args.data_dir
+    try:
+        spec = load_spec(args.spec)
+    except ValueError as e:
+        parser.error(str(e))
+    # Sweep points are only run on request, so their absence is normal.
+    warn = {case.id: case.sweep is None for case in spec.cases.values()}
+    if os.path.exists(db_path(data_dir)):
+        with ResultsDB(db_path(data_dir)) as db:
+            for case_number in sorted(set(warn) | set(db.cases())):
+                process_db(db, case_number, data_dir, warn.get(case_number, False))
+        return
+    for case_number in sorted(warn):
+        process_case(case_number, data_dir, warn[case_number])
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
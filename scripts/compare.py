@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+compare.py
+
+Compare a candidate set of results against a baseline, configuration by
+configuration, and report which cells got significantly slower or
+faster.  A cell is one full configuration: case, n, m, operation mix,
+implementation and threads, so a case whose parameters changed between
+the two sides is not compared with its old self.
+
+Each side is one of
+    run:N       the samples of run N in the results database
+    series:N    the samples of every run in series N
+    latest      the latest series
+    DIR         a data directory from before the database, read from
+                whatever caseX_results.csv files it has; the case
+                parameters come from the experiment spec (--spec)
+
+For every cell present on both sides the script computes the ratio of
+the candidate's mean to the baseline's, a bootstrap 95% confidence
+interval of that ratio, and the two-sided Mann-Whitney U test (normal
+approximation with tie correction).  The p-values are adjusted with
+Holm's method over all cells, so a sweep of many cells does not raise
+false alarms by sheer number.  A cell is flagged as a regression or an
+improvement when its adjusted p-value is below --alpha and the change
+of the mean exceeds --threshold percent.
+
+The metric defaults to the one the compared series measure: time, or
+ops_per_sec (higher is better) for series run with --duration, whose
+trials all take the same time.  The exit status is 1 if any cell
+regressed, so the script can gate a merge:
+
+    python3 compare.py series:4 latest --threshold 5
+
+Mann-Whitney needs a handful of samples per side to ever reach
+significance (at least 4 each at alpha 0.05); cells with fewer are
+reported but never flagged.
+
+It uses only the standard library.
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+import re
+import statistics
+import sys
+
+from experiments import load_spec, spec_path
+from results_db import ResultsDB, db_path
+
+BOOTSTRAP_ROUNDS = 2000
+HIGHER_IS_BETTER = ('ops_per_sec',)
+
+
+def load_side(side, data_dir, spec, metric=None):
+    """Return ({configuration: [values]}, metric) for one side.
+
+    metric None picks the metric of the side's series ('time' for a
+    data directory).
+    """
+    if os.path.isdir(side):
+        return load_directory(side, spec, metric or 'time'), metric or 'time'
+    kind, _, number = side.partition(':')
+    if kind not in ('run', 'series', 'latest') or (kind != 'latest') != bool(number):
+        raise ValueError(f"'{side}' is not run:N, series:N, latest or a data directory")
+    path = db_path(data_dir)
+    if not os.path.exists(path):
+        raise ValueError(f"{path} does not exist")
+    with ResultsDB(path) as db:
+        if kind == 'run':
+            selector = {'run': int(number)}
+            series = db.series_of(int(number))
+        else:
+            series = int(number) if number else db.latest_series()
+            selector = {'series': series}
+        metric = metric or db.series_metric(series)
+        return db.configuration_samples(metric, **selector), metric
+
+
+def load_directory(path, spec, metric):
+    """Configurations of the caseX_results.csv files in a data directory."""
+    cells = {}
+    for name in sorted(os.listdir(path)):
+        match = re.fullmatch(r'case(\d+)_results\.csv', name)
+        if not match:
+            continue
+        case = spec.cases.get(int(match.group(1)))
+        if case is None:
+            print(f"Warning: case {match.group(1)} of {path} is not in {spec.path}. Skipping.", file=sys.stderr)
+            continue
+        config = (case.id, case.n, case.m, *case.mix)
+        with open(os.path.join(path, name), newline='') as f:
+            for row in csv.DictReader(f):
+                try:
+                    key = config + (row['implementation'], int(row['threads']))
+                    cells.setdefault(key, []).append(float(row[metric]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+    return cells
+
+
+def mann_whitney_p(a, b):
+    """Two-sided p-value of the Mann-Whitney U test, normal approximation."""
+    n1, n2 = len(a), len(b)
+    ranked = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j < len(ranked) and ranked[j][0] == ranked[i][0]:
+            j += 1
+        # Tied values share the average of their ranks (1-based).
+        rank = (i + j + 1) / 2
+        rank_sum += rank * sum(1 for _, side in ranked[i:j] if side == 0)
+        tie_term += (j - i) ** 3 - (j - i)
+        i = j
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # Continuity correction towards the mean of U.
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, 2 * (1 - statistics.NormalDist().cdf(max(z, 0.0))))
+
+
+def bootstrap_ratio_ci(base, cand, rng, rounds=BOOTSTRAP_ROUNDS):
+    """Percentile bootstrap 95% CI of mean(cand) / mean(base)."""
+    ratios = []
+    for _ in range(rounds):
+        b = statistics.fmean(rng.choices(base, k=len(base)))
+        c = statistics.fmean(rng.choices(cand, k=len(cand)))
+        if b > 0:
+            ratios.append(c / b)
+    if not ratios:
+        return math.nan, math.nan
+    ratios.sort()
+    return ratios[int(0.025 * (len(ratios) - 1))], ratios[int(0.975 * (len(ratios) - 1))]
+
+
+def holm(p_values):
+    """Holm-Bonferroni adjusted p-values, in the order given."""
+    order = sorted(range(len(p_values)), key=lambda i: p_values[i])
+    adjusted = [1.0] * len(p_values)
+    running = 0.0
+    for rank, i in enumerate(order):
+        running = max(running, min(1.0, (len(p_values) - rank) * p_values[i]))
+        adjusted[i] = running
+    return adjusted
+
+
+def compare(base, cand, metric, alpha, threshold, seed=0):
+    """Return one result dict per cell present on both sides."""
+    rng = random.Random(seed)
+    higher_is_better = metric in HIGHER_IS_BETTER
+    results = []
+    for key in sorted(set(base) & set(cand)):
+        a, b = base[key], cand[key]
+        mean_a, mean_b = statistics.fmean(a), statistics.fmean(b)
+        ratio = mean_b / mean_a if mean_a > 0 else math.nan
+        lo, hi = bootstrap_ratio_ci(a, b, rng)
+        results.append({'key': key, 'n_base': len(a), 'n_cand': len(b), 'base': mean_a, 'cand': mean_b,
+                        'ratio': ratio, 'ci': (lo, hi), 'p': mann_whitney_p(a, b)})
+    for result, p_adj in zip(results, holm([r['p'] for r in results])):
+        result['p_adj'] = p_adj
+        change = (result['ratio'] - 1) * 100
+        worse = change < -threshold if higher_is_better else change > threshold
+        better = change > threshold if higher_is_better else change < -threshold
+        if p_adj >= alpha or math.isnan(change):
+            result['verdict'] = ''
+        elif worse:
+            result['verdict'] = 'REGRESSION'
+        elif better:
+            result['verdict'] = 'improvement'
+        else:
+            result['verdict'] = ''
+    return results
+
+
+def print_table(results, metric):
+    print(f"{'case':>4} {'implementation':<12} {'T':>4} {'n':>7} {'baseline':>12} {'candidate':>12} "
+          f"{'change':>8} {'95% CI of ratio':>17} {'p (Holm)':>9}  verdict")
+    for r in results:
+        case, *_, impl, threads = r['key']
+        lo, hi = r['ci']
+        print(f"{case:>4} {impl:<12} {threads:>4} {r['n_base']:>3}/{r['n_cand']:<3} {r['base']:>12.6g} "
+              f"{r['cand']:>12.6g} {(r['ratio'] - 1) * 100:>+7.1f}% [{lo:>7.3f}, {hi:>7.3f}] "
+              f"{r['p_adj']:>9.4f}  {r['verdict']}")
+    print(f"Metric: {metric} ({'higher' if metric in HIGHER_IS_BETTER else 'lower'} is better)")
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.abspath(os.path.join(script_dir, '..'))
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline', help='run:N, series:N, latest or a legacy data directory')
+    parser.add_argument('candidate', help='run:N, series:N, latest or a legacy data directory')
+    parser.add_argument('--metric', choices=('time', 'ops_per_sec'),
+                        help='statistic to compare (default: the one the series measure)')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help='significance level after Holm adjustment (default: 0.05)')
+    parser.add_argument('--threshold', type=float, default=5.0, metavar='PCT',
+                        help='smallest change of the mean worth flagging, in percent (default: 5)')
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data'))
+    parser.add_argument('--spec', default=spec_path(project_root),
+                        help='experiment spec giving the cases of legacy data directories')
+    args = parser.parse_args()
+
+    try:
+        spec = load_spec(args.spec)
+        base, metric = load_side(args.baseline, args.data_dir, spec, args.metric)
+        cand, cand_metric = load_side(args.candidate, args.data_dir, spec, args.metric)
+    except ValueError as e:
+        parser.error(str(e))
+    if cand_metric != metric:
+        parser.error(f"the baseline measures {metric} and the candidate {cand_metric}; choose one with --metric")
+    results = compare(base, cand, metric, args.alpha, args.threshold)
+    if not results:
+        print("No configuration has samples on both sides.", file=sys.stderr)
+        return 2
+    print_table(results, metric)
+    regressions = [r for r in results if r['verdict'] == 'REGRESSION']
+    improvements = [r for r in results if r['verdict'] == 'improvement']
+    print(f"{len(regressions)} regressions, {len(improvements)} improvements in {len(results)} cells.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+experiments.py
+
+The experiment spec: the workloads the benchmark measures, read from
+experiments.json at the project root (or --spec FILE) by every stage,
+from run_experiments.py to generate_report.py.  Adding a case or a
+sweep means editing that file and nothing else.
+
+The file holds two lists:
+
+cases   single workloads, run by default:
+            {"id": 1, "name": "Read-Heavy Workload",
+             "n": 1000, "m": 10000, "mix": [0.99, 0.005, 0.005]}
+        id is the case number in the results database, n the initial
+        list size, m the operation count and mix the member, insert
+        and delete fractions.  Optional: key_range (keys are drawn from
+        [0, key_range), default 65536), threads (a list of numbers,
+        "nproc" or e.g. "2nproc"; default: the driver's sweep) and notes
+        (a sentence on the case for the report).
+sweeps  scaling curves, run with run_experiments.py --sweeps NAME:
+            {"name": "size", "title": "List size, read-heavy",
+             "first_id": 101, "n": [1e3, 1e4, 1e5, 1e6], "m": 1e5,
+             "mix": [0.99, 0.005, 0.005], "key_range": 4194304}
+        Exactly one of n, m and key_range is a list, the axis of the
+        sweep; every value becomes a case of its own, numbered
+        first_id, first_id + 1, ... in list order.  The other keys are
+        those of a case.
+
+Every case must fit the key distribution it runs with: n unique keys
+in its key range, and at most 2^24 keys under zipf.  load_spec() checks
+the cases against the driver's --keys and --key-range; sweep points
+that do not fit are skipped with a message, while a stand-alone case
+that does not fit is an error.
+
+Numbers may be written as 1e6.  A top-level "threads" list sets the
+default thread counts of every case.  The results database keys
+samples by case id, so a case whose parameters change should get a new
+id (or be rerun with --fresh) rather than resume its old samples.
+
+It uses only the standard library.
+"""
+
+import json
+import os
+import sys
+
+SPEC_NAME = 'experiments.json'
+SWEEP_AXES = ('n', 'm', 'key_range')
+# Keep in sync with WORKLOAD_KEY_SPACE, WORKLOAD_MAX_KEY_RANGE and
+# WORKLOAD_MAX_ZIPF_RANGE in src/include/workload.h.
+DEFAULT_KEY_RANGE = 1 << 16
+MAX_KEY_RANGE = 1 << 30
+MAX_ZIPF_RANGE = 1 << 24
+
+
+class Case:
+    """One workload: list size, operation count, mix and key range."""
+
+    def __init__(self, id, name, n, m, mix, key_range=None, threads=None, notes=None, sweep=None):
+        self.id = id
+        self.name = name
+        self.n = n
+        self.m = m
+        self.mix = mix
+        self.key_range = key_range
+        self.threads = threads
+        self.notes = notes
+        self.sweep = sweep
+
+    @property
+    def params(self):
+        """Positional arguments of the binaries: n, m, member, insert, delete."""
+        return (str(self.n), str(self.m)) + tuple(format(f, 'g') for f in self.mix)
+
+    @property
+    def options(self):
+        """Binary options the case needs besides its positional arguments."""
+        return ['--key-range', str(self.key_range)] if self.key_range is not None else []
+
+    def describe(self):
+        """n=1000, m=10000, 99% member / 0.5% insert / 0.5% delete"""
+        member, insert, delete = (format(f * 100, 'g') for f in self.mix)
+        text = f"n={self.n}, m={self.m}, {member}% member / {insert}% insert / {delete}% delete"
+        if self.key_range is not None:
+            text += f", keys in [0, {self.key_range})"
+        return text
+
+    def title(self):
+        """Plot title, e.g. 'Case 1: 99% Member, 0.5% Insert, 0.5% Delete'."""
+        member, insert, delete = (format(f * 100, 'g') for f in self.mix)
+        if self.sweep is None:
+            return f"Case {self.id}: {member}% Member, {insert}% Insert, {delete}% Delete"
+        return f"Case {self.id} ({self.sweep.title}): {self.describe()}"
+
+
+class Sweep:
+    """A family of cases that differ in one parameter, the axis."""
+
+    def __init__(self, name, title, axis, cases):
+        self.name = name
+        self.title = title
+        self.axis = axis
+        self.cases = cases
+
+    def value(self, case):
+        return getattr(case, self.axis)
+
+
+class Spec:
+    def __init__(self, cases, sweeps, path):
+        self.cases = cases                 # id -> Case, in file order
+        self.sweeps = sweeps               # name -> Sweep, in file order
+        self.path = path
+
+    def case_ids(self):
+        """Ids of the stand-alone cases, the default selection."""
+        return [c.id for c in self.cases.values() if c.sweep is None]
+
+    def sweep_ids(self, names):
+        return [c.id for name in names for c in self.sweeps[name].cases]
+
+
+def spec_path(project_root):
+    return os.path.join(project_root, SPEC_NAME)
+
+
+def _integer(value, what, low=0):
+    # JSON has no integer exponent syntax, so 1e6 arrives as a float.
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value) or value < low:
+        raise ValueError(f"{what} must be an integer >= {low}, not {value!r}")
+    return int(value)
+
+
+def key_range_error(case, keys=None):
+    """Why the binaries would reject case with key distribution keys
+    (a --keys spec, None for uniform), or None if they accept it."""
+    key_range = case.key_range or DEFAULT_KEY_RANGE
+    if not 1 <= key_range <= MAX_KEY_RANGE:
+        return f"key_range must be between 1 and {MAX_KEY_RANGE}"
+    if case.n > key_range:
+        return f"n={case.n} unique keys do not fit in a key range of {key_range}"
+    if keys is not None and keys.split(':')[0] == 'zipf' and key_range > MAX_ZIPF_RANGE:
+        return f"zipf keys support a key range of at most {MAX_ZIPF_RANGE}, not {key_range}"
+    return None
+
+
+def _case(entry, where, defaults, sweep=None):
+    unknown = set(entry) - {'id', 'name', 'n', 'm', 'mix', 'key_range', 'threads', 'notes'}
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {', '.join(sorted(unknown))}")
+    for key in ('id', 'n', 'm', 'mix'):
+        if key not in entry:
+            raise ValueError(f"{where}: missing '{key}'")
+    mix = entry['mix']
+    if (not isinstance(mix, list) or len(mix) != 3 or
+            not all(isinstance(f, (int, float)) and 0 <= f <= 1 for f in mix) or abs(sum(mix) - 1) > 1e-6):
+        raise ValueError(f"{where}: mix must be three fractions (member, insert, delete) summing to 1")
+    n = _integer(entry['n'], f"{where}: n")
+    m = _integer(entry['m'], f"{where}: m", 1)
+    key_range = entry.get('key_range')
+    if key_range is not None:
+        key_range = _integer(key_range, f"{where}: key_range", 1)
+    threads = entry.get('threads', defaults.get('threads'))
+    if threads is not None and (not isinstance(threads, list) or not threads):
+        raise ValueError(f"{where}: threads must be a non-empty list")
+    return Case(_integer(entry['id'], f"{where}: id", 1), entry.get('name', f"Case {entry['id']}"),
+                n, m, [float(f) for f in mix], key_range, threads, entry.get('notes'), sweep)
+
+
+def load_spec(path, keys=None, key_range=None):
+    """Read and check an experiment spec; raise ValueError if it is invalid.
+
+    keys and key_range are the driver's --keys and --key-range, if any;
+    key_range replaces the key range of every case.
+    """
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"cannot read experiment spec {path}: {e}")
+    defaults = {'threads': raw.get('threads')}
+    cases = {}
+
+    def add(case, where):
+        if case.id in cases:
+            raise ValueError(f"{where}: case id {case.id} is already used")
+        if key_range is not None:
+            case.key_range = key_range
+        error = key_range_error(case, keys)
+        if error is None:
+            cases[case.id] = case
+        elif case.sweep is None:
+            raise ValueError(f"{where}: {error}")
+        else:
+            print(f"Warning: {where}: skipping case {case.id}, {error}", file=sys.stderr)
+        return error is None
+
+    for i, entry in enumerate(raw.get('cases', [])):
+        add(_case(entry, f"{path}: cases[{i}]", defaults), f"{path}: cases[{i}]")
+    sweeps = {}
+    for i, entry in enumerate(raw.get('sweeps', [])):
+        where = f"{path}: sweeps[{i}]"
+        name = entry.get('name')
+        if not name or name in sweeps:
+            raise ValueError(f"{where}: every sweep needs a unique name")
+        axes = [a for a in SWEEP_AXES if isinstance(entry.get(a), list)]
+        if len(axes) != 1:
+            raise ValueError(f"{where}: exactly one of {', '.join(SWEEP_AXES)} must be a list")
+        axis = axes[0]
+        first_id = _integer(entry.get('first_id'), f"{where}: first_id", 1)
+        sweep = Sweep(name, entry.get('title', name), axis, [])
+        base = {k: v for k, v in entry.items() if k not in ('name', 'title', 'first_id', axis)}
+        for j, value in enumerate(entry[axis]):
+            case = _case(dict(base, id=first_id + j, **{axis: value}), f"{where}: {axis}[{j}]", defaults, sweep)
+            case.name = f"{sweep.title}, {axis}={sweep.value(case)}"
+            if add(case, f"{where}: {axis}[{j}]"):
+                sweep.cases.append(case)
+        sweeps[name] = sweep
+    if not cases:
+        raise ValueError(f"{path} defines no cases")
+    return Spec(cases, sweeps, path)
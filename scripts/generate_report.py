@@ -7,6 +7,21 @@ import re
 import pandas as pd
 import numpy as np
 
+from experiments import load_spec, spec_path
+from results_db import load_summary
+
+# Implementations in report order with their table headings
+IMPLEMENTATIONS = [
+    ('serial', 'Serial'),
+    ('mutex', 'Mutex'),
+    ('rwlock', 'RW-lock'),
+    ('finegrained', 'Fine-grained'),
+    ('optimistic', 'Optimistic'),
+    ('lazy', 'Lazy'),
+    ('lockfree', 'Lock-free'),
+    ('flatcombining', 'Flat combining'),
+]
+
 def get_system_specs():
     """Gather system specifications. Prefer data/specs.txt; else probe system."""
     import os, platform, subprocess, re, shutil
@@ -167,59 +182,70 @@ def get_system_specs():
 
     return specs
 
-def load_data():
-    data = {'summaries': {}, 'raws': {}}
-    for i in range(1, 4):
-        try:
-            data['summaries'][i] = pd.read_csv(f"data/case{i}_summary.csv")
-        except FileNotFoundError:
-            data['summaries'][i] = pd.DataFrame()
-        try:
-            data['raws'][i] = pd.read_csv(f"data/case{i}_results.csv")
-        except FileNotFoundError:
-            data['raws'][i] = pd.DataFrame()
+def tex(text):
+    """Escape the LaTeX specials that case names and descriptions use."""
+    return text.replace('\\', '\\textbackslash{}').replace('%', '\\%').replace('_', '\\_').replace('&', '\\&')
+
+def load_data(spec):
+    # The summaries carry sample counts and CIs, so raw samples are not read.
+    data = {'spec': spec, 'summaries': {}}
+    for i in spec.cases:
+        data['summaries'][i] = pd.DataFrame(load_summary("data", i))
     return data
 
+def units(summary_df):
+    """Heading unit and scale of a summary's average column: time in µs,
+    or throughput in Mops/s for a series run with --duration."""
+    if summary_df['metric'].iloc[0] == 'ops_per_sec':
+        return 'Mops/s', 1e-6
+    return 'µs', 1_000_000
+
 def precompute_metrics(data):
     metrics = {}
-    for i in range(1, 4):
+    for i in data['summaries']:
         summary_df = data['summaries'][i]
-        raw_df = data['raws'][i]
         if summary_df.empty:
-            metrics[i] = None
+            # Sweeps run on request; only missing cases count against the CI target.
+            if data['spec'].cases[i].sweep is None:
+                metrics[i] = None
             continue
-        worst_ci = 0.0
-        for _, row in summary_df.iterrows():
-            k = len(raw_df[(raw_df['implementation'] == row['implementation']) & (raw_df['threads'] == row['threads'])])
-            if k > 0:
-                mean, stddev = row['average'], row['stddev']
-                if not pd.isna(mean) and not pd.isna(stddev) and mean > 0:
-                    ci = (1.96 * stddev / np.sqrt(k)) / mean * 100
-                    if ci > worst_ci:
-                        worst_ci = ci
+        # Sample counts and CIs come straight from the summary rows.
+        valid = summary_df[(summary_df['count'] > 0) & (summary_df['average'] > 0)]
+        worst_ci = (valid['ci95'] / valid['average'] * 100).max() if not valid.empty else 0.0
+        samples = (int(summary_df['count'].min()), int(summary_df['count'].sum()))
+        # Scaling is read off between 1 thread and the widest run of the sweep.
+        t_max = int(summary_df['threads'].max())
         t1 = summary_df[summary_df['threads'] == 1]
-        t8 = summary_df[summary_df['threads'] == 8]
+        t8 = summary_df[summary_df['threads'] == t_max]
         def get_val(df, impl, col):
             val = df[df['implementation'] == impl][col]
             return val.iloc[0] if not val.empty else np.nan
+        def get_cost(df, impl):
+            # Scaling and speedups compare costs: the time, or 1/throughput.
+            val = get_val(df, impl, 'average')
+            return 1 / val if summary_df['metric'].iloc[0] == 'ops_per_sec' else val
+        unit, scale = units(summary_df)
+        s1_avg = get_val(t1, 'serial', 'average')
         m1_avg = get_val(t1, 'mutex', 'average')
-        m8_avg = get_val(t8, 'mutex', 'average')
         r1_avg = get_val(t1, 'rwlock', 'average')
-        r8_avg = get_val(t8, 'rwlock', 'average')
-        s1_avg = get_val(t1, 'serial', 'average')
-        mutex_scaling = ((m8_avg - m1_avg) / m1_avg * 100) if not pd.isna(m1_avg) and m1_avg > 0 else np.nan
-        rwlock_scaling = ((r8_avg - r1_avg) / r1_avg * 100) if not pd.isna(r1_avg) and r1_avg > 0 else np.nan
-        speedup_t8 = (m8_avg / r8_avg) if not pd.isna(m8_avg) and not pd.isna(r8_avg) and r8_avg > 0 else np.nan
+        m1_cost, m8_cost = get_cost(t1, 'mutex'), get_cost(t8, 'mutex')
+        r1_cost, r8_cost = get_cost(t1, 'rwlock'), get_cost(t8, 'rwlock')
+        f8_cost = get_cost(t8, 'finegrained')
+        mutex_scaling = ((m8_cost - m1_cost) / m1_cost * 100) if not pd.isna(m1_cost) and m1_cost > 0 else np.nan
+        rwlock_scaling = ((r8_cost - r1_cost) / r1_cost * 100) if not pd.isna(r1_cost) and r1_cost > 0 else np.nan
+        speedup_t8 = (m8_cost / r8_cost) if not pd.isna(m8_cost) and not pd.isna(r8_cost) and r8_cost > 0 else np.nan
+        fg_speedup_t8 = (m8_cost / f8_cost) if not pd.isna(m8_cost) and not pd.isna(f8_cost) and f8_cost > 0 else np.nan
         metrics[i] = {
-            'worst_ci': worst_ci, 's1_avg': s1_avg, 'm1_avg': m1_avg, 'r1_avg': r1_avg,
-            'mutex_scaling': mutex_scaling, 'rwlock_scaling': rwlock_scaling, 'speedup_t8': speedup_t8
+            'worst_ci': worst_ci, 'samples': samples, 's1_avg': s1_avg, 'm1_avg': m1_avg, 'r1_avg': r1_avg,
+            'mutex_scaling': mutex_scaling, 'rwlock_scaling': rwlock_scaling, 'speedup_t8': speedup_t8,
+            'fg_speedup_t8': fg_speedup_t8, 't_max': t_max, 'unit': unit, 'scale': scale
         }
     return metrics
 
 def fmt(val, p=2):
     return f"{val:.{p}f}" if not pd.isna(val) else "---"
 
-def generate_page1(specs):
+def generate_page1(specs, spec):
     # Handle the case where specs are read from a file
     if "raw" in specs:
         system_info = f"\\begin{{verbatim}}\n{specs['raw']}\n\\end{{verbatim}}"
@@ -252,6 +278,11 @@ def generate_page1(specs):
 {col2_content}
 \\end{{minipage}}"""
 
+    workloads = [f"  \\item Case {c.id}: {tex(c.describe())}" for c in spec.cases.values() if c.sweep is None]
+    workloads += [f"  \\item Sweep \\texttt{{{tex(sw.name)}}} (cases {sw.cases[0].id}--{sw.cases[-1].id}): {tex(sw.title)}, "
+                  f"{tex(sw.axis)} $\\in \\{{{', '.join(str(sw.value(c)) for c in sw.cases)}\\}}$"
+                  for sw in spec.sweeps.values()]
+    workloads = "\n".join(workloads)
     return f"""\\documentclass{{article}}
 \\usepackage{{graphicx,booktabs,geometry,amsmath,enumitem}}
 \\geometry{{a4paper,margin=1in}}
@@ -269,48 +300,143 @@ We implemented a singly linked list supporting:
   \\item \\texttt{{Insert}} (unique keys only)
   \\item \\texttt{{Delete}}
 \\end{{itemize}}
-Three variants were tested:
+The following variants were tested:
 \\begin{{itemize}}[noitemsep,topsep=0pt]
   \\item Serial (no locks)
   \\item Pthreads + single mutex
   \\item Pthreads + single read--write lock
+  \\item Pthreads + per-node mutexes (hand-over-hand lock coupling)
+  \\item Optimistic synchronization (lock-free search, lock and validate)
+  \\item Lazy synchronization (marked nodes, lock-free \\texttt{{Member}})
+  \\item Lock-free Harris--Michael list (CAS, epoch-based reclamation)
+  \\item Flat combining (threads publish requests; one combiner serves each batch in a single traversal)
+\\end{{itemize}}
+Each workload starts from a list of $n$ unique random keys (in $[0, 2^{{16}}-1]$ unless stated otherwise)
+and runs $m$ operations with the given fractions, distributed across $T$ threads, from 1 up to the widest
+run in the tables (by default powers of two up to $\\max(8, \\mathit{{nproc}})$).
+The workloads are defined in \\texttt{{experiments.json}}:
+\\begin{{itemize}}[noitemsep,topsep=0pt]
+{workloads}
 \\end{{itemize}}
-Initialization: $n=1000$ unique keys in $[0, 2^{{16}}-1]$.
-Workloads: $m=10000$ operations with given fractions, distributed across $T \\in \\{{1,2,4,8\\}}$ threads.
 Timing measures only the $m$-operations region, not initialization.
 \\newpage
 """
 
+def generate_throughput_table(case_num, summary_df, impls):
+    """Steady-state throughput table, if the runs used --duration."""
+    if 'ops_per_sec' not in summary_df.columns:
+        return None
+    header = " & ".join(["\\textbf{Threads}"] + [f"\\textbf{{{label} (Mops/s)}}" for _, label in impls])
+    table = ["\\begin{table}[h!]", "\\centering", "\\resizebox{\\textwidth}{!}{%", f"\\begin{{tabular}}{{{'c' * (len(impls) + 1)}}}", "\\toprule",
+             header + " \\\\", "\\midrule"]
+    for t in sorted(summary_df['threads'].unique()):
+        row = [str(t)]
+        for impl, _ in impls:
+            d = summary_df[(summary_df['implementation'] == impl) & (summary_df['threads'] == t)]
+            if d.empty or pd.isna(d['ops_per_sec'].iloc[0]):
+                row.append("---")
+            else:
+                row.append(f"{fmt(d['ops_per_sec'].iloc[0] / 1e6, 3)} (J={fmt(d['fairness'].iloc[0], 3)})")
+        table.append(" & ".join(row) + " \\\\")
+    table.extend(["\\bottomrule", "\\end{tabular}}",
+                  f"\\caption{{Throughput for Case {case_num} in fixed-duration runs; J is Jain's fairness index over per-thread operation counts.}}",
+                  f"\\label{{tab:case{case_num}_throughput}}", "\\end{table}"])
+    return "\n".join(table)
+
+def generate_perf_table(case_num, summary_df, impls, m=10000):
+    """IPC, miss rates and scheduler events at the highest thread count, if --perf columns exist."""
+    if 'context_switches' not in summary_df.columns:
+        return None
+    t = summary_df['threads'].max()
+    header = " & ".join(["\\textbf{Implementation}", "\\textbf{IPC}", "\\textbf{Cache miss/op}",
+                         "\\textbf{LLC miss/op}", "\\textbf{Ctx switches}", "\\textbf{Migrations}"])
+    table = ["\\begin{table}[h!]", "\\centering", "\\small", "\\begin{tabular}{lccccc}", "\\toprule",
+             header + " \\\\", "\\midrule"]
+    for impl, label in impls:
+        d = summary_df[(summary_df['implementation'] == impl) & (summary_df['threads'] == t)]
+        if d.empty:
+            continue
+        # Fixed-duration runs record how many operations they completed.
+        ops = d['ops'].iloc[0] if 'ops' in d.columns and not pd.isna(d['ops'].iloc[0]) else m
+        def cell(col, per_op=False, p=2):
+            if col not in d.columns or pd.isna(d[col].iloc[0]):
+                return "---"
+            val = d[col].iloc[0]
+            return fmt(val / ops if per_op else val, p)
+        table.append(" & ".join([label, cell('ipc'), cell('cache_misses', True), cell('llc_misses', True),
+                                 cell('context_switches', p=0), cell('cpu_migrations', p=0)]) + " \\\\")
+    table.extend(["\\bottomrule", "\\end{tabular}",
+                  f"\\caption{{Hardware counters for Case {case_num} at {t} threads (mean over samples; --- where the counter was unavailable).}}",
+                  f"\\label{{tab:case{case_num}_perf}}", "\\end{table}"])
+    return "\n".join(table)
+
+def generate_latency_table(case_num, summary_df, impls):
+    """Tail-latency table at the highest thread count, if --latency columns exist."""
+    if 'member_p50_ns' not in summary_df.columns:
+        return None
+    t = summary_df['threads'].max()
+    columns = [('p50', ''), ('p99', ''), ('p999', ''), ('max', ''), ('p99', '_wait'), ('p99', '_hold')]
+    header = " & ".join(["\\textbf{Implementation}", "\\textbf{Op}", "\\textbf{p50}", "\\textbf{p99}",
+                         "\\textbf{p99.9}", "\\textbf{max}", "\\textbf{wait p99}", "\\textbf{hold p99}"])
+    table = ["\\begin{table}[h!]", "\\centering", "\\small", "\\begin{tabular}{llcccccc}", "\\toprule",
+             header + " \\\\", "\\midrule"]
+    for impl, label in impls:
+        d = summary_df[(summary_df['implementation'] == impl) & (summary_df['threads'] == t)]
+        if d.empty:
+            continue
+        for op in ('member', 'insert', 'delete'):
+            row = [label, op]
+            for stat, kind in columns:
+                col = f"{op}{kind}_{stat}_ns"
+                val = d[col].iloc[0] if col in d.columns else float('nan')
+                row.append("---" if pd.isna(val) else fmt(val / 1000, 2))
+            table.append(" & ".join(row) + " \\\\")
+    table.extend(["\\bottomrule", "\\end{tabular}",
+                  f"\\caption{{Per-operation latency for Case {case_num} at {t} threads (µs, mean over samples).}}",
+                  f"\\label{{tab:case{case_num}_latency}}", "\\end{table}"])
+    return "\n".join(table)
+
 def generate_page2(data, metrics):
     content = ["\\section*{Experiment Report (Overview Tables)}"]
-    case_titles = [
-        "n=1000, m=10000, m\\_member=0.99, m\\_insert=0.005, m\\_delete=0.005",
-        "n=1000, m=10000, m\\_member=0.90, m\\_insert=0.05, m\\_delete=0.05",
-        "n=1000, m=10000, m\\_member=0.50, m\\_insert=0.25, m\\_delete=0.25"
-    ]
-    for i in range(1, 4):
+    for i in data['spec'].case_ids():
         summary_df = data['summaries'][i]
-        content.append(f"\\subsection*{{Case {i}: {case_titles[i-1]}}}")
+        content.append(f"\\subsection*{{Case {i}: {tex(data['spec'].cases[i].describe())}}}")
         if summary_df.empty:
             content.append("Data not available for this case.\\\\")
             continue
-        table = ["\\begin{table}[h!]", "\\centering", "\\begin{tabular}{cccc}", "\\toprule",
-                 "\\textbf{Threads} & \\textbf{Serial (µs)} & \\textbf{Mutex (µs)} & \\textbf{RW-lock (µs)} \\\\", "\\midrule"]
+        impls = [(impl, label) for impl, label in IMPLEMENTATIONS if impl in set(summary_df['implementation'])]
+        unit, scale = units(summary_df)
+        header = " & ".join(["\\textbf{Threads}"] + [f"\\textbf{{{label} ({unit})}}" for _, label in impls])
+        table = ["\\begin{table}[h!]", "\\centering", "\\resizebox{\\textwidth}{!}{%", f"\\begin{{tabular}}{{{'c' * (len(impls) + 1)}}}", "\\toprule",
+                 header + " \\\\", "\\midrule"]
         for t in sorted(summary_df['threads'].unique()):
             row = [str(t)]
-            for impl in ['serial', 'mutex', 'rwlock']:
+            for impl, _ in impls:
                 d = summary_df[(summary_df['implementation'] == impl) & (summary_df['threads'] == t)]
                 if not d.empty:
-                    avg, std = d['average'].iloc[0] * 1_000_000, d['stddev'].iloc[0] * 1_000_000
+                    avg, std = d['average'].iloc[0] * scale, d['stddev'].iloc[0] * scale
                     row.append(f"{fmt(avg, 2)} $\\pm$ {fmt(std, 2)}")
                 else:
                     row.append("---")
             table.append(" & ".join(row) + " \\\\")
-        table.extend(["\\bottomrule", "\\end{tabular}", f"\\caption{{Summary of results for Case {i}.}}", f"\\label{{tab:case{i}}}", "\\end{table}"])
+        table.extend(["\\bottomrule", "\\end{tabular}}", f"\\caption{{Summary of results for Case {i}.}}", f"\\label{{tab:case{i}}}", "\\end{table}"])
         content.append("\n".join(table))
+        throughput_table = generate_throughput_table(i, summary_df, impls)
+        if throughput_table:
+            content.append(throughput_table)
+        perf_table = generate_perf_table(i, summary_df, impls, data['spec'].cases[i].m)
+        if perf_table:
+            content.append(perf_table)
+        latency_table = generate_latency_table(i, summary_df, impls)
+        if latency_table:
+            content.append(latency_table)
     content.append("\\paragraph{Sampling/Confidence}")
+    counted = [m['samples'] for m in metrics.values() if m]
+    if counted:
+        content.append(f"The tables summarize {sum(total for _, total in counted)} samples, "
+                       f"at least {min(low for low, _ in counted)} per configuration.")
     ci_ok = True
-    for i in range(1, 4):
+    for i in metrics:
         if metrics[i] and metrics[i]['worst_ci'] > 5.0:
             ci_ok = False
             content.append(f"For Case {i}, the worst relative CI was {fmt(metrics[i]['worst_ci'])}%, which exceeds the 5% target.")
@@ -321,14 +447,9 @@ def generate_page2(data, metrics):
     content.append("\\newpage")
     return "\n".join(content)
 
-def generate_case_analysis_section(case_num, metrics):
-    case_titles = ["Read-Heavy Workload", "Balanced Workload", "Write-Heavy Workload"]
-    workload_insights = [
-        "This workload is read-heavy (99% member operations), which explains the significant performance advantage of the rw-lock, as it allows for concurrent reads.",
-        "With a higher write fraction (10%), the advantage of rw-lock diminishes. The data suggests that for this particular workload and system, the overhead of the rw-lock is greater than its benefit from concurrent reads.",
-        "In this write-heavy scenario (50% insert/delete), both locking strategies suffer from contention as writes are serialized. The rw-lock's performance is worse than the mutex, indicating that its more complex logic adds significant overhead that is not offset by parallelism in read operations."
-    ]
-    content = [f"\\subsection*{{Case {case_num}: {case_titles[case_num-1]}}}"]
+def generate_case_analysis_section(case, metrics):
+    case_num = case.id
+    content = [f"\\subsection*{{Case {case_num}: {tex(case.name)}}}"]
     content.append(f"\\begin{{figure}}[h!]\n\\centering\n\\includegraphics[width=0.9\\textwidth]{{report/graphs/case{case_num}_plot.png}}\n\\caption{{Average time vs. threads for Case {case_num}.}}\n\\label{{fig:case{case_num}}}\n\\end{{figure}}")
     m = metrics[case_num]
     if not m:
@@ -336,22 +457,58 @@ def generate_case_analysis_section(case_num, metrics):
         return "\n".join(content)
     analysis = [
         "\\paragraph{Analysis}",
-        f"As shown in Table~\\ref{{tab:case{case_num}}} and Figure~\\ref{{fig:case{case_num}}}, at 1 thread, serial is fastest ({fmt(m['s1_avg'] * 1_000_000, 2)}µs) vs mutex ({fmt(m['m1_avg'] * 1_000_000, 2)}µs) and rw-lock ({fmt(m['r1_avg'] * 1_000_000, 2)}µs).",
-        f"From 1 to 8 threads, mutex changes by {fmt(m['mutex_scaling'])}% and rw-lock by {fmt(m['rwlock_scaling'])}%.",
-        f"At 8 threads, rw-lock is {fmt(m['speedup_t8'])}x faster than mutex.",
-        workload_insights[case_num-1]
+        f"As shown in Table~\\ref{{tab:case{case_num}}} and Figure~\\ref{{fig:case{case_num}}}, at 1 thread, serial is fastest ({fmt(m['s1_avg'] * m['scale'], 2)} {m['unit']}) vs mutex ({fmt(m['m1_avg'] * m['scale'], 2)} {m['unit']}) and rw-lock ({fmt(m['r1_avg'] * m['scale'], 2)} {m['unit']}).",
+        f"From 1 to {m['t_max']} threads, mutex changes by {fmt(m['mutex_scaling'])}% and rw-lock by {fmt(m['rwlock_scaling'])}%.",
+        f"At {m['t_max']} threads, rw-lock is {fmt(m['speedup_t8'])}x faster than mutex.",
     ]
+    if not pd.isna(m['fg_speedup_t8']):
+        analysis.append(f"Hand-over-hand locking is {fmt(m['fg_speedup_t8'])}x faster than the single mutex at {m['t_max']} threads.")
+    if case.notes:
+        analysis.append(tex(case.notes))
     content.append("\n".join(analysis))
     return "\n".join(content)
 
-def generate_page3(metrics):
-    return "\\section*{Case Analyses with Plots}\n" + generate_case_analysis_section(1, metrics) + "\n\\newpage"
-
-def generate_page4(metrics):
-    return generate_case_analysis_section(2, metrics) + "\n\\newpage"
-
-def generate_page5(metrics):
-    return generate_case_analysis_section(3, metrics) + "\n\\newpage"
+def generate_case_pages(spec, metrics):
+    """One page of analysis per stand-alone case of the spec."""
+    pages = [generate_case_analysis_section(spec.cases[i], metrics) + "\n\\newpage" for i in spec.case_ids()]
+    return "\\section*{Case Analyses with Plots}\n" + "\n".join(pages)
+
+def generate_sweep_section(data):
+    """Scaling plots and tables of the sweeps that have results."""
+    content = []
+    for sweep in data['spec'].sweeps.values():
+        points = [(c, data['summaries'][c.id]) for c in sweep.cases if not data['summaries'][c.id].empty]
+        if not points:
+            continue
+        content.append(f"\\subsection*{{Sweep: {tex(sweep.title)}}}")
+        # Fixed-duration series measure throughput; the others time per operation.
+        throughput = points[0][1]['metric'].iloc[0] == 'ops_per_sec'
+        quantity = "Throughput" if throughput else "Time per operation"
+        content.append(f"\\begin{{figure}}[h!]\n\\centering\n\\includegraphics[width=0.9\\textwidth]{{report/graphs/sweep_{sweep.name}_plot.png}}\n\\caption{{{quantity} vs.\\ {tex(sweep.axis)} ({tex(sweep.title)}).}}\n\\label{{fig:sweep_{sweep.name}}}\n\\end{{figure}}")
+        impls = [(impl, label) for impl, label in IMPLEMENTATIONS
+                 if any(impl in set(df['implementation']) for _, df in points)]
+        # Read off at the widest thread count every point of the sweep ran.
+        t = min(int(df['threads'].max()) for _, df in points)
+        header = " & ".join([f"\\textbf{{{tex(sweep.axis)}}}"] + [f"\\textbf{{{label} ({'Mops/s' if throughput else 'ns/op'})}}" for _, label in impls])
+        table = ["\\begin{table}[h!]", "\\centering", "\\resizebox{\\textwidth}{!}{%", f"\\begin{{tabular}}{{{'c' * (len(impls) + 1)}}}", "\\toprule",
+                 header + " \\\\", "\\midrule"]
+        for case, df in points:
+            row = [str(sweep.value(case))]
+            for impl, _ in impls:
+                d = df[(df['implementation'] == impl) & (df['threads'] == t)]
+                if d.empty:
+                    row.append("---")
+                elif throughput:
+                    row.append(fmt(d['average'].iloc[0] / 1e6, 3))
+                else:
+                    row.append(fmt(d['average'].iloc[0] / case.m * 1e9, 1))
+            table.append(" & ".join(row) + " \\\\")
+        table.extend(["\\bottomrule", "\\end{tabular}}", f"\\caption{{Average {quantity.lower()} at {t} threads, sweep \\texttt{{{tex(sweep.name)}}}.}}",
+                      f"\\label{{tab:sweep_{sweep.name}}}", "\\end{table}"])
+        content.append("\n".join(table))
+    if not content:
+        return ""
+    return "\\section*{Scaling Sweeps}\n" + "\n".join(content) + "\n\\newpage"
 
 def generate_page6(metrics):
     content = ["\\begin{figure}[h!]\n\\centering\n\\includegraphics[width=0.8\\textwidth]{{report/graphs/combined_plot.png}}\n\\caption{{Combined view across all cases and implementations.}}\n\\label{fig:combined}\n\\end{figure}"]
@@ -367,14 +524,13 @@ The {'$\\pm$5% @ 95% CI target was satisfied overall.' if ci_ok else '$\\pm$5% @
 
 def main():
     specs = get_system_specs()
-    data = load_data()
+    data = load_data(load_spec(spec_path(".")))
     metrics = precompute_metrics(data)
     report_parts = [
-        generate_page1(specs),
+        generate_page1(specs, data['spec']),
         generate_page2(data, metrics),
-        generate_page3(metrics),
-        generate_page4(metrics),
-        generate_page5(metrics),
+        generate_case_pages(data['spec'], metrics),
+        generate_sweep_section(data),
         generate_page6(metrics)
     ]
     final_report = "\n".join(report_parts)
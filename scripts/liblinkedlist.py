@@ -0,0 +1,212 @@
+"""
+liblinkedlist.py
+
+Python binding of bin/liblinkedlist.so (src/include/liblinkedlist.h),
+which `make` builds next to the programs: the list implementations,
+the workload generator and the harness, called in process.  A sweep of
+many configurations then needs no process per sample and no parsing
+of printed numbers, and experiments can be scripted from a notebook:
+
+    from liblinkedlist import ListSet
+
+    with ListSet('rwlock', set='skiplist', seed=1) as s:
+        s.generate(1000, 10000, 0.99, 0.005, 0.005)
+        for threads in (1, 2, 4, 8):
+            r = s.run(threads, trials=10, warmup=1)
+            print(threads, r.time.mean(), r['thread_imbalance'].max())
+
+Options are the programs' long options as keyword arguments, with
+underscores for dashes (key_range=4096, rwlock_pref='writer',
+latency=True, duration='500ms', numa='interleave').  Results hold a
+trials x columns float64 array whose first column is the time in
+seconds and whose others are the columns of the programs' --csv
+output; blank values are NaN.  The array is a read-only NumPy view of
+the library's own memory, made through the buffer protocol without a
+copy, and keeps that memory alive for as long as it (or any slice of
+it) is referenced.
+
+The library runs one configuration at a time: calls from several
+Python threads are serialized.  Errors are printed on stderr by the
+library and raised here as LinkedListError.
+
+It needs NumPy; the library is found at $LIBLINKEDLIST or
+bin/liblinkedlist.so.
+"""
+
+import ctypes
+import os
+
+import numpy as np
+
+API_VERSION = 1
+LIBRARY_NAME = 'liblinkedlist.so'
+
+
+class LinkedListError(RuntimeError):
+    pass
+
+
+def library_path():
+    if os.environ.get('LIBLINKEDLIST'):
+        return os.environ['LIBLINKEDLIST']
+    project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    return os.path.join(project_root, 'bin', LIBRARY_NAME)
+
+
+_lib = None
+
+
+def load_library(path=None):
+    """Load the library once per process and declare its calls."""
+    global _lib
+    if _lib is not None:
+        return _lib
+    path = path or library_path()
+    if not os.path.exists(path):
+        raise LinkedListError(f"{path} not found; build it with 'make build'")
+    lib = ctypes.CDLL(path)
+    version = lib.ll_api_version()
+    if version < API_VERSION:
+        raise LinkedListError(f"{path} has API version {version}, this module needs {API_VERSION}")
+
+    set_p, results_p = ctypes.c_void_p, ctypes.c_void_p
+    signatures = {
+        'll_impl_names': (ctypes.POINTER(ctypes.c_char_p), []),
+        'll_set_create': (set_p, [ctypes.c_char_p]),
+        'll_set_destroy': (None, [set_p]),
+        'll_set_option': (ctypes.c_int, [set_p, ctypes.c_char_p, ctypes.c_char_p]),
+        'll_set_generate': (ctypes.c_int, [set_p, ctypes.c_int, ctypes.c_long,
+                                           ctypes.c_double, ctypes.c_double, ctypes.c_double]),
+        'll_set_load_workload': (ctypes.c_int, [set_p, ctypes.c_char_p]),
+        'll_set_seed': (ctypes.c_ulong, [set_p]),
+        'll_set_run': (results_p, [set_p, ctypes.c_long, ctypes.c_int, ctypes.c_int]),
+        'll_results_trials': (ctypes.c_int, [results_p]),
+        'll_results_columns': (ctypes.c_int, [results_p]),
+        'll_results_column': (ctypes.c_char_p, [results_p, ctypes.c_int]),
+        'll_results_data': (ctypes.c_void_p, [results_p]),
+        'll_results_free': (None, [results_p]),
+    }
+    for name, (restype, argtypes) in signatures.items():
+        function = getattr(lib, name)
+        function.restype = restype
+        function.argtypes = argtypes
+    _lib = lib
+    return lib
+
+
+def implementations():
+    """Names of the implementations in the library."""
+    names = load_library().ll_impl_names()
+    result = []
+    while names[len(result)] is not None:
+        result.append(names[len(result)].decode())
+    return result
+
+
+class _ResultsHandle:
+    """Owns one ll_results_t; freed when the last view of its data goes."""
+
+    def __init__(self, lib, pointer):
+        self._lib = lib
+        self.pointer = pointer
+
+    def __del__(self):
+        if self.pointer:
+            self._lib.ll_results_free(self.pointer)
+            self.pointer = None
+
+
+class Results:
+    """The timed trials of one run: columns and a trials x columns array."""
+
+    def __init__(self, lib, pointer):
+        handle = _ResultsHandle(lib, pointer)
+        self.trials = lib.ll_results_trials(pointer)
+        self.columns = [lib.ll_results_column(pointer, i).decode()
+                        for i in range(lib.ll_results_columns(pointer))]
+        buffer = (ctypes.c_double * (self.trials * len(self.columns))).from_address(
+            lib.ll_results_data(pointer))
+        # The ctypes array is the base of every view; it keeps the handle.
+        buffer._handle = handle
+        self.data = np.frombuffer(buffer, dtype=np.float64).reshape(self.trials, len(self.columns))
+        self.data.flags.writeable = False
+
+    def __getitem__(self, column):
+        """One column over the trials, e.g. results['ops_per_sec']."""
+        try:
+            return self.data[:, self.columns.index(column)]
+        except ValueError:
+            raise KeyError(column) from None
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    @property
+    def time(self):
+        return self.data[:, 0]
+
+    def as_dict(self):
+        return {name: self.data[:, i] for i, name in enumerate(self.columns)}
+
+
+class ListSet:
+    """One implementation with its options and a workload, run in process."""
+
+    def __init__(self, impl, **options):
+        self._lib = load_library()
+        self._set = self._lib.ll_set_create(impl.encode())
+        if not self._set:
+            raise LinkedListError(f"unknown implementation {impl!r} (one of {', '.join(implementations())})")
+        self.impl = impl
+        for name, value in options.items():
+            self.option(name, value)
+
+    def option(self, name, value=True):
+        """Set a program option; True for flags, False or None to skip."""
+        if value is None or value is False:
+            return
+        name = name.replace('_', '-')
+        encoded = None if value is True else str(value).encode()
+        if self._lib.ll_set_option(self._check(), name.encode(), encoded) != 0:
+            raise LinkedListError(f"invalid option {name}={value!r} for {self.impl}")
+
+    def generate(self, n, m, member_frac, insert_frac, delete_frac):
+        """Generate n initial keys and m operations, as the programs do."""
+        if self._lib.ll_set_generate(self._check(), n, m, member_frac, insert_frac, delete_frac) != 0:
+            raise LinkedListError(f"cannot generate a workload with n={n}, m={m}")
+
+    def load(self, path):
+        """Replay a workload file written by workload_gen."""
+        if self._lib.ll_set_load_workload(self._check(), os.fsencode(path)) != 0:
+            raise LinkedListError(f"cannot load workload {path}")
+
+    @property
+    def seed(self):
+        return self._lib.ll_set_seed(self._check())
+
+    def run(self, threads, trials=1, warmup=0):
+        """Run warmup untimed and trials timed trials; return Results."""
+        pointer = self._lib.ll_set_run(self._check(), threads, trials, warmup)
+        if not pointer:
+            raise LinkedListError(f"{self.impl} run with {threads} threads failed")
+        return Results(self._lib, pointer)
+
+    def _check(self):
+        if not self._set:
+            raise LinkedListError("set is closed")
+        return self._set
+
+    def close(self):
+        if self._set:
+            self._lib.ll_set_destroy(self._set)
+            self._set = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, '_set', None):
+            self.close()
@@ -2,30 +2,45 @@
 """
 plot_all.py
 
-Create a single chart that overlays results from all three workload
-cases.  Each line corresponds to a specific case and implementation
-combination (e.g., case1-serial, case2-mutex).  The script reads
-summary CSV files from the data/ directory and writes a combined
+Create a single chart that overlays results from the stand-alone
+workload cases of the experiment spec (experiments.json).  Each line
+corresponds to a specific case and implementation combination (e.g.,
+case1-serial, case2-mutex).  The script reads the case summaries of the
+data/ directory (see results_db.load_summary) and writes a combined
 plot to report/graphs/combined_plot.png.  Error bars denote the
-standard deviation of execution time across samples.  This plot
-provides a holistic comparison of how each implementation performs
-across different thread counts and workloads.
+standard deviation of execution time (of throughput for a series run
+with --duration) across samples.  This plot provides a holistic
+comparison of how each implementation performs across different thread
+counts and workloads.
 """
 
+import argparse
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from experiments import load_spec, spec_path
+from results_db import load_summary
+
 def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.abspath(os.path.join(script_dir, '..'))
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data'))
+    parser.add_argument('--spec', default=spec_path(project_root))
+    args = parser.parse_args()
+    try:
+        spec = load_spec(args.spec)
+    except ValueError as e:
+        parser.error(str(e))
     fig, ax = plt.subplots()
     # Iterate over each case and plot its implementations
-    for case in (1, 2, 3):
-        summary_path = os.path.join(project_root, 'data', f'case{case}_summary.csv')
-        if not os.path.exists(summary_path):
+    for case in spec.case_ids():
+        rows = load_summary(args.data_dir, case)
+        if not rows:
             continue
-        df = pd.read_csv(summary_path)
+        df = pd.DataFrame(rows)
+        throughput = df['metric'].iloc[0] == 'ops_per_sec'
         df['threads'] = df['threads'].astype(int)
         df['average'] = df['average'].astype(float)
         df['stddev'] = df['stddev'].astype(float)
@@ -34,7 +49,7 @@ def main():
             label = f'case{case}-{impl}'
             ax.errorbar(sub['threads'], sub['average'], yerr=sub['stddev'], label=label, marker='o')
     ax.set_xlabel('Threads')
-    ax.set_ylabel('Time (seconds)')
+    ax.set_ylabel('Throughput (ops/s)' if throughput else 'Time (seconds)')
     ax.set_title('Combined Results Across All Cases')
     ax.legend()
     fig.tight_layout()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+plot_cases.py
+
+Generate the plots of every workload of the experiment spec
+(experiments.json, see experiments.py).  Each stand-alone case with
+results gets report/graphs/caseN_plot.png, its average execution time
+versus thread count with standard-deviation error bars (see
+utils.plot_results()).  Each sweep with results gets
+report/graphs/sweep_NAME_plot.png, the time per operation (throughput
+for --duration runs) against the swept parameter, one panel per thread
+count (see utils.plot_sweep()).
+Cases and sweeps without any results are skipped.
+
+Usage:
+    python3 plot_cases.py [--data-dir DIR] [--spec FILE]
+"""
+
+import argparse
+import os
+
+from experiments import load_spec, spec_path
+from results_db import load_summary
+from utils import plot_results, plot_sweep
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.abspath(os.path.join(script_dir, '..'))
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data'))
+    parser.add_argument('--spec', default=spec_path(project_root))
+    args = parser.parse_args()
+    try:
+        spec = load_spec(args.spec)
+    except ValueError as e:
+        parser.error(str(e))
+    graphs_dir = os.path.join(project_root, 'report', 'graphs')
+    for case in spec.cases.values():
+        if case.sweep is not None or not load_summary(args.data_dir, case.id):
+            continue
+        output_png = os.path.join(graphs_dir, f'case{case.id}_plot.png')
+        plot_results(args.data_dir, case.id, output_png, case.title())
+        print(f"Generated plot at {output_png}")
+    for sweep in spec.sweeps.values():
+        output_png = os.path.join(graphs_dir, f'sweep_{sweep.name}_plot.png')
+        if plot_sweep(args.data_dir, sweep, output_png):
+            print(f"Generated plot at {output_png}")
+
+if __name__ == '__main__':
+    main()
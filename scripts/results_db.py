@@ -0,0 +1,415 @@
+"""
+results_db.py
+
+Append-only SQLite store of benchmark results, shared by
+run_experiments.py (which writes samples), collect_results.py, the plot
+scripts and generate_report.py (which query summaries).
+
+The database lives at <data-dir>/results.db and has three tables:
+
+runs       one row per run_experiments.py invocation, with its start
+           time, git commit, build flags, binary options and the host
+           it ran on (a spec and a hash of it, so that runs from
+           different machines can be told apart and compared).
+samples    one row per timed trial, keyed by run, case parameters
+           (case, n, m and the operation mix), implementation and
+           threads.  Every further column a binary reports (latency
+           percentiles, perf counters, ...) becomes a column of its own
+           the first time it appears; older rows leave it NULL.
+summaries  count, mean, M2 (Welford), min and max of time and
+           ops_per_sec per (series, case, implementation, threads),
+           updated in the same transaction as every batch of samples.
+
+A series groups the runs whose samples belong together: a rerun with
+the same options on the same host resumes the latest series, while
+--fresh or different options start a new one.  Summaries are kept per
+series, so months of history can accumulate without older runs mixing
+into the current numbers; queries default to the latest series.
+
+It uses only the standard library.
+"""
+
+import csv
+import hashlib
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+
+DB_NAME = 'results.db'
+KEY_COLUMNS = ('implementation', 'threads', 'time')
+SUMMARY_METRICS = ('time', 'ops_per_sec')
+STAT_COLUMNS = ('average', 'stddev', 'count', 'median', 'min', 'p95', 'ci95')
+Z_95 = 1.96
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    series_id INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    git_commit TEXT,
+    build_flags TEXT,
+    options TEXT NOT NULL,
+    host_hash TEXT NOT NULL,
+    host_spec TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    sample_id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    series_id INTEGER NOT NULL,
+    case_id INTEGER NOT NULL,
+    n INTEGER,
+    m INTEGER,
+    member_frac REAL,
+    insert_frac REAL,
+    delete_frac REAL,
+    implementation TEXT NOT NULL,
+    threads INTEGER NOT NULL,
+    time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_by_cell
+    ON samples (series_id, case_id, implementation, threads, time);
+CREATE TABLE IF NOT EXISTS summaries (
+    series_id INTEGER NOT NULL,
+    case_id INTEGER NOT NULL,
+    implementation TEXT NOT NULL,
+    threads INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    PRIMARY KEY (series_id, case_id, implementation, threads, metric)
+);
+"""
+
+
+def db_path(data_dir):
+    return os.path.join(data_dir, DB_NAME)
+
+
+def host_spec():
+    """Return (spec, hash) of the hardware and OS the benchmark runs on.
+
+    The hash covers everything but the host name, so identical machines
+    compare as the same host.
+    """
+    spec = {
+        'machine': platform.machine(),
+        'kernel': platform.release(),
+        'cpus': os.cpu_count(),
+        'cpu_model': None,
+        'mem_kb': None,
+    }
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    spec['cpu_model'] = line.split(':', 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    try:
+        with open('/proc/meminfo') as f:
+            spec['mem_kb'] = int(f.readline().split()[1])
+    except (OSError, IndexError, ValueError):
+        pass
+    digest = hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+    spec['hostname'] = platform.node()
+    return spec, digest
+
+
+def git_commit(repo_dir):
+    """HEAD of the repository, with a '-dirty' suffix for local changes."""
+    try:
+        commit = subprocess.run(['git', '-C', repo_dir, 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', '-C', repo_dir, 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+def build_flags(bin_dir):
+    """Compiler and flags of the last build, as recorded by src/Makefile."""
+    try:
+        with open(os.path.join(bin_dir, 'build_flags')) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def merge_moments(count, mean, m2, values):
+    """Fold values into (count, mean, M2) with Chan's parallel update."""
+    k = len(values)
+    if k == 0:
+        return count, mean, m2
+    batch_mean = math.fsum(values) / k
+    batch_m2 = math.fsum((x - batch_mean) ** 2 for x in values)
+    total = count + k
+    delta = batch_mean - mean
+    return total, mean + delta * k / total, m2 + batch_m2 + delta * delta * count * k / total
+
+
+class ResultsDB:
+    """Connection to a results database, created on first use."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.columns = [row['name'] for row in self.conn.execute("PRAGMA table_info(samples)")]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- writing --------------------------------------------------------
+
+    def start_run(self, options, repo_dir=None, bin_dir=None, fresh=False):
+        """Record a new run and return its run_id.
+
+        The run joins the latest series with the same host and options
+        unless fresh is set.
+        """
+        spec, digest = host_spec()
+        options_json = json.dumps(list(options))
+        series = None
+        if not fresh:
+            row = self.conn.execute("SELECT series_id FROM runs WHERE host_hash = ? AND options = ? "
+                                    "ORDER BY run_id DESC LIMIT 1", (digest, options_json)).fetchone()
+            series = row['series_id'] if row else None
+        if series is None:
+            series = self.conn.execute("SELECT COALESCE(MAX(series_id), 0) + 1 FROM runs").fetchone()[0]
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (series_id, started_at, git_commit, build_flags, options, host_hash, host_spec) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (series, time.strftime('%Y-%m-%dT%H:%M:%S%z'), git_commit(repo_dir) if repo_dir else None,
+                 build_flags(bin_dir) if bin_dir else None, options_json, digest, json.dumps(spec, sort_keys=True)))
+        return cur.lastrowid
+
+    def widen(self, columns):
+        """Add a REAL column for every sample column not stored yet."""
+        for column in columns:
+            if column not in self.columns:
+                self.conn.execute(f'ALTER TABLE samples ADD COLUMN "{column}" REAL')
+                self.columns.append(column)
+
+    def add_samples(self, run_id, case, params, implementation, threads, rows):
+        """Store the trials of one job and fold them into the summaries.
+
+        params is the case's (n, m, member, insert, delete) tuple and each
+        row maps the binary's column names to values ('' for blank).
+        """
+        series = self.series_of(run_id)
+        n, m, member, insert, delete = params
+        with self.conn:
+            for row in rows:
+                extra = {k: (float(v) if v not in ('', None) else None)
+                         for k, v in row.items() if k not in KEY_COLUMNS}
+                self.widen(extra)
+                names = ['run_id', 'series_id', 'case_id', 'n', 'm', 'member_frac', 'insert_frac',
+                         'delete_frac', 'implementation', 'threads', 'time'] + list(extra)
+                values = [run_id, series, case, int(n), int(m), float(member), float(insert), float(delete),
+                          implementation, threads, float(row['time'])] + list(extra.values())
+                quoted = ', '.join('"%s"' % c for c in names)
+                self.conn.execute(f"INSERT INTO samples ({quoted}) VALUES ({', '.join('?' * len(names))})", values)
+            for metric in SUMMARY_METRICS:
+                values = [float(r[metric]) for r in rows if r.get(metric) not in ('', None)]
+                if values:
+                    self.update_summary(series, case, implementation, threads, metric, values)
+
+    def update_summary(self, series, case, implementation, threads, metric, values):
+        key = (series, case, implementation, threads, metric)
+        row = self.conn.execute("SELECT count, mean, m2, min, max FROM summaries WHERE series_id = ? "
+                                "AND case_id = ? AND implementation = ? AND threads = ? AND metric = ?",
+                                key).fetchone()
+        count, mean, m2, lo, hi = row if row else (0, 0.0, 0.0, math.inf, -math.inf)
+        count, mean, m2 = merge_moments(count, mean, m2, values)
+        self.conn.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                          key + (count, mean, m2, min(lo, *values), max(hi, *values)))
+
+    # -- querying -------------------------------------------------------
+
+    def series_of(self, run_id):
+        return self.conn.execute("SELECT series_id FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+
+    def latest_series(self):
+        """Series of the most recent run, or None for an empty database."""
+        row = self.conn.execute("SELECT series_id FROM runs ORDER BY run_id DESC LIMIT 1").fetchone()
+        return row['series_id'] if row else None
+
+    def runs(self, series=None):
+        """Run metadata as dicts, oldest first, optionally of one series."""
+        query = "SELECT * FROM runs" + (" WHERE series_id = ?" if series is not None else "") + " ORDER BY run_id"
+        return [dict(row) for row in self.conn.execute(query, () if series is None else (series,))]
+
+    def cases(self, series=None, run=None):
+        """Cases with samples in one run, or in one series (the latest by default)."""
+        if run is not None:
+            where, key = "run_id = ?", run
+        else:
+            where, key = "series_id = ?", self.latest_series() if series is None else series
+        return [row[0] for row in self.conn.execute(
+            f"SELECT DISTINCT case_id FROM samples WHERE {where} ORDER BY case_id", (key,))]
+
+    def running_stats(self, case, metric='time', series=None):
+        """Map (implementation, threads) -> (count, mean, M2) from the summaries."""
+        series = self.latest_series() if series is None else series
+        return {(row['implementation'], row['threads']): (row['count'], row['mean'], row['m2'])
+                for row in self.conn.execute("SELECT implementation, threads, count, mean, m2 FROM summaries "
+                                             "WHERE series_id = ? AND case_id = ? AND metric = ?",
+                                             (series, case, metric))}
+
+    def samples(self, case, metric='time', series=None, run=None):
+        """Map (implementation, threads) -> list of metric values of one case.
+
+        Samples come from one run if run is given, otherwise from one
+        series (the latest by default).
+        """
+        if metric not in self.columns:
+            return {}
+        if run is not None:
+            where, key = "run_id = ?", run
+        else:
+            where, key = "series_id = ?", self.latest_series() if series is None else series
+        values = {}
+        for row in self.conn.execute(f'SELECT implementation, threads, "{metric}" FROM samples '
+                                     f'WHERE {where} AND case_id = ? AND "{metric}" IS NOT NULL', (key, case)):
+            values.setdefault((row[0], row[1]), []).append(row[2])
+        return values
+
+    def configuration_samples(self, metric='time', series=None, run=None):
+        """Map (case, n, m, member, insert, delete, implementation, threads) -> metric values.
+
+        Every configuration of one run if run is given, otherwise of one
+        series (the latest by default), in one query.
+        """
+        if metric not in self.columns:
+            return {}
+        if run is not None:
+            where, key = "run_id = ?", run
+        else:
+            where, key = "series_id = ?", self.latest_series() if series is None else series
+        values = {}
+        for row in self.conn.execute(f'SELECT case_id, n, m, member_frac, insert_frac, delete_frac, implementation, '
+                                     f'threads, "{metric}" FROM samples WHERE {where} AND "{metric}" IS NOT NULL',
+                                     (key,)):
+            values.setdefault(tuple(row)[:-1], []).append(row[-1])
+        return values
+
+    def extra_columns(self):
+        fixed = {'sample_id', 'run_id', 'series_id', 'case_id', 'n', 'm', 'member_frac', 'insert_frac',
+                 'delete_frac', *KEY_COLUMNS}
+        return [c for c in self.columns if c not in fixed]
+
+    def series_metric(self, series=None):
+        """'ops_per_sec' if the series' runs used --duration, else 'time'.
+
+        A fixed-duration trial always takes about D seconds, so its time
+        says nothing; throughput is what such a series measures.
+        """
+        series = self.latest_series() if series is None else series
+        row = self.conn.execute("SELECT options FROM runs WHERE series_id = ? ORDER BY run_id DESC LIMIT 1",
+                                (series,)).fetchone()
+        return 'ops_per_sec' if row and '--duration' in json.loads(row['options']) else 'time'
+
+    def quantiles(self, case, metric, series, qs):
+        """Map (implementation, threads) -> [q-quantile for q in qs] of one case.
+
+        Only the two samples around each quantile's rank are fetched,
+        all cells in one windowed query over the samples index.
+        """
+        ranks = ' OR '.join(f'pos = CAST((k - 1) * {q!r} AS INTEGER) OR pos = CAST((k - 1) * {q!r} AS INTEGER) + 1'
+                            for q in qs)
+        near = {}
+        for row in self.conn.execute(
+                f'SELECT implementation, threads, k, pos, v FROM ('
+                f'SELECT implementation, threads, "{metric}" AS v, '
+                f'ROW_NUMBER() OVER cell - 1 AS pos, COUNT(*) OVER cell AS k FROM samples '
+                f'WHERE series_id = ? AND case_id = ? AND "{metric}" IS NOT NULL '
+                f'WINDOW cell AS (PARTITION BY implementation, threads ORDER BY "{metric}" '
+                f'ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)) WHERE {ranks}',
+                (series, case)):
+            cell = near.setdefault((row[0], row[1]), (row[2], {}))
+            cell[1][row[3]] = row[4]
+        result = {}
+        for key, (k, values) in near.items():
+            result[key] = []
+            for q in qs:
+                pos = (k - 1) * q
+                lo = math.floor(pos)
+                hi = min(lo + 1, k - 1)
+                result[key].append(values[lo] + (values[hi] - values[lo]) * (pos - lo))
+        return result
+
+    def summary(self, case, series=None, metric=None):
+        """Per-(implementation, threads) summary rows of one case.
+
+        Each row has implementation, threads, the metric its statistics
+        describe (by default the series', see series_metric()), the
+        STAT_COLUMNS of that metric and the mean of every extra column
+        the case's samples have (None in the cells where no sample has
+        it).  Count, mean, stddev, min and the CI come straight from the
+        summaries table; only the median and p95 read samples.
+        """
+        series = self.latest_series() if series is None else series
+        metric = self.series_metric(series) if metric is None else metric
+        extra = self.extra_columns()
+        averages = ''.join(f', AVG("{c}")' for c in extra)
+        means = {(row[0], row[1]): row[2:] for row in self.conn.execute(
+            f"SELECT implementation, threads{averages} FROM samples WHERE series_id = ? AND case_id = ? "
+            "GROUP BY implementation, threads", (series, case))}
+        quantiles = self.quantiles(case, metric, series, (0.5, 0.95))
+        rows = []
+        for stats in self.conn.execute("SELECT implementation, threads, count, mean, m2, min FROM summaries "
+                                       "WHERE series_id = ? AND case_id = ? AND metric = ? "
+                                       "ORDER BY implementation, threads", (series, case, metric)):
+            key = (stats['implementation'], stats['threads'])
+            count, mean = stats['count'], stats['mean']
+            stddev = math.sqrt(stats['m2'] / (count - 1)) if count > 1 else 0.0
+            median, p95 = quantiles[key]
+            row = {'implementation': key[0], 'threads': key[1], 'metric': metric}
+            row.update(zip(STAT_COLUMNS, (mean, stddev, count, median, stats['min'], p95,
+                                          Z_95 * stddev / math.sqrt(count))))
+            row.update(zip(extra, means.get(key, (None,) * len(extra))))
+            rows.append(row)
+        unused = [c for c in extra if all(row[c] is None for row in rows)]
+        for row in rows:
+            for c in unused:
+                del row[c]
+        return rows
+
+
+def load_summary(data_dir, case):
+    """Summary rows of a case from the results database in data_dir.
+
+    Data directories written before the database existed only have
+    caseX_summary.csv files; those are read instead.
+    """
+    path = db_path(data_dir)
+    if os.path.exists(path):
+        with ResultsDB(path) as db:
+            return db.summary(case)
+    csv_path = os.path.join(data_dir, f'case{case}_summary.csv')
+    if not os.path.exists(csv_path):
+        return []
+    with open(csv_path, newline='') as f:
+        rows = [{k: (v if k in ('implementation', 'metric') else float(v) if v else None) for k, v in row.items()}
+                for row in csv.DictReader(f)]
+    for row in rows:
+        row['threads'] = int(row['threads'])
+        row.setdefault('metric', 'time')
+    return rows
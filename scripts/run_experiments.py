@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+run_experiments.py
+
+Parallel, resumable experiment driver for the linked list benchmark.
+The script builds the same job matrix as the original run_tests.sh
+loop (case x implementation x threads x sample) and schedules the jobs
+onto the CPUs available to this process.  Single-CPU jobs (serial runs
+and 1-thread runs) are packed alongside each other, while multi-thread
+jobs are given an exclusive set of CPUs so that they do not interfere
+with one another.
+
+Every sample is stored in data/results.db (see results_db.py) as soon
+as it finishes, together with the run's git commit, build flags, options
+and host.  When the script is rerun with the same options on the same
+host it resumes that series of runs: it reads the sample counts of each
+(implementation, threads) pair from the database's summaries and only
+schedules the missing ones, so an interrupted sweep can be resumed
+cheaply.  --fresh starts a new series instead; older runs stay in the
+database.
+
+With --ci-target the number of samples is chosen adaptively: each cell
+first receives --samples runs, after which only the cells whose 95%
+confidence half-width (1.96 * s / sqrt(k)) exceeds the target
+percentage of the mean are sampled again, up to --max-samples.  The
+running mean and standard deviation are maintained with Welford's
+algorithm, seeded from the series' summaries in the database.
+
+With --trials-per-job K each process runs up to K timed trials (plus
+--warmup untimed ones) using the binaries' --trials mode, so the list
+and operations array are built once per K samples instead of once per
+sample.
+
+With --latency the binaries also record per-operation latency
+histograms; their percentile columns are stored with every sample
+next to implementation, threads and time.  --perf does the same for the
+binaries' hardware counter columns, and --lockstat those of the
+lock-contention counters (acquisitions, contended acquisitions, wait
+and hold time per lock mode) of the mutex and rwlock programs.
+
+With --duration D every trial runs for a fixed time instead of a fixed
+number of operations, and the binaries report ops, ops_per_sec and
+per-thread fairness columns.  Adaptive sampling then tracks
+ops_per_sec rather than time.
+
+With --numa POLICY the binaries place the list nodes and each worker's
+copy of its operations by that NUMA policy.  Like every other binary
+option it is part of the run's options, so samples taken under
+different policies fall into different series.
+
+The cases come from the experiment spec (experiments.json, see
+experiments.py): its stand-alone cases run by default, --cases picks
+some by id and --sweeps adds every case of the named scaling sweeps.
+
+--keys and --key-range select the key distribution of the operations
+(see the binaries' --help) for every case; --key-range overrides the
+key ranges of the spec.  Every case is checked against them before
+anything runs: a sweep point they rule out (e.g. a key range above
+2^24 with --keys zipf) is skipped with a warning, a stand-alone case is
+an error.  Like every other option that changes what is measured, they
+put the runs in a series of their own.
+
+--threads overrides the thread counts of the spec.  A case without
+sweeps runs 1, 2, 4, ... up to max(8, nproc), plus nproc itself.  Jobs
+wider than the machine are oversubscribed and get the whole machine;
+with --pin each worker thread is additionally bound to one CPU of its
+job's set (compact, scatter or smt placement).
+
+With --seed S one workload file per case is generated with
+bin/workload_gen (under data/workloads/) and every job replays it via
+--workload, so all implementations and samples run exactly the same
+initial list and operation sequence instead of a fresh random one.
+
+Usage:
+    python3 run_experiments.py [--samples K] [--jobs J] [--fresh]
+                               [--ci-target PCT] [--max-samples K]
+                               [--cases ID ...] [--sweeps NAME ...]
+
+It uses only the standard library.
+"""
+
+import argparse
+import csv
+import math
+import os
+import subprocess
+import sys
+import time
+
+import experiments
+import results_db
+
+IMPLEMENTATIONS = ('serial', 'mutex', 'rwlock', 'finegrained', 'optimistic', 'lazy', 'lockfree', 'flatcombining')
+# The default sweep covers powers of two up to at least this many
+# threads, and up to the CPU count on bigger machines.
+MIN_SWEEP_THREADS = 8
+Z_95 = 1.96
+MAX_FAILURES = 3
+
+
+class RunningStats:
+    """Welford's online mean/variance accumulator."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def relative_ci(self):
+        """95% CI half-width as a percentage of the mean."""
+        if self.count < 2 or self.mean <= 0:
+            return math.inf
+        return Z_95 * self.stddev / math.sqrt(self.count) / self.mean * 100
+
+    def samples_for(self, target):
+        """Estimate the total samples needed to reach a relative CI target."""
+        if self.count < 2 or self.mean <= 0:
+            return self.count + 1
+        return math.ceil((Z_95 * self.stddev / (target / 100 * self.mean)) ** 2)
+
+
+class Cell:
+    """Sampling state of one (case, implementation, threads) configuration."""
+
+    def __init__(self, case, impl, threads, stats):
+        self.case = case
+        self.impl = impl
+        self.threads = threads
+        self.stats = stats
+        self.inflight = 0
+        self.failures = 0
+
+    def wanted(self, min_samples, max_samples, ci_target):
+        """Number of additional jobs to queue for this cell right now."""
+        if self.failures >= MAX_FAILURES:
+            return 0
+        have = self.stats.count + self.inflight
+        if have < min_samples:
+            return min_samples - have
+        if ci_target is None or self.inflight or self.stats.relative_ci() <= ci_target:
+            return 0
+        target = max(self.stats.samples_for(ci_target), self.stats.count + 1)
+        return max(0, min(target, max_samples) - have)
+
+
+class Job:
+    """A single benchmark process: one or more samples of one configuration."""
+
+    def __init__(self, cell, trials=1):
+        self.cell = cell
+        self.case = cell.case
+        self.impl = cell.impl
+        self.threads = cell.threads
+        self.trials = trials
+        self.proc = None
+        self.cpus = ()
+
+    @property
+    def width(self):
+        # The serial binary ignores the thread count, so it only ever
+        # needs one CPU regardless of the requested threads.
+        return 1 if self.impl == 'serial' else self.threads
+
+    def command(self, bin_dir, options=(), workload=None):
+        cmd = [os.path.join(bin_dir, f'linkedlist_{self.impl}'), '--csv', '--trials', str(self.trials)]
+        if workload is not None:
+            return cmd + list(options) + ['--workload', workload, str(self.threads)]
+        # Workload files already carry the case's key range.
+        return cmd + list(options) + self.case.options + [str(self.threads)] + list(self.case.params)
+
+
+def default_thread_counts(ncpus):
+    """Powers of two up to max(MIN_SWEEP_THREADS, ncpus), plus ncpus itself."""
+    counts = set()
+    t = 1
+    while t <= max(MIN_SWEEP_THREADS, ncpus):
+        counts.add(t)
+        t *= 2
+    counts.add(ncpus)
+    return sorted(counts)
+
+
+def thread_count(ncpus):
+    """argparse type accepting a number, 'nproc' or a multiple such as '2nproc'."""
+    def parse(text):
+        if text.endswith('nproc'):
+            factor = text[:-len('nproc')]
+            value = (int(factor) if factor else 1) * ncpus
+        else:
+            value = int(text)
+        if value < 1:
+            raise argparse.ArgumentTypeError(f'invalid thread count: {text}')
+        return value
+    return parse
+
+
+def numa_policy(text):
+    """argparse type accepting none, firsttouch, interleave or bind:N."""
+    if text in ('none', 'firsttouch', 'interleave'):
+        return text
+    if text.startswith('bind:') and text[len('bind:'):].isdigit():
+        return text
+    raise argparse.ArgumentTypeError(f'invalid NUMA policy: {text} (none, firsttouch, interleave, bind:N)')
+
+
+def make_workload(bin_dir, data_dir, case, seed, key_options=()):
+    """Write data/workloads/caseX_N_M_seedS[_keys].wl with workload_gen unless it exists."""
+    tag = ''.join('_' + opt.lstrip('-').replace(':', '-') for opt in key_options)
+    # n and m are in the name so that editing a case in the spec does not
+    # replay a stale file; the mix goes in with the key options.
+    mix = '-'.join(case.params[2:])
+    path = os.path.join(data_dir, 'workloads', f'case{case.id}_{case.n}_{case.m}_{mix}_seed{seed}{tag}.wl')
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        subprocess.run([os.path.join(bin_dir, 'workload_gen'), '--seed', str(seed)] + list(key_options) +
+                       [path] + list(case.params),
+                       check=True, stdout=subprocess.DEVNULL)
+    return path
+
+
+def build_cells(cases, impls, thread_counts, db, series, metric='time'):
+    """One cell per (case, implementation, threads); thread_counts maps case id -> counts."""
+    cells = []
+    for case in cases:
+        existing = db.running_stats(case.id, metric, series)
+        for impl in impls:
+            for threads in thread_counts[case.id]:
+                stats = RunningStats(*existing.get((impl, threads), ()))
+                cells.append(Cell(case, impl, threads, stats))
+    return cells
+
+
+class Scheduler:
+    """Hand out disjoint CPU sets to jobs and collect their results."""
+
+    def __init__(self, cpus, bin_dir, db, run_id, min_samples, max_samples, ci_target=None,
+                 trials_per_job=1, options=(), metric='time', workloads=None, impl_options=None):
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.ci_target = ci_target
+        self.trials_per_job = max(1, trials_per_job)
+        self.options = list(options)
+        self.metric = metric
+        self.workloads = workloads or {}
+        self.impl_options = impl_options or {}
+        self.pending = []
+        self.free = sorted(cpus)
+        self.ncpus = len(self.free)
+        self.bin_dir = bin_dir
+        self.db = db
+        self.run_id = run_id
+        self.running = []
+        self.failures = 0
+        self.completed = 0
+
+    def try_start(self, job):
+        # Oversubscribed jobs get the whole machine to themselves.
+        need = min(job.width, self.ncpus)
+        if need > len(self.free):
+            return False
+        job.cpus, self.free = self.free[:need], self.free[need:]
+        cpus = set(job.cpus)
+        options = self.options + self.impl_options.get(job.impl, [])
+        job.proc = subprocess.Popen(job.command(self.bin_dir, options, self.workloads.get(job.case.id)),
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE,
+                                    text=True,
+                                    preexec_fn=lambda: os.sched_setaffinity(0, cpus))
+        self.running.append(job)
+        return True
+
+    def reap(self):
+        """Collect every finished job; return True if any finished."""
+        finished = [j for j in self.running if j.proc.poll() is not None]
+        for job in finished:
+            self.running.remove(job)
+            self.free = sorted(self.free + list(job.cpus))
+            out, err = job.proc.communicate()
+            try:
+                if job.proc.returncode != 0:
+                    raise ValueError(err.strip() or f'exit status {job.proc.returncode}')
+                trials = list(csv.DictReader(out.splitlines()))
+                values = [float(row[self.metric]) for row in trials]
+                if not values:
+                    raise ValueError('no trials reported')
+            except (ValueError, KeyError) as e:
+                self.failures += 1
+                job.cell.failures += 1
+                print(f"Warning: case {job.case.id} {job.impl} T={job.threads} failed: {e}", file=sys.stderr)
+                continue
+            for row, value in zip(trials, values):
+                row.pop('trial', None)
+                job.cell.stats.update(value)
+            self.db.add_samples(self.run_id, job.case.id, job.case.params, job.impl, job.threads, trials)
+            self.completed += len(values)
+        for job in finished:
+            job.cell.inflight -= job.trials
+            self.enqueue(job.cell)
+        return bool(finished)
+
+    def enqueue(self, cell):
+        wanted = cell.wanted(self.min_samples, self.max_samples, self.ci_target)
+        jobs = []
+        while wanted > 0:
+            trials = min(wanted, self.trials_per_job)
+            jobs.append(Job(cell, trials))
+            wanted -= trials
+        cell.inflight += sum(j.trials for j in jobs)
+        self.pending.extend(jobs)
+        # Widest jobs first so that exclusive CPU sets are handed out while
+        # the machine is empty; single-CPU jobs backfill the remaining CPUs.
+        self.pending.sort(key=lambda j: -j.width)
+
+    def run(self, cells):
+        for cell in cells:
+            self.enqueue(cell)
+        while self.pending or self.running:
+            started = True
+            while started and self.pending:
+                started = False
+                for job in self.pending:
+                    if self.try_start(job):
+                        self.pending.remove(job)
+                        started = True
+                        break
+            if not self.reap():
+                time.sleep(0.005)
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.abspath(os.path.join(script_dir, '..'))
+    available = sorted(os.sched_getaffinity(0))
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=5,
+                        help='samples per (case, implementation, threads); the minimum '
+                             'when --ci-target is given (default: 5)')
+    parser.add_argument('--ci-target', type=float, default=None, metavar='PCT',
+                        help='keep sampling cells whose 95%% CI half-width exceeds PCT%% of the mean')
+    parser.add_argument('--max-samples', type=int, default=200,
+                        help='per-cell cap on samples in --ci-target mode (default: 200)')
+    parser.add_argument('--jobs', type=int, default=len(available),
+                        help='number of CPUs to schedule onto (default: all available)')
+    parser.add_argument('--spec', default=experiments.spec_path(project_root),
+                        help='experiment spec defining the cases and sweeps (default: experiments.json)')
+    parser.add_argument('--cases', type=int, nargs='+',
+                        help='ids of the cases to run (default: the stand-alone cases of the spec, '
+                             'or none when --sweeps is given)')
+    parser.add_argument('--sweeps', nargs='+', default=[], metavar='NAME',
+                        help='also run every case of these sweeps of the spec')
+    parser.add_argument('--impls', nargs='+', default=list(IMPLEMENTATIONS), choices=IMPLEMENTATIONS)
+    parser.add_argument('--threads', type=thread_count(len(available)), nargs='+',
+                        help='thread counts to sweep, overriding the spec; numbers, "nproc" or e.g. '
+                             '"2nproc" for oversubscription (default: the case\'s threads in the spec, '
+                             'else powers of two up to max(8, nproc), and nproc)')
+    parser.add_argument('--pin', choices=('none', 'compact', 'scatter', 'smt'),
+                        help='pin each worker thread to a CPU of its job with this policy')
+    parser.add_argument('--numa', type=numa_policy, metavar='POLICY',
+                        help='place list nodes and operations: none, firsttouch, interleave or bind:N')
+    parser.add_argument('--trials-per-job', type=int, default=1, metavar='K',
+                        help='timed trials run inside each process (default: 1)')
+    parser.add_argument('--warmup', type=int, default=0,
+                        help='untimed trials run before the timed ones in each process (default: 0)')
+    parser.add_argument('--latency', action='store_true',
+                        help='record per-operation latency percentiles as extra columns')
+    parser.add_argument('--perf', action='store_true',
+                        help='record perf_event_open counters (cycles, instructions, misses, ...) as extra columns')
+    parser.add_argument('--lockstat', action='store_true',
+                        help='record lock acquisitions, contention, wait and hold time as extra columns')
+    parser.add_argument('--duration', metavar='D',
+                        help='throughput mode: run each trial for D (e.g. 2s, 500ms) and sample '
+                             'ops_per_sec instead of time')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='generate one workload file per case with this seed and replay it '
+                             'in every job, so all implementations see the same keys and operations')
+    parser.add_argument('--keys', metavar='SPEC',
+                        help='key distribution: uniform, zipf[:THETA], hotset[:FRAC[:PROB]] or sequential')
+    parser.add_argument('--key-range', type=int, metavar='R',
+                        help='draw keys from [0, R), overriding the spec (default: 65536)')
+    parser.add_argument('--rwlock-pref', choices=('reader', 'writer'),
+                        help='reader/writer preference of the rwlock variant (default: reader)')
+    parser.add_argument('--set', choices=('list', 'skiplist', 'array'),
+                        help='ordered set behind the serial, mutex and rwlock variants (default: list)')
+    parser.add_argument('--fresh', action='store_true',
+                        help='start a new series of runs instead of resuming the last one')
+    parser.add_argument('--bin-dir', default=os.path.join(project_root, 'bin'))
+    parser.add_argument('--data-dir', default=os.path.join(project_root, 'data'))
+    args = parser.parse_args()
+
+    try:
+        spec = experiments.load_spec(args.spec, args.keys, args.key_range)
+    except ValueError as e:
+        parser.error(str(e))
+    unknown = [c for c in args.cases or [] if c not in spec.cases]
+    unknown += [s for s in args.sweeps if s not in spec.sweeps]
+    if unknown:
+        parser.error(f"not in {args.spec}: {', '.join(map(str, unknown))}")
+    selected = args.cases if args.cases is not None else [] if args.sweeps else spec.case_ids()
+    cases = [spec.cases[c] for c in dict.fromkeys(selected + spec.sweep_ids(args.sweeps))]
+    parse_threads = thread_count(len(available))
+    thread_counts = {}
+    for case in cases:
+        if args.threads:
+            counts = args.threads
+        elif case.threads:
+            counts = [parse_threads(str(t)) for t in case.threads]
+        else:
+            counts = default_thread_counts(len(available))
+        thread_counts[case.id] = sorted(set(counts))
+
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    key_options = []
+    if args.keys:
+        key_options += ['--keys', args.keys]
+    workloads = {}
+    if args.seed is not None:
+        for case in cases:
+            workloads[case.id] = make_workload(args.bin_dir, args.data_dir, case, args.seed,
+                                               key_options + case.options)
+    # Options only one implementation understands
+    impl_options = {}
+    if args.rwlock_pref:
+        impl_options['rwlock'] = ['--rwlock-pref', args.rwlock_pref]
+    if args.set:
+        for impl in ('serial', 'mutex', 'rwlock'):
+            impl_options.setdefault(impl, []).extend(['--set', args.set])
+    metric = 'ops_per_sec' if args.duration else 'time'
+    cpus = available[:max(1, args.jobs)]
+    if args.ci_target is None:
+        max_samples = args.samples
+        print(f"Running tests with {args.samples} samples per configuration on {len(cpus)} CPUs...")
+    else:
+        max_samples = max(args.samples, args.max_samples)
+        print(f"Running tests until the 95% CI is within {args.ci_target}% of the mean "
+              f"({args.samples}-{max_samples} samples per configuration) on {len(cpus)} CPUs...")
+
+    options = []
+    if args.warmup:
+        options += ['--warmup', str(args.warmup)]
+    if args.latency:
+        options.append('--latency')
+    if args.perf:
+        options.append('--perf')
+    if args.lockstat:
+        options.append('--lockstat')
+    if args.duration:
+        options += ['--duration', args.duration]
+    if args.pin:
+        options += ['--pin', args.pin]
+    if args.numa:
+        options += ['--numa', args.numa]
+    if not workloads:
+        # Workload files already carry their key distribution.
+        options += key_options
+    # Everything that changes what the samples measure; runs that agree on
+    # it (and on the host) share a series.
+    run_options = options + [opt for impl in sorted(impl_options) for opt in impl_options[impl]]
+    if workloads:
+        run_options += ['--seed', str(args.seed)] + key_options
+    if args.key_range:
+        run_options += ['--key-range', str(args.key_range)]
+
+    db = results_db.ResultsDB(results_db.db_path(args.data_dir))
+    run_id = db.start_run(run_options, project_root, args.bin_dir, fresh=args.fresh)
+    cells = build_cells(cases, args.impls, thread_counts, db, db.series_of(run_id), metric)
+    scheduler = Scheduler(cpus, args.bin_dir, db, run_id, args.samples, max_samples, args.ci_target,
+                          args.trials_per_job, options, metric, workloads, impl_options)
+    try:
+        scheduler.run(cells)
+    finally:
+        db.close()
+    print(f"Recorded run {run_id} in {results_db.db_path(args.data_dir)}")
+    if args.ci_target is not None:
+        unmet = [c for c in cells if c.stats.relative_ci() > args.ci_target]
+        for c in unmet:
+            print(f"Warning: case {c.case.id} {c.impl} T={c.threads} reached {c.stats.count} samples "
+                  f"with a relative CI of {c.stats.relative_ci():.2f}%", file=sys.stderr)
+    if scheduler.failures:
+        print(f"{scheduler.failures} jobs failed; rerun to retry them.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,37 +2,43 @@
 utils.py
 
 Utility functions for loading summary data and generating plots for
-the linked list experiments.  These helpers are used by the
-plot_case*.py scripts to avoid duplicating common logic.
+the linked list experiments.  These helpers are used by
+plot_cases.py to avoid duplicating common logic.
 """
 
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
-def plot_results(summary_csv: str, output_png: str, case_title: str) -> None:
+from results_db import load_summary
+
+def plot_results(data_dir: str, case: int, output_png: str, case_title: str) -> None:
     """
-    Generate a line chart with error bars from a summary CSV file.
+    Generate a line chart with error bars from the summary of one case.
 
     Parameters:
-        summary_csv: Path to the CSV file containing columns
-            implementation, threads, average, stddev.
+        data_dir: Directory holding results.db (or, for older data,
+            caseX_summary.csv files); see results_db.load_summary().
+        case: Workload case number.
         output_png: Path where the generated PNG should be saved.
         case_title: Title to display at the top of the plot.
 
     The function groups data by implementation and plots average
     execution time against the number of threads with error bars
     representing the standard deviation.  The x‑axis is threads and
-    the y‑axis is time in seconds.  No specific colours are set; the
+    the y‑axis is time in microseconds, or throughput in Mops/s when
+    the series was run with --duration.  No specific colours are set; the
     default matplotlib cycle is used.  A legend distinguishes
     implementations.
     """
     # Read the data
-    df = pd.read_csv(summary_csv)
-    # Ensure numeric types and convert to microseconds
+    df = pd.DataFrame(load_summary(data_dir, case))
+    # Ensure numeric types and convert to microseconds (or Mops/s)
+    throughput = df['metric'].iloc[0] == 'ops_per_sec'
+    scale = 1e-6 if throughput else 1_000_000
     df['threads'] = df['threads'].astype(int)
-    df['average'] = df['average'].astype(float) * 1_000_000
-    df['stddev'] = df['stddev'].astype(float) * 1_000_000
+    df['average'] = df['average'].astype(float) * scale
+    df['stddev'] = df['stddev'].astype(float) * scale
     # Create the figure and axis
     fig, ax = plt.subplots()
     for impl in df['implementation'].unique():
@@ -42,7 +48,7 @@ def plot_results(summary_csv: str, output_png: str, case_title: str) -> None:
         yerr = sub['stddev']
         ax.errorbar(x, y, yerr=yerr, label=impl, marker='o')
     ax.set_xlabel('Threads')
-    ax.set_ylabel('Time (microseconds)')
+    ax.set_ylabel('Throughput (Mops/s)' if throughput else 'Time (microseconds)')
     ax.set_title(case_title)
     ax.legend()
     fig.tight_layout()
@@ -51,4 +57,62 @@ def plot_results(summary_csv: str, output_png: str, case_title: str) -> None:
     if out_dir and not os.path.exists(out_dir):
         os.makedirs(out_dir, exist_ok=True)
     fig.savefig(output_png)
-    plt.close(fig)
\ No newline at end of file
+    plt.close(fig)
+
+def plot_sweep(data_dir: str, sweep, output_png: str) -> bool:
+    """
+    Plot the scaling curve of one sweep of the experiment spec.
+
+    Parameters:
+        data_dir: Directory holding results.db; see
+            results_db.load_summary().
+        sweep: An experiments.Sweep.
+        output_png: Path where the generated PNG should be saved.
+
+    The x-axis is the swept parameter (log scale) and the y-axis the
+    average time per operation in nanoseconds, so that sweeps over m
+    show a flat line when the cost per operation does not change.  A
+    series run with --duration, whose trials all take the same time,
+    is plotted as throughput in Mops/s instead.
+    Every thread count measured gets a panel of its own, with one line
+    per implementation.  Returns False, without writing anything, if
+    none of the sweep's cases has results.
+    """
+    frames = []
+    for case in sweep.cases:
+        rows = load_summary(data_dir, case.id)
+        if rows:
+            df = pd.DataFrame(rows)
+            df['x'] = sweep.value(case)
+            if df['metric'].iloc[0] == 'ops_per_sec':
+                df['y'] = df['average'].astype(float) / 1e6
+            else:
+                df['y'] = df['average'].astype(float) / case.m * 1e9
+            frames.append(df)
+    if not frames:
+        return False
+    df = pd.concat(frames, ignore_index=True)
+    throughput = df['metric'].iloc[0] == 'ops_per_sec'
+    df['threads'] = df['threads'].astype(int)
+    thread_counts = sorted(df['threads'].unique())
+    fig, axes = plt.subplots(1, len(thread_counts), sharey=True, squeeze=False,
+                             figsize=(4 * len(thread_counts), 4))
+    for ax, t in zip(axes[0], thread_counts):
+        sub = df[df['threads'] == t]
+        for impl in sub['implementation'].unique():
+            line = sub[sub['implementation'] == impl].sort_values('x')
+            ax.plot(line['x'], line['y'], label=impl, marker='o')
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel(sweep.axis)
+        ax.set_title(f'{t} threads')
+    axes[0][0].set_ylabel('Throughput (Mops/s)' if throughput else 'Time per operation (ns)')
+    axes[0][-1].legend()
+    fig.suptitle(sweep.title)
+    fig.tight_layout()
+    out_dir = os.path.dirname(output_png)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+    fig.savefig(output_png)
+    plt.close(fig)
+    return True
@@ -0,0 +1,161 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdbool.h>
+#include <pthread.h>
+#include <stdatomic.h>
+
+#include "ebr.h"
+
+// Retired nodes are kept in three limbo lists, one per epoch modulo 3.
+#define EBR_EPOCHS 3
+// Try to advance the global epoch after this many retirements.
+#define EBR_ADVANCE_THRESHOLD 64
+
+typedef struct {
+    ebr_node_t *head;
+    unsigned long epoch;
+} limbo_t;
+
+typedef struct ebr_record {
+    atomic_ulong epoch;        // global epoch observed at ebr_enter()
+    atomic_bool active;        // inside an enter/exit section
+    atomic_bool in_use;        // owned by a live thread
+    limbo_t limbo[EBR_EPOCHS];
+    unsigned long retired;     // retirements since the last advance attempt
+    struct ebr_record *next;
+} ebr_record_t;
+
+static atomic_ulong global_epoch = 0;
+static _Atomic(ebr_record_t *) records = NULL;
+static void (*free_node)(ebr_node_t *node) = NULL;
+
+static pthread_key_t record_key;
+static pthread_once_t record_key_once = PTHREAD_ONCE_INIT;
+static __thread ebr_record_t *self = NULL;
+
+// Thread exit: leave the record (and its limbo lists) for the next
+// thread that registers.
+static void release_record(void *ptr) {
+    ebr_record_t *rec = (ebr_record_t *)ptr;
+    atomic_store_explicit(&rec->active, false, memory_order_release);
+    atomic_store_explicit(&rec->in_use, false, memory_order_release);
+}
+
+static void make_record_key(void) {
+    pthread_key_create(&record_key, release_record);
+}
+
+// NULL if a new record is needed and cannot be allocated.
+static ebr_record_t *acquire_record(void) {
+    ebr_record_t *rec;
+
+    pthread_once(&record_key_once, make_record_key);
+
+    // Reuse a record abandoned by an exited thread if there is one.
+    for (rec = atomic_load(&records); rec != NULL; rec = rec->next) {
+        bool expected = false;
+        if (!atomic_load_explicit(&rec->in_use, memory_order_relaxed) &&
+            atomic_compare_exchange_strong(&rec->in_use, &expected, true)) {
+            break;
+        }
+    }
+    if (rec == NULL) {
+        rec = calloc(1, sizeof(ebr_record_t));
+        if (rec == NULL) {
+            perror("calloc");
+            return NULL;
+        }
+        atomic_init(&rec->in_use, true);
+        ebr_record_t *top = atomic_load(&records);
+        do {
+            rec->next = top;
+        } while (!atomic_compare_exchange_weak(&records, &top, rec));
+    }
+    pthread_setspecific(record_key, rec);
+    return rec;
+}
+
+static void free_limbo(limbo_t *limbo) {
+    ebr_node_t *node = limbo->head;
+    while (node != NULL) {
+        ebr_node_t *next = node->next;
+        free_node(node);
+        node = next;
+    }
+    limbo->head = NULL;
+}
+
+// Free every limbo list whose epoch is at least two behind `epoch`.
+static void reclaim(ebr_record_t *rec, unsigned long epoch) {
+    for (int i = 0; i < EBR_EPOCHS; i++) {
+        if (rec->limbo[i].head != NULL && rec->limbo[i].epoch + 2 <= epoch) {
+            free_limbo(&rec->limbo[i]);
+        }
+    }
+}
+
+// The epoch may advance once every active thread has observed it.
+static void try_advance(void) {
+    unsigned long epoch = atomic_load(&global_epoch);
+
+    for (ebr_record_t *rec = atomic_load(&records); rec != NULL; rec = rec->next) {
+        if (atomic_load(&rec->active) && atomic_load(&rec->epoch) != epoch) {
+            return;
+        }
+    }
+    atomic_compare_exchange_strong(&global_epoch, &epoch, epoch + 1);
+}
+
+void ebr_init(void (*free_fn)(ebr_node_t *node)) {
+    free_node = free_fn;
+}
+
+int ebr_enter(void) {
+    if (self == NULL) {
+        self = acquire_record();
+        if (self == NULL) {
+            return -1;
+        }
+    }
+    atomic_store_explicit(&self->active, true, memory_order_relaxed);
+    // The store to active must be visible before any shared node is read.
+    unsigned long epoch = atomic_load(&global_epoch);
+    atomic_store(&self->epoch, epoch);
+    atomic_thread_fence(memory_order_seq_cst);
+    reclaim(self, epoch);
+    return 0;
+}
+
+void ebr_exit(void) {
+    atomic_store_explicit(&self->active, false, memory_order_release);
+}
+
+void ebr_retire(ebr_node_t *node) {
+    // Tag with the current global epoch rather than the one observed at
+    // ebr_enter(): a thread that entered after the global epoch moved on
+    // may still hold a reference to the node.
+    unsigned long epoch = atomic_load(&global_epoch);
+    limbo_t *limbo = &self->limbo[epoch % EBR_EPOCHS];
+
+    // A bucket still holding an older epoch is at least three epochs old.
+    if (limbo->epoch != epoch) {
+        free_limbo(limbo);
+        limbo->epoch = epoch;
+    }
+    node->next = limbo->head;
+    limbo->head = node;
+
+    if (++self->retired >= EBR_ADVANCE_THRESHOLD) {
+        self->retired = 0;
+        try_advance();
+    }
+}
+
+void ebr_drain(void) {
+    for (ebr_record_t *rec = atomic_load(&records); rec != NULL; rec = rec->next) {
+        for (int i = 0; i < EBR_EPOCHS; i++) {
+            free_limbo(&rec->limbo[i]);
+        }
+        rec->retired = 0;
+    }
+}
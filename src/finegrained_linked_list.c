@@ -0,0 +1,142 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <pthread.h>
+#include "workload.h"
+#include "harness.h"
+#include "pool.h"
+
+// Linked list node structure with its own mutex
+struct list_node_s {
+    int data;
+    struct list_node_s* next;
+    pthread_mutex_t mutex;
+};
+
+// Sentinel in front of the first node.  Its mutex protects the head
+// pointer, so the first real node is locked exactly like any other.
+static struct list_node_s head_sentinel = {0, NULL, PTHREAD_MUTEX_INITIALIZER};
+
+// Walk the list hand over hand until curr is the first node with
+// data >= value (or NULL).  Returns with pred and curr (if any) locked.
+static void Locate(int value, struct list_node_s** pred_pp, struct list_node_s** curr_pp) {
+    struct list_node_s* pred_p = &head_sentinel;
+    struct list_node_s* curr_p;
+
+    pthread_mutex_lock(&pred_p->mutex);
+    curr_p = pred_p->next;
+    if (curr_p != NULL) {
+        pthread_mutex_lock(&curr_p->mutex);
+    }
+    while (curr_p != NULL && curr_p->data < value) {
+        pthread_mutex_unlock(&pred_p->mutex);
+        pred_p = curr_p;
+        curr_p = curr_p->next;
+        if (curr_p != NULL) {
+            pthread_mutex_lock(&curr_p->mutex);
+        }
+    }
+    *pred_pp = pred_p;
+    *curr_pp = curr_p;
+}
+
+static void Unlock(struct list_node_s* pred_p, struct list_node_s* curr_p) {
+    if (curr_p != NULL) {
+        pthread_mutex_unlock(&curr_p->mutex);
+    }
+    pthread_mutex_unlock(&pred_p->mutex);
+}
+
+// Function to check if a value is in the list
+static int Member(int value) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+    int found;
+
+    Locate(value, &pred_p, &curr_p);
+    found = (curr_p != NULL && curr_p->data == value);
+    Unlock(pred_p, curr_p);
+    return found;
+}
+
+// Function to insert a value into the list
+static int Insert(int value) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+    struct list_node_s* temp_p;
+
+    Locate(value, &pred_p, &curr_p);
+    if (curr_p != NULL && curr_p->data == value) {
+        Unlock(pred_p, curr_p);
+        return 0;
+    }
+    temp_p = NODE_ALLOC(sizeof(struct list_node_s));
+    if (temp_p == NULL) {
+        Unlock(pred_p, curr_p);
+        return -1;
+    }
+    temp_p->data = value;
+    temp_p->next = curr_p;
+    pthread_mutex_init(&temp_p->mutex, NULL);
+    pred_p->next = temp_p;
+    Unlock(pred_p, curr_p);
+    return 1;
+}
+
+// Function to delete a value from the list
+static int Delete(int value) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+
+    Locate(value, &pred_p, &curr_p);
+    if (curr_p == NULL || curr_p->data != value) {
+        Unlock(pred_p, curr_p);
+        return 0;
+    }
+    // Any other thread must hold pred's lock before it can reach curr,
+    // so nobody can be waiting on curr once it is unlinked.
+    pred_p->next = curr_p->next;
+    pthread_mutex_unlock(&curr_p->mutex);
+    pthread_mutex_unlock(&pred_p->mutex);
+    pthread_mutex_destroy(&curr_p->mutex);
+    NODE_FREE(curr_p);
+    return 1;
+}
+
+// Function to free the entire linked list
+static void FreeList(void) {
+    struct list_node_s* curr_p = head_sentinel.next;
+    struct list_node_s* temp_p;
+    while (curr_p != NULL) {
+        temp_p = curr_p;
+        curr_p = curr_p->next;
+        pthread_mutex_destroy(&temp_p->mutex);
+        NODE_FREE(temp_p);
+    }
+    head_sentinel.next = NULL;
+}
+
+static int Execute(const operation_t* op) {
+    switch (op->type) {
+        case OP_MEMBER:
+            return Member(op->key);
+        case OP_INSERT:
+            return Insert(op->key);
+        case OP_DELETE:
+            return Delete(op->key);
+    }
+    return 0;
+}
+
+const list_impl_t finegrained_impl = {
+    .name = "finegrained",
+    .threaded = true,
+    .node_size = sizeof(struct list_node_s),
+    .execute = Execute,
+    .clear = FreeList,
+};
+
+#ifndef LINKEDLIST_LIBRARY
+int main(int argc, char* argv[]) {
+    return harness_main(argc, argv, &finegrained_impl);
+}
+#endif
@@ -0,0 +1,202 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdbool.h>
+#include <pthread.h>
+#include <sched.h>
+#include <stdatomic.h>
+#include "workload.h"
+#include "harness.h"
+#include "pool.h"
+
+// Linked list node structure
+struct list_node_s {
+    int data;
+    struct list_node_s* next;
+};
+
+// Per-thread publication slot, one cache line each.  The owner writes
+// op and raises pending; the combiner writes result and lowers it.
+struct slot_s {
+    _Alignas(CACHE_LINE_SIZE) atomic_bool pending;
+    operation_t op;
+    int result;
+};
+
+// Global head pointer, only ever touched by the thread holding the
+// combiner lock
+static struct list_node_s* head = NULL;
+static pthread_mutex_t combiner_lock = PTHREAD_MUTEX_INITIALIZER;
+
+static struct slot_s* slots;
+static int n_slots;
+static atomic_int next_slot;
+static __thread struct slot_s* my_slot = NULL;
+// Bumped by every Setup(); a slot claimed in an earlier run (possible
+// for the calling thread of liblinkedlist.so) is claimed again.
+static unsigned long run_generation;
+static __thread unsigned long my_generation;
+
+// The combiner's batch: indices of the pending slots, in key order
+static int* batch;
+
+// Claim a slot the first time a thread executes an operation.  The
+// harness keeps the same workers for every trial, so a thread holds its
+// slot for the whole run, and num_threads slots plus one for the main
+// thread (which builds the list before each trial) are always enough;
+// NULL if they are not.
+static struct slot_s* MySlot(void) {
+    if (my_slot == NULL || my_generation != run_generation) {
+        int i = atomic_fetch_add(&next_slot, 1);
+        if (i >= n_slots) {
+            fprintf(stderr, "flat combining: more threads than publication slots\n");
+            return NULL;
+        }
+        my_slot = &slots[i];
+        my_generation = run_generation;
+    }
+    return my_slot;
+}
+
+static int CompareRequests(const void* a, const void* b) {
+    const struct slot_s* x = &slots[*(const int*)a];
+    const struct slot_s* y = &slots[*(const int*)b];
+
+    if (x->op.key != y->op.key) {
+        return x->op.key < y->op.key ? -1 : 1;
+    }
+    return *(const int*)a - *(const int*)b;
+}
+
+// Apply one request at the position link points to: *link is the
+// first node with data >= key, or NULL.  -1 if an insert runs out of
+// memory.
+static int Apply(struct list_node_s** link, const operation_t* op) {
+    struct list_node_s* curr_p = *link;
+    bool present = (curr_p != NULL && curr_p->data == op->key);
+
+    switch (op->type) {
+        case OP_MEMBER:
+            return present;
+        case OP_INSERT:
+            if (present) {
+                return 0;
+            }
+            curr_p = NODE_ALLOC(sizeof(struct list_node_s));
+            if (curr_p == NULL) {
+                return -1;
+            }
+            curr_p->data = op->key;
+            curr_p->next = *link;
+            *link = curr_p;
+            return 1;
+        case OP_DELETE:
+            if (!present) {
+                return 0;
+            }
+            *link = curr_p->next;
+            NODE_FREE(curr_p);
+            return 1;
+    }
+    return 0;
+}
+
+// Collect every pending request, sort the batch by key and serve it in
+// a single traversal of the list.  Requests on the same key are applied
+// in slot order, and each sees the effect of the previous one.
+static void Combine(void) {
+    struct list_node_s** link = &head;
+    int k = 0;
+
+    for (int i = 0; i < n_slots; i++) {
+        if (atomic_load_explicit(&slots[i].pending, memory_order_acquire)) {
+            batch[k++] = i;
+        }
+    }
+    qsort(batch, k, sizeof(int), CompareRequests);
+    for (int j = 0; j < k; j++) {
+        struct slot_s* s = &slots[batch[j]];
+        while (*link != NULL && (*link)->data < s->op.key) {
+            link = &(*link)->next;
+        }
+        s->result = Apply(link, &s->op);
+    }
+    for (int j = 0; j < k; j++) {
+        atomic_store_explicit(&slots[batch[j]].pending, false, memory_order_release);
+    }
+}
+
+// Publish the operation, then either wait for a combiner to serve it or
+// become the combiner.
+static int Execute(const operation_t* op) {
+    struct slot_s* s = MySlot();
+
+    if (s == NULL) {
+        return -1;
+    }
+    s->op = *op;
+    atomic_store_explicit(&s->pending, true, memory_order_release);
+    for (;;) {
+        if (!atomic_load_explicit(&s->pending, memory_order_acquire)) {
+            return s->result;
+        }
+        if (pthread_mutex_trylock(&combiner_lock) == 0) {
+            harness_lock_acquired();
+            // Our own request is pending, so this pass serves it.
+            Combine();
+            pthread_mutex_unlock(&combiner_lock);
+            return s->result;
+        }
+        sched_yield();
+    }
+}
+
+static int Setup(const harness_options_t* opts) {
+    n_slots = (int)opts->num_threads + 1;
+    slots = aligned_alloc(CACHE_LINE_SIZE, n_slots * sizeof(struct slot_s));
+    batch = malloc(n_slots * sizeof(int));
+    if (slots == NULL || batch == NULL) {
+        perror("malloc");
+        free(batch);
+        free(slots);
+        return -1;
+    }
+    for (int i = 0; i < n_slots; i++) {
+        atomic_init(&slots[i].pending, false);
+    }
+    atomic_store(&next_slot, 0);
+    run_generation++;
+    return 0;
+}
+
+// Function to free the entire linked list
+static void FreeList(void) {
+    struct list_node_s* curr_p = head;
+    struct list_node_s* temp_p;
+    while (curr_p != NULL) {
+        temp_p = curr_p;
+        curr_p = curr_p->next;
+        NODE_FREE(temp_p);
+    }
+    head = NULL;
+}
+
+static void Teardown(void) {
+    free(batch);
+    free(slots);
+}
+
+const list_impl_t flatcombining_impl = {
+    .name = "flatcombining",
+    .threaded = true,
+    .node_size = sizeof(struct list_node_s),
+    .setup = Setup,
+    .execute = Execute,
+    .clear = FreeList,
+    .teardown = Teardown,
+};
+
+#ifndef LINKEDLIST_LIBRARY
+int main(int argc, char* argv[]) {
+    return harness_main(argc, argv, &flatcombining_impl);
+}
+#endif
@@ -0,0 +1,1078 @@
+#define _GNU_SOURCE
+#include <errno.h>
+#include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <getopt.h>
+#include <pthread.h>
+#include <sched.h>
+#include <stdatomic.h>
+#include <limits.h>
+
+#include "harness.h"
+#include "histogram.h"
+#include "lockstat.h"
+#include "mempolicy.h"
+#include "perf.h"
+#include "pool.h"
+#include "timing.h"
+#include "topology.h"
+
+#define N_OP_TYPES 3
+#define MAX_IMPL_OPTIONS 8
+#define MAX_THREADS 4096
+#define IMPL_OPTION_BASE 256
+
+// Per-thread latency histograms, indexed by op_type_t
+struct latency_set {
+    histogram_t total[N_OP_TYPES];
+    histogram_t wait[N_OP_TYPES];   // start of operation until lock acquired
+    histogram_t hold[N_OP_TYPES];   // lock acquired until operation returns
+};
+
+static const char *op_names[N_OP_TYPES] = {"member", "insert", "delete"};
+static const double percentiles[] = {50.0, 90.0, 99.0, 99.9};
+static const char *percentile_names[] = {"p50", "p90", "p99", "p999"};
+#define N_PERCENTILES (sizeof(percentiles) / sizeof(percentiles[0]))
+
+bool harness_latency_enabled = false;
+__thread uint64_t harness_lock_acquired_ns = 0;
+
+static const list_impl_t *impl;
+
+// Raised by the main thread when a --duration trial is over.
+static atomic_bool stop_flag;
+
+// Persistent worker pool.  The workers are created once per run and
+// meet the main thread at start_barrier before every trial and at
+// done_barrier after it, so thread creation and joining stay out of
+// the timed region and all workers are released together.
+static pthread_barrier_t start_barrier;
+static pthread_barrier_t done_barrier;
+static void *(*trial_body)(void *thread_ptr);
+static bool workers_exit;
+// Held while the pool is being created; workers wait on it before
+// their first barrier, whose size is the number actually created.
+static pthread_mutex_t launch_lock = PTHREAD_MUTEX_INITIALIZER;
+// What the workers do once released: a trial, or (--numa firsttouch)
+// building their share of the list.
+static enum { PHASE_TRIAL, PHASE_POPULATE } phase;
+
+// Snapshot of the initial keys, for the workers to populate from.
+static const int *snapshot_keys;
+static int snapshot_n;
+static atomic_long populate_turn;
+
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [options] <num_threads> <n_initial_nodes> <n_total_operations> <member_frac> <insert_frac> <delete_frac>\n", prog);
+    fprintf(stderr, "       %s [options] --workload FILE <num_threads>\n", prog);
+    fprintf(stderr, "Options:\n");
+    fprintf(stderr, "  --trials K    run K timed trials in this process (default 1)\n");
+    fprintf(stderr, "  --warmup W    run W untimed trials before the timed ones (default 0)\n");
+    fprintf(stderr, "  --csv         print a \"trial,time\" header and one CSV row per trial\n");
+    fprintf(stderr, "  --latency     report per-operation latency percentiles\n");
+    fprintf(stderr, "  --duration D  run each trial for D seconds (\"2\", \"2s\", \"500ms\") over\n");
+    fprintf(stderr, "                a ring of max(m, %ld) operations and report throughput\n", DURATION_RING_OPS);
+    fprintf(stderr, "  --workload F  replay the initial keys and operations of workload file F\n");
+    fprintf(stderr, "  --seed S      seed the key and operation generators (default: time)\n");
+    fprintf(stderr, "  --keys SPEC   key distribution of the operations: uniform (default),\n");
+    fprintf(stderr, "                zipf[:THETA], hotset[:FRAC[:PROB]] or sequential\n");
+    fprintf(stderr, "  --key-range R draw keys from [0, R) (default %d)\n", WORKLOAD_KEY_SPACE);
+    fprintf(stderr, "  --pin POLICY  pin worker threads: none (default), compact, scatter or smt\n");
+    fprintf(stderr, "  --perf        count cycles, instructions, cache/LLC misses, context switches\n");
+    fprintf(stderr, "                and migrations per thread with perf_event_open\n");
+    fprintf(stderr, "  --lockstat    count lock acquisitions, contention, wait and hold time\n");
+    fprintf(stderr, "  --numa POLICY place list nodes and operations: none (default), firsttouch,\n");
+    fprintf(stderr, "                interleave or bind:NODE\n");
+    for (const impl_option_t *o = impl->options; o != NULL && o->name != NULL; o++) {
+        char flag[64];
+        snprintf(flag, sizeof(flag), "--%s V", o->name);
+        fprintf(stderr, "  %-13s %s\n", flag, o->help);
+    }
+}
+
+// Parse "2", "2s", "1.5s" or "500ms" into seconds; -1 on error.
+static double parse_duration(const char *text) {
+    char *end;
+    double value = strtod(text, &end);
+
+    if (end == text || value <= 0) {
+        return -1;
+    }
+    if (*end == '\0' || strcmp(end, "s") == 0) {
+        return value;
+    }
+    if (strcmp(end, "ms") == 0) {
+        return value / 1000.0;
+    }
+    return -1;
+}
+
+static const struct option base_opts[] = {
+    {"trials", required_argument, NULL, 't'},
+    {"warmup", required_argument, NULL, 'w'},
+    {"csv", no_argument, NULL, 'c'},
+    {"latency", no_argument, NULL, 'l'},
+    {"duration", required_argument, NULL, 'd'},
+    {"workload", required_argument, NULL, 'f'},
+    {"seed", required_argument, NULL, 's'},
+    {"keys", required_argument, NULL, 'k'},
+    {"key-range", required_argument, NULL, 'r'},
+    {"pin", required_argument, NULL, 'p'},
+    {"perf", no_argument, NULL, 'P'},
+    {"lockstat", no_argument, NULL, 'L'},
+    {"numa", required_argument, NULL, 'n'},
+    {"help", no_argument, NULL, 'h'},
+};
+#define N_BASE_OPTS (int)(sizeof(base_opts) / sizeof(base_opts[0]))
+
+void harness_options_init(const list_impl_t *list_impl, harness_options_t *opts) {
+    static const key_dist_t default_keys = KEY_DIST_DEFAULT;
+
+    impl = list_impl;
+    memset(opts, 0, sizeof(*opts));
+    opts->trials = 1;
+    opts->keys = default_keys;
+    for (const impl_option_t *o = impl->options; o != NULL && o->name != NULL; o++) {
+        if (o->default_value != NULL) {
+            o->set(o->default_value);
+        }
+    }
+}
+
+// Apply one option, identified by its getopt code, to opts.  The
+// implementation's own options have codes from IMPL_OPTION_BASE up.
+static int apply_option(harness_options_t *opts, int code, const char *arg) {
+    switch (code) {
+        case 't':
+            opts->trials = atoi(arg);
+            break;
+        case 'w':
+            opts->warmup = atoi(arg);
+            break;
+        case 'c':
+            opts->csv = true;
+            break;
+        case 'l':
+            opts->latency = true;
+            break;
+        case 'd':
+            opts->duration = parse_duration(arg);
+            if (opts->duration < 0) {
+                fprintf(stderr, "Invalid duration '%s'.\n", arg);
+                return -1;
+            }
+            break;
+        case 'f':
+            opts->workload = arg;
+            break;
+        case 's':
+            opts->seed = strtoul(arg, NULL, 10);
+            opts->seeded = true;
+            break;
+        case 'k':
+            return key_dist_parse(arg, &opts->keys);
+        case 'r':
+            opts->keys.key_range = atoi(arg);
+            break;
+        case 'P':
+            opts->perf = true;
+            break;
+        case 'L':
+            opts->lockstat = true;
+            break;
+        case 'p':
+            return pin_policy_parse(arg, &opts->pin);
+        case 'n':
+            return numa_policy_parse(arg, &opts->numa);
+        default:
+            if (code >= IMPL_OPTION_BASE) {
+                return impl->options[code - IMPL_OPTION_BASE].set(arg);
+            }
+            return -1;
+    }
+    return 0;
+}
+
+int harness_set_option(harness_options_t *opts, const char *name, const char *value) {
+    for (int i = 0; i < N_BASE_OPTS; i++) {
+        if (base_opts[i].val != 'h' && strcmp(name, base_opts[i].name) == 0) {
+            if ((base_opts[i].has_arg == required_argument) != (value != NULL)) {
+                fprintf(stderr, "Option '%s' %s a value.\n", name,
+                        value != NULL ? "does not take" : "requires");
+                return -1;
+            }
+            return apply_option(opts, base_opts[i].val, value);
+        }
+    }
+    for (int i = 0; impl->options != NULL && impl->options[i].name != NULL; i++) {
+        if (strcmp(name, impl->options[i].name) == 0) {
+            if (value == NULL) {
+                fprintf(stderr, "Option '%s' requires a value.\n", name);
+                return -1;
+            }
+            return apply_option(opts, IMPL_OPTION_BASE + i, value);
+        }
+    }
+    fprintf(stderr, "Unknown option '%s' for %s.\n", name, impl->name);
+    return -1;
+}
+
+static int parse_options(int argc, char *argv[], harness_options_t *opts) {
+    struct option long_opts[N_BASE_OPTS + MAX_IMPL_OPTIONS + 1];
+    int n_impl = 0;
+    int c;
+
+    memcpy(long_opts, base_opts, sizeof(base_opts));
+    for (const impl_option_t *o = impl->options; o != NULL && o->name != NULL; o++) {
+        if (n_impl == MAX_IMPL_OPTIONS) {
+            break;
+        }
+        long_opts[N_BASE_OPTS + n_impl] = (struct option){o->name, required_argument, NULL,
+                                                          IMPL_OPTION_BASE + n_impl};
+        n_impl++;
+    }
+    long_opts[N_BASE_OPTS + n_impl] = (struct option){NULL, 0, NULL, 0};
+
+    while ((c = getopt_long(argc, argv, "", long_opts, NULL)) != -1) {
+        if (c == '?' || c == 'h') {
+            usage(argv[0]);
+            return -1;
+        }
+        if (apply_option(opts, c, optarg) != 0) {
+            return -1;
+        }
+    }
+
+    if (argc - optind != (opts->workload != NULL ? 1 : 6)) {
+        usage(argv[0]);
+        return -1;
+    }
+    if (opts->trials <= 0 || opts->warmup < 0) {
+        fprintf(stderr, "Trials must be positive and warmup non-negative.\n");
+        return -1;
+    }
+    opts->num_threads = strtol(argv[optind], NULL, 10);
+    if (opts->workload != NULL) {
+        // Everything else comes from the file's header.
+        return 0;
+    }
+    opts->n_initial_nodes = atoi(argv[optind + 1]);
+    opts->n_total_operations = atol(argv[optind + 2]);
+    opts->member_frac = atof(argv[optind + 3]);
+    opts->insert_frac = atof(argv[optind + 4]);
+    opts->delete_frac = atof(argv[optind + 5]);
+
+    return key_dist_validate(&opts->keys, opts->n_initial_nodes);
+}
+
+// Build the list from the sorted snapshot.  Inserting in descending
+// order makes every Insert a constant-time insertion at the head of a
+// linked list; structures for which that is costly provide load().
+static int populate(const int *keys, int n) {
+    operation_t op;
+    op.type = OP_INSERT;
+    for (int i = n - 1; i >= 0; i--) {
+        op.key = keys[i];
+        if (impl->execute(&op) < 0) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
+int harness_execute(harness_thread_t *t, const operation_t *op) {
+    struct latency_set *lat = t->latency;
+
+    if (lat == NULL) {
+        int result = impl->execute(op);
+        if (result < 0) {
+            t->failed = true;
+        }
+        return result;
+    }
+    harness_lock_acquired_ns = 0;
+    uint64_t start = time_now_ns();
+    int result = impl->execute(op);
+    uint64_t end = time_now_ns();
+    if (result < 0) {
+        t->failed = true;
+        return result;
+    }
+    hist_record(&lat->total[op->type], end - start);
+    if (harness_lock_acquired_ns != 0) {
+        hist_record(&lat->wait[op->type], harness_lock_acquired_ns - start);
+        hist_record(&lat->hold[op->type], end - harness_lock_acquired_ns);
+    }
+    return result;
+}
+
+static void *Thread_work(void *thread_ptr) {
+    harness_thread_t *t = (harness_thread_t *)thread_ptr;
+    const operation_t *ops = t->operations + t->my_start;
+
+    lockstat_self = t->lockstat;
+    if (t->perf != NULL) {
+        perf_counters_start(t->perf);
+    }
+    if (t->latency != NULL) {
+        for (long i = 0; i < t->my_count; i++) {
+            if (harness_execute(t, &ops[i]) < 0) {
+                break;
+            }
+        }
+    } else {
+        for (long i = 0; i < t->my_count; i++) {
+            if (impl->execute(&ops[i]) < 0) {
+                t->failed = true;
+                break;
+            }
+        }
+    }
+    if (t->perf != NULL) {
+        perf_counters_stop(t->perf);
+    }
+    lockstat_self = NULL;
+    return NULL;
+}
+
+// --duration body: walk the operations ring from this thread's slice
+// onwards, wrapping around, until the main thread raises stop_flag.
+static void *Thread_run(void *thread_ptr) {
+    harness_thread_t *t = (harness_thread_t *)thread_ptr;
+    const operation_t *ops = t->operations;
+    long m = t->ring_ops;
+    long i = t->my_start;
+    long done = 0;
+
+    lockstat_self = t->lockstat;
+    if (t->perf != NULL) {
+        perf_counters_start(t->perf);
+    }
+    if (t->latency != NULL) {
+        while (!atomic_load_explicit(&stop_flag, memory_order_relaxed)) {
+            if (harness_execute(t, &ops[i]) < 0) {
+                break;
+            }
+            if (++i == m) {
+                i = 0;
+            }
+            done++;
+        }
+    } else {
+        while (!atomic_load_explicit(&stop_flag, memory_order_relaxed)) {
+            if (impl->execute(&ops[i]) < 0) {
+                t->failed = true;
+                break;
+            }
+            if (++i == m) {
+                i = 0;
+            }
+            done++;
+        }
+    }
+    if (t->perf != NULL) {
+        perf_counters_stop(t->perf);
+    }
+    lockstat_self = NULL;
+    t->ops_done = done;
+    return NULL;
+}
+
+// Give the thread a private copy of its slice of the operations, in
+// memory it touches first (or placed by the process memory policy).
+// Without the memory for it, the thread keeps using the shared array.
+static void localize_ops(harness_thread_t *t) {
+    if (t->my_count == 0) {
+        return;
+    }
+    t->local_ops = malloc(t->my_count * sizeof(operation_t));
+    if (t->local_ops == NULL) {
+        perror("malloc");
+        return;
+    }
+    memcpy(t->local_ops, t->operations + t->my_start, t->my_count * sizeof(operation_t));
+    t->operations = t->local_ops;
+    t->my_start = 0;
+    t->ring_ops = t->my_count;
+}
+
+// Insert this worker's slice of the initial keys.  Slices go in from
+// the highest keys down, one worker at a time, so that every insert
+// still lands at the head of the list, but each node is allocated (and
+// first touched) by a worker.
+static void populate_share(harness_thread_t *t) {
+    long num_threads = t->opts->num_threads;
+    int lo = (int)(snapshot_n * t->rank / num_threads);
+    int hi = (int)(snapshot_n * (t->rank + 1) / num_threads);
+    operation_t op;
+
+    while (atomic_load(&populate_turn) != t->rank) {
+        sched_yield();
+    }
+    op.type = OP_INSERT;
+    for (int i = hi - 1; i >= lo; i--) {
+        op.key = snapshot_keys[i];
+        if (impl->execute(&op) < 0) {
+            t->failed = true;
+            break;
+        }
+    }
+    atomic_store(&populate_turn, t->rank - 1);
+}
+
+// One trial of one thread, bracketed by its own timestamps.
+static void run_body(harness_thread_t *t) {
+    t->start_ns = time_now_ns();
+    trial_body(t);
+    t->end_ns = time_now_ns();
+}
+
+static void *Worker(void *thread_ptr) {
+    harness_thread_t *t = (harness_thread_t *)thread_ptr;
+
+    if (numa_policy_local_ops(&t->opts->numa)) {
+        localize_ops(t);
+    }
+    pthread_mutex_lock(&launch_lock);
+    pthread_mutex_unlock(&launch_lock);
+    for (;;) {
+        pthread_barrier_wait(&start_barrier);
+        if (workers_exit) {
+            return NULL;
+        }
+        if (phase == PHASE_POPULATE) {
+            populate_share(t);
+        } else {
+            run_body(t);
+        }
+        pthread_barrier_wait(&done_barrier);
+    }
+}
+
+static void row_add(harness_row_t *row, const char *name, double value) {
+    if (row->count < HARNESS_MAX_COLUMNS) {
+        snprintf(row->names[row->count], sizeof(row->names[0]), "%s", name);
+        row->values[row->count] = value;
+        row->count++;
+    }
+}
+
+// Percentile columns for one histogram; empty histograms give blanks.
+static void row_add_histogram(harness_row_t *row, const char *prefix, const histogram_t *h) {
+    char name[HARNESS_COLUMN_NAME];
+
+    for (size_t i = 0; i < N_PERCENTILES; i++) {
+        snprintf(name, sizeof(name), "%s_%s_ns", prefix, percentile_names[i]);
+        row_add(row, name, h->total ? (double)hist_percentile(h, percentiles[i]) : NAN);
+    }
+    snprintf(name, sizeof(name), "%s_max_ns", prefix);
+    row_add(row, name, h->total ? (double)h->max : NAN);
+}
+
+// Merge the per-thread histograms of a trial and add their percentiles.
+static void report_latency(harness_row_t *row, harness_thread_t *threads, long num_threads,
+                           struct latency_set *merged) {
+    char prefix[32];
+
+    for (int op = 0; op < N_OP_TYPES; op++) {
+        hist_reset(&merged->total[op]);
+        hist_reset(&merged->wait[op]);
+        hist_reset(&merged->hold[op]);
+        for (long i = 0; i < num_threads; i++) {
+            hist_merge(&merged->total[op], &threads[i].latency->total[op]);
+            hist_merge(&merged->wait[op], &threads[i].latency->wait[op]);
+            hist_merge(&merged->hold[op], &threads[i].latency->hold[op]);
+        }
+        row_add_histogram(row, op_names[op], &merged->total[op]);
+        snprintf(prefix, sizeof(prefix), "%s_wait", op_names[op]);
+        row_add_histogram(row, prefix, &merged->wait[op]);
+        snprintf(prefix, sizeof(prefix), "%s_hold", op_names[op]);
+        row_add_histogram(row, prefix, &merged->hold[op]);
+    }
+}
+
+// Total throughput and how evenly it was spread over the threads.
+// fairness is Jain's index, (sum x)^2 / (n * sum x^2): 1 when every
+// thread completed the same number of operations, 1/n when one did all.
+static void report_throughput(harness_row_t *row, const harness_thread_t *threads,
+                              long num_threads, double elapsed_time) {
+    double sum = 0, sum_sq = 0;
+    long min = threads[0].ops_done, max = threads[0].ops_done;
+
+    for (long i = 0; i < num_threads; i++) {
+        double x = (double)threads[i].ops_done;
+        sum += x;
+        sum_sq += x * x;
+        if (threads[i].ops_done < min) {
+            min = threads[i].ops_done;
+        }
+        if (threads[i].ops_done > max) {
+            max = threads[i].ops_done;
+        }
+    }
+    row_add(row, "ops", sum);
+    row_add(row, "ops_per_sec", (double)(long long)(sum / elapsed_time + 0.5));
+    row_add(row, "thread_ops_min", (double)min);
+    row_add(row, "thread_ops_max", (double)max);
+    row_add(row, "fairness", sum_sq > 0 ? sum * sum / (num_threads * sum_sq) : NAN);
+}
+
+// Spread of the workers' own timestamps: how far apart they started,
+// and how long the fastest and slowest took for their share.
+static void report_threads(harness_row_t *row, const harness_thread_t *threads, long num_threads) {
+    uint64_t first = threads[0].start_ns, last = threads[0].start_ns;
+    uint64_t min = UINT64_MAX, max = 0;
+    double sum = 0;
+
+    for (long i = 0; i < num_threads; i++) {
+        uint64_t busy = threads[i].end_ns - threads[i].start_ns;
+        if (threads[i].start_ns < first) {
+            first = threads[i].start_ns;
+        }
+        if (threads[i].start_ns > last) {
+            last = threads[i].start_ns;
+        }
+        if (busy < min) {
+            min = busy;
+        }
+        if (busy > max) {
+            max = busy;
+        }
+        sum += (double)busy;
+    }
+    row_add(row, "start_skew_ns", (double)(last - first));
+    row_add(row, "thread_time_min_ns", (double)min);
+    row_add(row, "thread_time_max_ns", (double)max);
+    row_add(row, "thread_imbalance", sum > 0 ? max / (sum / num_threads) : NAN);
+}
+
+// Event counts summed over the threads; an event any thread could not
+// count is left blank rather than under-reported.
+static void report_perf(harness_row_t *row, const harness_thread_t *threads, long num_threads) {
+    double total[PERF_N_EVENTS] = {0};
+    double max_cycles = 0;
+
+    for (long i = 0; i < num_threads; i++) {
+        for (int e = 0; e < PERF_N_EVENTS; e++) {
+            total[e] += threads[i].perf->value[e];
+        }
+        if (threads[i].perf->value[PERF_CYCLES] > max_cycles) {
+            max_cycles = threads[i].perf->value[PERF_CYCLES];
+        }
+    }
+    for (int e = 0; e < PERF_N_EVENTS; e++) {
+        row_add(row, perf_event_names[e], total[e]);
+    }
+    row_add(row, "ipc", total[PERF_INSTRUCTIONS] / total[PERF_CYCLES]);
+    // Cycles of the busiest thread: the critical path of the trial.
+    row_add(row, "thread_cycles_max", isnan(total[PERF_CYCLES]) ? NAN : max_cycles);
+}
+
+// Lock counters summed over the threads, per mode; a mode the
+// implementation never locks in gives blanks.  lock_wait_frac is the
+// share of the threads' time spent blocked on the lock, and
+// thread_lock_wait_frac_max that of the thread that waited longest.
+static void report_lockstat(harness_row_t *row, const harness_thread_t *threads,
+                            long num_threads, double elapsed_time) {
+    double ns_per_tick = lockstat_ns_per_tick();
+    double total_wait = 0, max_wait = 0;
+    char name[48];
+
+    for (int mode = 0; mode < LOCK_N_MODES; mode++) {
+        uint64_t acquisitions = 0, contended = 0, wait = 0, hold = 0;
+        for (long i = 0; i < num_threads; i++) {
+            acquisitions += threads[i].lockstat->acquisitions[mode];
+            contended += threads[i].lockstat->contended[mode];
+            wait += threads[i].lockstat->wait_ticks[mode];
+            hold += threads[i].lockstat->hold_ticks[mode];
+        }
+        snprintf(name, sizeof(name), "lock_%s_acquisitions", lock_mode_names[mode]);
+        row_add(row, name, acquisitions ? (double)acquisitions : NAN);
+        snprintf(name, sizeof(name), "lock_%s_contended", lock_mode_names[mode]);
+        row_add(row, name, acquisitions ? (double)contended : NAN);
+        snprintf(name, sizeof(name), "lock_%s_wait_ns", lock_mode_names[mode]);
+        row_add(row, name, acquisitions ? (double)(long long)(wait * ns_per_tick + 0.5) : NAN);
+        snprintf(name, sizeof(name), "lock_%s_hold_ns", lock_mode_names[mode]);
+        row_add(row, name, acquisitions ? (double)(long long)(hold * ns_per_tick + 0.5) : NAN);
+    }
+    for (long i = 0; i < num_threads; i++) {
+        double wait = 0;
+        for (int mode = 0; mode < LOCK_N_MODES; mode++) {
+            wait += threads[i].lockstat->wait_ticks[mode] * ns_per_tick * 1e-9;
+        }
+        total_wait += wait;
+        if (wait > max_wait) {
+            max_wait = wait;
+        }
+    }
+    row_add(row, "lock_wait_frac", total_wait / (num_threads * elapsed_time));
+    row_add(row, "thread_lock_wait_frac_max", max_wait / elapsed_time);
+}
+
+// Say once which events came back empty, so that blank columns are not
+// mistaken for a bug.
+static void warn_missing_perf(const harness_thread_t *threads) {
+    if (!perf_counters_available()) {
+        fprintf(stderr, "perf_event_open is unavailable (see /proc/sys/kernel/perf_event_paranoid); "
+                        "perf columns are left blank.\n");
+        return;
+    }
+    for (int e = 0; e < PERF_N_EVENTS; e++) {
+        if (isnan(threads[0].perf->value[e])) {
+            fprintf(stderr, "perf event %s is unavailable; its column is left blank.\n",
+                    perf_event_names[e]);
+        }
+    }
+}
+
+static void print_value(double value) {
+    if (isnan(value)) {
+        return;
+    }
+    if (value == (double)(long long)value) {
+        printf("%lld", (long long)value);
+    } else {
+        printf("%.6f", value);
+    }
+}
+
+static void print_header(const harness_row_t *row) {
+    printf("trial,time");
+    for (int i = 0; i < row->count; i++) {
+        printf(",%s", row->names[i]);
+    }
+    printf("\n");
+}
+
+// harness_report_fn of the programs: print each trial to stdout.
+static void print_row(int trial, double elapsed_time, const harness_row_t *row, void *arg) {
+    const harness_options_t *opts = (const harness_options_t *)arg;
+
+    if (opts->csv) {
+        if (trial == 0) {
+            print_header(row);
+        }
+        printf("%d,%.6f", trial, elapsed_time);
+        for (int i = 0; i < row->count; i++) {
+            printf(",");
+            print_value(row->values[i]);
+        }
+        printf("\n");
+        return;
+    }
+    printf("%.6f\n", elapsed_time);
+    for (int i = 0; i < row->count; i++) {
+        printf("# %s=", row->names[i]);
+        print_value(row->values[i]);
+        printf("\n");
+    }
+}
+
+// Split the operations array into one contiguous slice per thread, and
+// choose each thread's CPU if --pin was given.  -1 if the CPU order
+// cannot be built.
+static int partition(const harness_options_t *opts, const operation_t *operations,
+                      harness_thread_t *threads, struct latency_set *latency,
+                      perf_counters_t *perf, lockstat_t *lockstat) {
+    long num_threads = opts->num_threads;
+    long m = opts->n_total_operations;
+    long ops_per_thread = m / num_threads;
+    int *cpus = NULL;
+    int n_cpus = 0;
+
+    if (opts->pin != PIN_NONE) {
+        n_cpus = topology_cpu_order(opts->pin, &cpus);
+        if (n_cpus < 0) {
+            return -1;
+        }
+    }
+
+    for (long i = 0; i < num_threads; i++) {
+        threads[i].rank = i;
+        threads[i].operations = operations;
+        threads[i].my_start = i * ops_per_thread;
+        threads[i].my_count = (i == num_threads - 1) ? m - threads[i].my_start : ops_per_thread;
+        threads[i].opts = opts;
+        threads[i].latency = latency != NULL ? &latency[i] : NULL;
+        threads[i].perf = perf != NULL ? &perf[i] : NULL;
+        threads[i].lockstat = lockstat != NULL ? &lockstat[i] : NULL;
+        threads[i].ops_done = 0;
+        threads[i].cpu = n_cpus > 0 ? cpus[i % n_cpus] : -1;
+        threads[i].ring_ops = m;
+        threads[i].local_ops = NULL;
+        threads[i].failed = false;
+    }
+    free(cpus);
+    return 0;
+}
+
+// Create a worker, already bound to its CPU if it has one.
+static int start_thread(pthread_t *handle, harness_thread_t *t, void *(*work)(void *)) {
+    pthread_attr_t attr;
+    cpu_set_t set;
+    int status;
+
+    pthread_attr_init(&attr);
+    if (t->cpu >= 0) {
+        CPU_ZERO(&set);
+        CPU_SET(t->cpu, &set);
+        pthread_attr_setaffinity_np(&attr, sizeof(set), &set);
+    }
+    status = pthread_create(handle, &attr, work, t);
+    pthread_attr_destroy(&attr);
+    if (status != 0) {
+        fprintf(stderr, "pthread_create: %s\n", strerror(status));
+        return -1;
+    }
+    return 0;
+}
+
+// Whether trials run on the worker pool.  The serial program runs on
+// the main thread, except in --duration mode, where its single worker
+// gets a thread of its own so that the main thread is free to keep time.
+static bool use_workers(const harness_options_t *opts) {
+    return impl->threaded || opts->duration > 0;
+}
+
+// Create the worker pool, waiting at start_barrier for the first trial.
+// --duration loops over the ring; custom workers are bypassed there, as
+// they are defined by a fixed operation budget.  If a worker cannot be
+// created, the ones that were are shut down again and -1 is returned.
+static int start_workers(const harness_options_t *opts, pthread_t *thread_handles,
+                         harness_thread_t *threads) {
+    long num_threads = opts->num_threads;
+    long created = 0;
+
+    if (opts->duration > 0) {
+        trial_body = Thread_run;
+    } else {
+        trial_body = impl->worker != NULL ? impl->worker : Thread_work;
+    }
+    if (!use_workers(opts)) {
+        if (numa_policy_local_ops(&opts->numa)) {
+            localize_ops(&threads[0]);
+        }
+        return 0;
+    }
+    workers_exit = false;
+    pthread_mutex_lock(&launch_lock);
+    while (created < num_threads &&
+           start_thread(&thread_handles[created], &threads[created], Worker) == 0) {
+        created++;
+    }
+    pthread_barrier_init(&start_barrier, NULL, (unsigned)created + 1);
+    pthread_barrier_init(&done_barrier, NULL, (unsigned)created + 1);
+    pthread_mutex_unlock(&launch_lock);
+    if (created == num_threads) {
+        return 0;
+    }
+    workers_exit = true;
+    pthread_barrier_wait(&start_barrier);
+    for (long i = 0; i < created; i++) {
+        pthread_join(thread_handles[i], NULL);
+    }
+    pthread_barrier_destroy(&start_barrier);
+    pthread_barrier_destroy(&done_barrier);
+    return -1;
+}
+
+static void stop_workers(const harness_options_t *opts, pthread_t *thread_handles,
+                         harness_thread_t *threads) {
+    if (use_workers(opts)) {
+        workers_exit = true;
+        pthread_barrier_wait(&start_barrier);
+        for (long i = 0; i < opts->num_threads; i++) {
+            pthread_join(thread_handles[i], NULL);
+        }
+        pthread_barrier_destroy(&start_barrier);
+        pthread_barrier_destroy(&done_barrier);
+    }
+    for (long i = 0; i < opts->num_threads; i++) {
+        free(threads[i].local_ops);
+    }
+}
+
+// Whether an operation of any thread failed.
+static bool any_failed(const harness_thread_t *threads, long num_threads) {
+    for (long i = 0; i < num_threads; i++) {
+        if (threads[i].failed) {
+            return true;
+        }
+    }
+    return false;
+}
+
+// Build the list for the next trial: in one pass if the implementation
+// can bulk-load, else on the main thread, or with --numa firsttouch on
+// the workers, each inserting its share.  -1 if that fails.
+static int build_list(const harness_options_t *opts, harness_thread_t *threads) {
+    int loaded = impl->load != NULL ? impl->load(snapshot_keys, snapshot_n) : 0;
+
+    if (loaded != 0) {
+        return loaded > 0 ? 0 : -1;
+    }
+    if (opts->numa.type != NUMA_FIRST_TOUCH || !use_workers(opts)) {
+        return populate(snapshot_keys, snapshot_n);
+    }
+    phase = PHASE_POPULATE;
+    atomic_store(&populate_turn, opts->num_threads - 1);
+    pthread_barrier_wait(&start_barrier);
+    pthread_barrier_wait(&done_barrier);
+    phase = PHASE_TRIAL;
+    return any_failed(threads, opts->num_threads) ? -1 : 0;
+}
+
+// Run one trial and return its elapsed time: from the first worker
+// starting its operations to the last one finishing, as recorded by
+// the workers themselves.  With --duration the workers loop over the
+// ring until opts->duration seconds after their release.
+static double run_trial(const harness_options_t *opts, harness_thread_t *threads) {
+    long num_threads = opts->num_threads;
+
+    for (long i = 0; i < num_threads; i++) {
+        if (threads[i].latency != NULL) {
+            memset(threads[i].latency, 0, sizeof(struct latency_set));
+        }
+        if (threads[i].lockstat != NULL) {
+            memset(threads[i].lockstat, 0, sizeof(lockstat_t));
+        }
+    }
+
+    if (!use_workers(opts)) {
+        run_body(&threads[0]);
+    } else {
+        atomic_store(&stop_flag, false);
+        pthread_barrier_wait(&start_barrier);
+        if (opts->duration > 0) {
+            struct timespec remaining = {
+                .tv_sec = (time_t)opts->duration,
+                .tv_nsec = (long)((opts->duration - (time_t)opts->duration) * 1e9),
+            };
+            while (nanosleep(&remaining, &remaining) != 0 && errno == EINTR) {
+            }
+            atomic_store(&stop_flag, true);
+        }
+        pthread_barrier_wait(&done_barrier);
+    }
+
+    uint64_t first = threads[0].start_ns, last = threads[0].end_ns;
+    for (long i = 1; i < num_threads; i++) {
+        if (threads[i].start_ns < first) {
+            first = threads[i].start_ns;
+        }
+        if (threads[i].end_ns > last) {
+            last = threads[i].end_ns;
+        }
+    }
+    return (last - first) / 1e9;
+}
+
+// Either map the --workload file and use its keys and operations in
+// place, or generate both from the command-line parameters.
+static int load_workload(harness_options_t *opts, workload_file_t *wl,
+                         const int **keys, const operation_t **ops) {
+    if (opts->workload != NULL) {
+        if (workload_map(opts->workload, wl) != 0) {
+            return -1;
+        }
+        if (wl->header->n > INT_MAX || wl->header->m == 0) {
+            fprintf(stderr, "%s: workload must have at most %d keys and at least one operation.\n",
+                    opts->workload, INT_MAX);
+            workload_unmap(wl);
+            return -1;
+        }
+        opts->n_initial_nodes = (int)wl->header->n;
+        opts->n_total_operations = (long)wl->header->m;
+        opts->member_frac = wl->header->member_frac;
+        opts->insert_frac = wl->header->insert_frac;
+        opts->delete_frac = wl->header->delete_frac;
+        opts->seed = wl->header->seed;
+        opts->keys.type = (key_dist_type_t)wl->header->key_dist;
+        opts->keys.key_range = (int)wl->header->key_range;
+        opts->keys.theta = wl->header->theta;
+        opts->keys.hot_fraction = wl->header->hot_fraction;
+        opts->keys.hot_prob = wl->header->hot_prob;
+        *keys = wl->keys;
+        *ops = wl->ops;
+        return 0;
+    }
+
+    memset(wl, 0, sizeof(*wl));
+    if (opts->duration > 0 && opts->n_total_operations < DURATION_RING_OPS) {
+        opts->n_total_operations = DURATION_RING_OPS;
+    }
+    if (!opts->seeded) {
+        opts->seed = (unsigned long)time(NULL);
+    }
+    // Same order as workload_gen, so a seed reproduces its file exactly.
+    srand((unsigned int)opts->seed);
+    *keys = generate_initial_keys(opts->n_initial_nodes, opts->keys.key_range);
+    *ops = generate_operations(opts->n_total_operations, opts->member_frac,
+                               opts->insert_frac, opts->delete_frac, &opts->keys);
+    if (*keys == NULL || *ops == NULL) {
+        free_operations((operation_t *)*ops);
+        free((int *)*keys);
+        return -1;
+    }
+    return 0;
+}
+
+int harness_run(const list_impl_t *list_impl, harness_options_t *opts, const int *initial_keys,
+                const operation_t *operations, harness_report_fn report, void *arg) {
+    struct latency_set *latency = NULL;
+    struct latency_set *merged = NULL;
+    perf_counters_t *perf = NULL;
+    lockstat_t *lockstat = NULL;
+    harness_row_t row;
+
+    impl = list_impl;
+    if (!impl->threaded) {
+        // The serial program accepts the thread count but ignores it.
+        opts->num_threads = 1;
+    } else if (opts->num_threads <= 0 || opts->num_threads > MAX_THREADS) {
+        fprintf(stderr, "Number of threads must be between 1 and %d.\n", MAX_THREADS);
+        return -1;
+    }
+
+    pthread_t *thread_handles = malloc(opts->num_threads * sizeof(pthread_t));
+    harness_thread_t *threads = calloc(opts->num_threads, sizeof(harness_thread_t));
+    if (opts->latency) {
+        // Allocated up front so that recording never allocates.
+        latency = malloc((opts->num_threads + 1) * sizeof(struct latency_set));
+    }
+    if (opts->perf) {
+        perf = malloc(opts->num_threads * sizeof(perf_counters_t));
+    }
+    if (opts->lockstat) {
+        lockstat = malloc(opts->num_threads * sizeof(lockstat_t));
+    }
+    // The harness also runs inside the shared library, so running out of
+    // memory is reported to the caller rather than ending the process.
+    if (thread_handles == NULL || threads == NULL || (opts->latency && latency == NULL) ||
+        (opts->perf && perf == NULL) || (opts->lockstat && lockstat == NULL)) {
+        perror("malloc");
+        free(lockstat);
+        free(perf);
+        free(latency);
+        free(threads);
+        free(thread_handles);
+        return -1;
+    }
+    if (opts->latency) {
+        merged = &latency[opts->num_threads];
+        harness_latency_enabled = true;
+    }
+    if (opts->lockstat) {
+        lockstat_calibrate();
+    }
+    int status = partition(opts, operations, threads, latency, perf, lockstat);
+    if (status == 0 && !impl->threaded && threads[0].cpu >= 0) {
+        // The serial program runs its trials on the main thread.
+        cpu_set_t set;
+        CPU_ZERO(&set);
+        CPU_SET(threads[0].cpu, &set);
+        pthread_setaffinity_np(pthread_self(), sizeof(set), &set);
+    }
+
+    pool_init(impl->node_size);
+    if (status == 0 && impl->setup != NULL) {
+        status = impl->setup(opts);
+    }
+    bool set_up = status == 0;
+    snapshot_keys = initial_keys;
+    snapshot_n = opts->n_initial_nodes;
+    if (status == 0) {
+        status = start_workers(opts, thread_handles, threads);
+    }
+    bool started = status == 0;
+
+    // A failed operation (the implementation ran out of memory) ends
+    // the run after the trial it happened in; nothing more is reported.
+    for (int trial = -opts->warmup; status == 0 && trial < opts->trials; trial++) {
+        status = build_list(opts, threads);
+        double elapsed_time = status == 0 ? run_trial(opts, threads) : 0;
+        impl->clear();
+        if (status != 0 || any_failed(threads, opts->num_threads)) {
+            fprintf(stderr, "%s: trial %d failed; abandoning the run.\n", impl->name, trial);
+            status = -1;
+            break;
+        }
+
+        if (trial < 0) {
+            continue;
+        }
+        row.count = 0;
+        if (opts->duration > 0) {
+            report_throughput(&row, threads, opts->num_threads, elapsed_time);
+        }
+        report_threads(&row, threads, opts->num_threads);
+        if (opts->perf) {
+            if (trial == 0) {
+                warn_missing_perf(threads);
+            }
+            report_perf(&row, threads, opts->num_threads);
+        }
+        if (opts->lockstat) {
+            report_lockstat(&row, threads, opts->num_threads, elapsed_time);
+        }
+        if (opts->latency) {
+            report_latency(&row, threads, opts->num_threads, merged);
+        }
+        report(trial, elapsed_time, &row, arg);
+    }
+
+    if (started) {
+        stop_workers(opts, thread_handles, threads);
+    } else {
+        for (long i = 0; i < opts->num_threads; i++) {
+            free(threads[i].local_ops);
+        }
+    }
+    if (set_up && impl->teardown != NULL) {
+        impl->teardown();
+    }
+    pool_destroy();
+    harness_latency_enabled = false;
+    free(lockstat);
+    free(perf);
+    free(latency);
+    free(threads);
+    free(thread_handles);
+    return status;
+}
+
+int harness_main(int argc, char *argv[], const list_impl_t *list_impl) {
+    harness_options_t opts;
+
+    harness_options_init(list_impl, &opts);
+    if (parse_options(argc, argv, &opts) != 0) {
+        return 1;
+    }
+
+    // Placement of everything allocated from here on, worker threads
+    // included.
+    if (numa_policy_apply(&opts.numa) != 0) {
+        return 1;
+    }
+
+    // Snapshot of the initial list; every trial starts from these keys.
+    const int *initial_keys;
+    const operation_t *operations;
+    workload_file_t wl;
+    if (load_workload(&opts, &wl, &initial_keys, &operations) != 0) {
+        return 1;
+    }
+
+    int status = harness_run(impl, &opts, initial_keys, operations, print_row, &opts);
+    if (wl.map != NULL) {
+        workload_unmap(&wl);
+    } else {
+        free_operations((operation_t *)operations);
+        free((int *)initial_keys);
+    }
+
+    return status != 0 ? 1 : 0;
+}
@@ -0,0 +1,46 @@
+#include <string.h>
+
+#include "histogram.h"
+
+void hist_reset(histogram_t *h) {
+    memset(h, 0, sizeof(*h));
+}
+
+void hist_merge(histogram_t *dst, const histogram_t *src) {
+    for (int i = 0; i < HIST_BUCKETS; i++) {
+        dst->counts[i] += src->counts[i];
+    }
+    dst->total += src->total;
+    if (src->max > dst->max) {
+        dst->max = src->max;
+    }
+}
+
+// Largest value that falls into the given bucket.
+static uint64_t bucket_upper(int bucket) {
+    if (bucket < HIST_SUB_COUNT) {
+        return (uint64_t)bucket;
+    }
+    int shift = bucket / HIST_HALF_COUNT - 1;
+    uint64_t sub = (uint64_t)(bucket - shift * HIST_HALF_COUNT);
+    return ((sub + 1) << shift) - 1;
+}
+
+uint64_t hist_percentile(const histogram_t *h, double percentile) {
+    if (h->total == 0) {
+        return 0;
+    }
+    uint64_t rank = (uint64_t)(percentile / 100.0 * (double)h->total + 0.5);
+    if (rank < 1) {
+        rank = 1;
+    }
+    uint64_t seen = 0;
+    for (int i = 0; i < HIST_BUCKETS; i++) {
+        seen += h->counts[i];
+        if (seen >= rank) {
+            uint64_t upper = bucket_upper(i);
+            return upper < h->max ? upper : h->max;
+        }
+    }
+    return h->max;
+}
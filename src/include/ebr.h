@@ -0,0 +1,39 @@
+/*
+ * ebr.h
+ *
+ * Epoch-based memory reclamation for the list variants whose traversals
+ * take no locks (optimistic, lazy and lock-free).
+ * A thread brackets every operation that dereferences shared nodes with
+ * ebr_enter()/ebr_exit().  Nodes unlinked from a shared structure are
+ * handed to ebr_retire() instead of free(); they are released once the
+ * global epoch has advanced twice past the epoch in which they were
+ * retired, at which point no thread can still hold a reference.
+ *
+ * Retired objects embed an ebr_node_t.  The function passed to
+ * ebr_init() receives that member and must free the enclosing object.
+ * Threads register themselves on first use; nothing needs to be done
+ * when a thread is created or exits.
+ */
+
+#ifndef EBR_H
+#define EBR_H
+
+typedef struct ebr_node {
+    struct ebr_node *next;
+} ebr_node_t;
+
+void ebr_init(void (*free_fn)(ebr_node_t *node));
+
+/* 0, or -1 if the calling thread cannot be registered (out of memory);
+ * the thread must then not touch shared nodes or call ebr_exit(). */
+int ebr_enter(void);
+
+void ebr_exit(void);
+
+void ebr_retire(ebr_node_t *node);
+
+/* Free every retired node.  Only call while no thread is inside
+ * ebr_enter()/ebr_exit(), e.g. between two trials. */
+void ebr_drain(void);
+
+#endif /* EBR_H */
@@ -0,0 +1,201 @@
+/*
+ * harness.h
+ *
+ * Shared benchmark driver for the linked list programs.  Each program
+ * describes its list implementation with a list_impl_t and hands control
+ * to harness_main(), which parses the command line, builds the initial
+ * list and the operations array once, and then runs one or more timed
+ * trials.  Between trials the list is cleared and rebuilt from the same
+ * snapshot of initial keys, so every trial starts from an identical list.
+ *
+ * With --latency every operation is timed individually into per-thread
+ * histograms, split by operation type.  Implementations with a global
+ * lock call harness_lock_acquired() right after acquiring it (the
+ * lockstat.h wrappers do so), which further splits each operation into
+ * lock-wait and in-lock time.
+ *
+ * With --duration the operations array becomes a ring: every worker
+ * starts at its own slice and keeps going round until the time is up,
+ * and the trial reports operations completed instead of a fixed budget.
+ *
+ * With --perf every worker also counts CPU events for its own share of
+ * the trial (see perf.h); the harness reports their sums.
+ *
+ * With --lockstat the global-lock implementations, which take their lock
+ * through the wrappers in lockstat.h, also count acquisitions, contended
+ * acquisitions and wait and hold time per lock mode.
+ *
+ * With --workload the initial keys and the operations are not generated
+ * but mapped from a file written by workload_gen, and used in place.
+ *
+ * With --numa the list nodes and the operations are placed by a NUMA
+ * policy (see mempolicy.h): every worker then replays a private copy of
+ * its slice, and under firsttouch the workers also build the list, each
+ * inserting its share of the initial keys.
+ *
+ * The worker threads are created once per run and kept for every trial:
+ * a barrier releases them together at the start of a trial and a second
+ * one marks its end, so thread creation and joining are never timed.
+ * Each worker records its own start and end time; a trial's time runs
+ * from the first start to the last end, and the spread between workers
+ * is reported as start_skew_ns, thread_time_{min,max}_ns and
+ * thread_imbalance.  Implementations must therefore expect the same
+ * threads, with their thread-local state, in consecutive trials.
+ */
+
+#ifndef HARNESS_H
+#define HARNESS_H
+
+#include <stdbool.h>
+#include <stddef.h>
+
+#include "mempolicy.h"
+#include "timing.h"
+#include "topology.h"
+#include "workload.h"
+
+/* Minimum length of the operations ring in --duration mode, so that a
+ * thread does not replay the same short sequence over and over.  Both
+ * the programs and the library generate at least this many operations
+ * when a duration is set. */
+#define DURATION_RING_OPS (1L << 20)
+
+typedef struct {
+    long num_threads;
+    int n_initial_nodes;
+    long n_total_operations;
+    double member_frac;
+    double insert_frac;
+    double delete_frac;
+    int trials;       /* timed trials to report */
+    int warmup;       /* untimed trials run before the first timed one */
+    bool csv;         /* print "trial,time" rows instead of bare times */
+    bool latency;     /* record per-operation latency histograms */
+    double duration;  /* seconds per trial in throughput mode; 0 = run m ops */
+    const char *workload;  /* workload file to replay, or NULL to generate */
+    unsigned long seed;    /* generator seed (from --seed, the file, or the clock) */
+    bool seeded;           /* --seed was given */
+    key_dist_t keys;       /* key distribution and range of the operations */
+    pin_policy_t pin;      /* CPU placement of the worker threads */
+    bool perf;             /* count hardware/software events per thread */
+    bool lockstat;         /* count lock acquisitions, waits and holds */
+    numa_policy_t numa;    /* placement of list nodes and operations */
+} harness_options_t;
+
+struct latency_set;
+struct perf_counters;
+struct lockstat;
+
+/* Per-thread view of the work handed to a worker. */
+typedef struct {
+    long rank;
+    const operation_t *operations;
+    long my_start;
+    long my_count;
+    const harness_options_t *opts;
+    struct latency_set *latency;   /* NULL unless --latency */
+    long ops_done;                 /* operations completed, --duration only */
+    int cpu;                       /* CPU the thread is pinned to, or -1 */
+    struct perf_counters *perf;    /* NULL unless --perf */
+    struct lockstat *lockstat;     /* NULL unless --lockstat */
+    uint64_t start_ns;             /* when this thread began the trial */
+    uint64_t end_ns;               /* and when it finished its share */
+    long ring_ops;                 /* length of the ring at operations, --duration */
+    operation_t *local_ops;        /* private copy of the slice under --numa, or NULL */
+    bool failed;                   /* an operation failed; the run is abandoned */
+} harness_thread_t;
+
+/* A "--name VALUE" option understood by one implementation only.  The
+ * harness parses it along with its own options and hands the value to
+ * set() before setup() runs.  default_value is set() first, so that
+ * runs in one process (see liblinkedlist.h) do not inherit each
+ * other's values. */
+typedef struct {
+    const char *name;
+    const char *help;
+    int (*set)(const char *value);                 /* 0 if the value is accepted */
+    const char *default_value;
+} impl_option_t;
+
+typedef struct {
+    const char *name;
+    bool threaded;                                 /* false: run on the main thread */
+    size_t node_size;                              /* node size for the node pool */
+    int (*setup)(const harness_options_t *opts);   /* once, before the list is built; 0 or -1 */
+    /* Member/Insert/Delete one key: 1 or 0, or -1 if the operation
+     * failed (out of memory), which abandons the run. */
+    int (*execute)(const operation_t *op);
+    void (*clear)(void);                           /* free every node of the list */
+    void (*teardown)(void);                        /* once, after the last trial */
+    /* Optional bulk load: build the list from the n ascending initial
+     * keys in one pass.  Returns 1 once built, 0 to have the harness
+     * insert them one by one instead, or -1 on failure.  Runs on the
+     * main thread, even under --numa firsttouch. */
+    int (*load)(const int *keys, int n);
+    /* Optional thread body replacing the per-operation loop. */
+    void *(*worker)(void *thread_ptr);
+    /* Optional extra options, terminated by an entry with a NULL name. */
+    const impl_option_t *options;
+} list_impl_t;
+
+/* The implementations of the programs.  Each program's main() hands
+ * its own to harness_main(); liblinkedlist.so, built with
+ * -DLINKEDLIST_LIBRARY and without the main()s, links them all. */
+extern const list_impl_t serial_impl;
+extern const list_impl_t mutex_impl;
+extern const list_impl_t rwlock_impl;
+extern const list_impl_t finegrained_impl;
+extern const list_impl_t optimistic_impl;
+extern const list_impl_t lazy_impl;
+extern const list_impl_t lockfree_impl;
+extern const list_impl_t flatcombining_impl;
+
+int harness_main(int argc, char *argv[], const list_impl_t *impl);
+
+/* The columns reported after the elapsed time of a trial: thread
+ * spread, and the throughput, perf, lockstat and latency columns of
+ * the options given. */
+#define HARNESS_MAX_COLUMNS 96
+#define HARNESS_COLUMN_NAME 48
+
+typedef struct {
+    char names[HARNESS_MAX_COLUMNS][HARNESS_COLUMN_NAME];
+    double values[HARNESS_MAX_COLUMNS];   /* NAN where a value is unavailable */
+    int count;
+} harness_row_t;
+
+/* Called after every timed trial, numbered from 0. */
+typedef void (*harness_report_fn)(int trial, double elapsed_time, const harness_row_t *row,
+                                  void *arg);
+
+/* harness_main() in parts, for running many configurations in one
+ * process.  options_init() resets opts and the implementation's own
+ * options to their defaults; set_option() applies one option by its
+ * long name ("pin", "compact"), value NULL for flags, and returns -1
+ * (with a message) if it is unknown or invalid.  harness_run() runs
+ * opts->warmup + opts->trials trials of opts->num_threads threads over
+ * the given snapshot and operations, leaving the NUMA policy and the
+ * workload to the caller.  It returns 0 on success, and -1 (after a
+ * message) if it runs out of memory or threads, or the implementation
+ * fails; the process carries on either way. */
+void harness_options_init(const list_impl_t *impl, harness_options_t *opts);
+int harness_set_option(harness_options_t *opts, const char *name, const char *value);
+int harness_run(const list_impl_t *impl, harness_options_t *opts, const int *initial_keys,
+                const operation_t *operations, harness_report_fn report, void *arg);
+
+/* Execute one operation on behalf of a worker, recording its latency
+ * when instrumentation is enabled.  Custom workers must use this
+ * instead of calling the implementation directly, and stop once it
+ * returns -1: the thread is then marked failed. */
+int harness_execute(harness_thread_t *t, const operation_t *op);
+
+extern bool harness_latency_enabled;
+extern __thread uint64_t harness_lock_acquired_ns;
+
+static inline void harness_lock_acquired(void) {
+    if (harness_latency_enabled) {
+        harness_lock_acquired_ns = time_now_ns();
+    }
+}
+
+#endif /* HARNESS_H */
@@ -0,0 +1,50 @@
+/*
+ * histogram.h
+ *
+ * Log-bucketed latency histogram in the style of HdrHistogram.  Values
+ * (nanoseconds) below 2^HIST_SUB_BITS get a bucket each; above that,
+ * every power of two is split into 2^(HIST_SUB_BITS-1) equal sub-buckets,
+ * which bounds the relative error of a reported percentile to about 3%.
+ * The histogram is a fixed array, so recording a value never allocates.
+ */
+
+#ifndef HISTOGRAM_H
+#define HISTOGRAM_H
+
+#include <stdint.h>
+
+#define HIST_SUB_BITS 6
+#define HIST_SUB_COUNT (1 << HIST_SUB_BITS)
+#define HIST_HALF_COUNT (HIST_SUB_COUNT / 2)
+#define HIST_BUCKETS (HIST_SUB_COUNT + (64 - HIST_SUB_BITS) * HIST_HALF_COUNT)
+
+typedef struct {
+    uint64_t counts[HIST_BUCKETS];
+    uint64_t total;
+    uint64_t max;
+} histogram_t;
+
+void hist_reset(histogram_t *h);
+
+static inline int hist_bucket(uint64_t value) {
+    if (value < HIST_SUB_COUNT) {
+        return (int)value;
+    }
+    int shift = 64 - __builtin_clzll(value) - HIST_SUB_BITS;
+    return shift * HIST_HALF_COUNT + (int)(value >> shift);
+}
+
+static inline void hist_record(histogram_t *h, uint64_t value) {
+    h->counts[hist_bucket(value)]++;
+    h->total++;
+    if (value > h->max) {
+        h->max = value;
+    }
+}
+
+void hist_merge(histogram_t *dst, const histogram_t *src);
+
+/* Highest value equivalent to the given percentile (0-100); 0 if empty. */
+uint64_t hist_percentile(const histogram_t *h, double percentile);
+
+#endif /* HISTOGRAM_H */
@@ -0,0 +1,90 @@
+/*
+ * liblinkedlist.h
+ *
+ * C API of liblinkedlist.so: the list implementations of the programs,
+ * the workload generator and the benchmark harness in one shared
+ * library, so that many configurations can be measured in one process
+ * (scripts/liblinkedlist.py wraps it for Python).  A set is one
+ * implementation with its options and a workload; every run builds
+ * the list from the workload's initial keys, replays its operations on
+ * the requested number of threads and returns one row per timed trial:
+ *
+ *   ll_set_t *set = ll_set_create("rwlock");
+ *   ll_set_option(set, "set", "skiplist");
+ *   ll_set_option(set, "seed", "1");
+ *   ll_set_generate(set, 1000, 10000, 0.99, 0.005, 0.005);
+ *   ll_results_t *r = ll_set_run(set, 4, 10, 1);
+ *   ... ll_results_data(r)[trial * ll_results_columns(r) + column] ...
+ *   ll_results_free(r);
+ *   ll_set_destroy(set);
+ *
+ * Options are those of the programs by their long names, without the
+ * dashes ("pin", "latency", "key-range", "duration", "numa", "set",
+ * ...), value NULL for flags; trials, warmup, the thread count and the
+ * workload are arguments of the calls instead.  Options apply to the
+ * workloads generated and the runs started after them.
+ *
+ * Results have a column "time" (seconds) followed by the extra columns
+ * of the programs' --csv output; blank values are NAN.  The data is
+ * one trials x columns array of doubles, row-major, owned by the
+ * results until ll_results_free().
+ *
+ * The implementations keep their lists in globals, so runs are
+ * serialized: the calls may come from any thread, but one run holds
+ * the library until it returns.  Errors are reported on stderr, as the
+ * programs do; calls then return NULL or -1.
+ *
+ * Calls are only added, never changed; ll_api_version() tells a caller
+ * which ones exist.
+ */
+
+#ifndef LIBLINKEDLIST_H
+#define LIBLINKEDLIST_H
+
+#define LL_API_VERSION 1
+
+#if defined(__GNUC__)
+#define LL_API __attribute__((visibility("default")))
+#else
+#define LL_API
+#endif
+
+typedef struct ll_set ll_set_t;
+typedef struct ll_results ll_results_t;
+
+/* LL_API_VERSION of the library. */
+LL_API int ll_api_version(void);
+
+/* Names of the implementations ("serial", "mutex", ...), NULL-terminated. */
+LL_API const char *const *ll_impl_names(void);
+
+/* A set of implementation impl, with default options and no workload. */
+LL_API ll_set_t *ll_set_create(const char *impl);
+LL_API void ll_set_destroy(ll_set_t *set);
+
+/* Set option name to value (NULL for a flag); 0 on success. */
+LL_API int ll_set_option(ll_set_t *set, const char *name, const char *value);
+
+/* Generate a workload as the programs do: n initial keys and m
+ * operations with the given mix, keys and seed from the options.  With
+ * a duration set, m is raised to the programs' minimum ring length. */
+LL_API int ll_set_generate(ll_set_t *set, int n, long m, double member_frac,
+                           double insert_frac, double delete_frac);
+
+/* Replay the workload file written by workload_gen at path instead. */
+LL_API int ll_set_load_workload(ll_set_t *set, const char *path);
+
+/* Seed of the current workload. */
+LL_API unsigned long ll_set_seed(const ll_set_t *set);
+
+/* Run warmup untimed and trials timed trials on threads threads; NULL
+ * on failure, including running out of memory or threads. */
+LL_API ll_results_t *ll_set_run(ll_set_t *set, long threads, int trials, int warmup);
+
+LL_API int ll_results_trials(const ll_results_t *results);
+LL_API int ll_results_columns(const ll_results_t *results);
+LL_API const char *ll_results_column(const ll_results_t *results, int column);
+LL_API const double *ll_results_data(const ll_results_t *results);
+LL_API void ll_results_free(ll_results_t *results);
+
+#endif /* LIBLINKEDLIST_H */
@@ -23,13 +23,14 @@ typedef struct node {
 } node_t;
 
 
-void list_init(int n);
+/* 0, or -1 if the list runs out of memory part way. */
+int list_init(int n, int key_range);
 
 
 bool list_member(int value);
 
-
-bool list_insert(int value);
+/* 1 if value was added, 0 if it was present, -1 if out of memory. */
+int list_insert(int value);
 
 bool list_delete(int value);
 
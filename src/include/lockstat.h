@@ -0,0 +1,147 @@
+/*
+ * lockstat.h
+ *
+ * Instrumented wrappers around the pthread lock calls of the global-lock
+ * implementations.  With --lockstat every worker counts, per lock mode
+ * (read or write), its acquisitions, the acquisitions that found the
+ * lock taken, the time spent waiting for it and the time spent holding
+ * it; the harness sums the counts over threads after each trial.
+ *
+ * The wrappers are cheap enough to leave in place: without --lockstat
+ * they cost one thread-local load and a branch.  With it, the lock is
+ * first tried without blocking, so an uncontended acquisition reads the
+ * clock only once for its hold time, and only a failed try pays for the
+ * blocking call to be timed.  Timestamps are raw TSC ticks on x86 (the
+ * monotonic clock elsewhere), converted to nanoseconds once per trial.
+ *
+ * A thread holds at most one instrumented lock at a time.
+ */
+
+#ifndef LOCKSTAT_H
+#define LOCKSTAT_H
+
+#include <pthread.h>
+#include <stdbool.h>
+#include <stdint.h>
+
+#include "harness.h"
+#include "timing.h"
+
+#if defined(__x86_64__) || defined(__i386__)
+#include <x86intrin.h>
+#endif
+
+typedef enum {
+    LOCK_READ,
+    LOCK_WRITE,
+    LOCK_N_MODES
+} lock_mode_t;
+
+/* CSV column prefix of each mode */
+extern const char *lock_mode_names[LOCK_N_MODES];
+
+typedef struct lockstat {
+    uint64_t acquisitions[LOCK_N_MODES];
+    uint64_t contended[LOCK_N_MODES];   /* the try failed and the thread blocked */
+    uint64_t wait_ticks[LOCK_N_MODES];
+    uint64_t hold_ticks[LOCK_N_MODES];
+    uint64_t acquired_at;               /* tick the held lock was taken at */
+    lock_mode_t held_mode;
+} lockstat_t;
+
+/* Counters of the calling worker, or NULL when not instrumenting. */
+extern __thread lockstat_t *lockstat_self;
+
+/* Measure the tick rate; call once before the first trial. */
+void lockstat_calibrate(void);
+
+/* Nanoseconds per tick, as measured by lockstat_calibrate(). */
+double lockstat_ns_per_tick(void);
+
+static inline uint64_t lockstat_ticks(void) {
+#if defined(__x86_64__) || defined(__i386__)
+    return __rdtsc();
+#else
+    return time_now_ns();
+#endif
+}
+
+static inline void lockstat_acquired(lockstat_t *s, lock_mode_t mode, uint64_t now) {
+    s->acquisitions[mode]++;
+    s->acquired_at = now;
+    s->held_mode = mode;
+}
+
+static inline void lockstat_waited(lockstat_t *s, lock_mode_t mode, uint64_t start, uint64_t now) {
+    s->contended[mode]++;
+    s->wait_ticks[mode] += now - start;
+}
+
+static inline void lockstat_released(lockstat_t *s) {
+    if (s != NULL) {
+        s->hold_ticks[s->held_mode] += lockstat_ticks() - s->acquired_at;
+    }
+}
+
+static inline void lockstat_mutex_lock(pthread_mutex_t *m) {
+    lockstat_t *s = lockstat_self;
+
+    if (s == NULL) {
+        pthread_mutex_lock(m);
+    } else if (pthread_mutex_trylock(m) == 0) {
+        lockstat_acquired(s, LOCK_WRITE, lockstat_ticks());
+    } else {
+        uint64_t start = lockstat_ticks();
+        pthread_mutex_lock(m);
+        uint64_t now = lockstat_ticks();
+        lockstat_waited(s, LOCK_WRITE, start, now);
+        lockstat_acquired(s, LOCK_WRITE, now);
+    }
+    harness_lock_acquired();
+}
+
+static inline void lockstat_mutex_unlock(pthread_mutex_t *m) {
+    lockstat_released(lockstat_self);
+    pthread_mutex_unlock(m);
+}
+
+static inline void lockstat_rwlock_rdlock(pthread_rwlock_t *l) {
+    lockstat_t *s = lockstat_self;
+
+    if (s == NULL) {
+        pthread_rwlock_rdlock(l);
+    } else if (pthread_rwlock_tryrdlock(l) == 0) {
+        lockstat_acquired(s, LOCK_READ, lockstat_ticks());
+    } else {
+        uint64_t start = lockstat_ticks();
+        pthread_rwlock_rdlock(l);
+        uint64_t now = lockstat_ticks();
+        lockstat_waited(s, LOCK_READ, start, now);
+        lockstat_acquired(s, LOCK_READ, now);
+    }
+    harness_lock_acquired();
+}
+
+static inline void lockstat_rwlock_wrlock(pthread_rwlock_t *l) {
+    lockstat_t *s = lockstat_self;
+
+    if (s == NULL) {
+        pthread_rwlock_wrlock(l);
+    } else if (pthread_rwlock_trywrlock(l) == 0) {
+        lockstat_acquired(s, LOCK_WRITE, lockstat_ticks());
+    } else {
+        uint64_t start = lockstat_ticks();
+        pthread_rwlock_wrlock(l);
+        uint64_t now = lockstat_ticks();
+        lockstat_waited(s, LOCK_WRITE, start, now);
+        lockstat_acquired(s, LOCK_WRITE, now);
+    }
+    harness_lock_acquired();
+}
+
+static inline void lockstat_rwlock_unlock(pthread_rwlock_t *l) {
+    lockstat_released(lockstat_self);
+    pthread_rwlock_unlock(l);
+}
+
+#endif /* LOCKSTAT_H */
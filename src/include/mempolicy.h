@@ -0,0 +1,56 @@
+/*
+ * mempolicy.h
+ *
+ * NUMA placement of the list nodes and of the operations each worker
+ * replays, selected with --numa:
+ *
+ *   none        the default: the main thread builds the list and every
+ *               worker reads its slice of the one shared operations array
+ *   firsttouch  every worker copies its slice of the operations into
+ *               memory it touches first, and inserts its share of the
+ *               initial keys itself, so under the kernel's default
+ *               local allocation both land on the worker's own node
+ *   interleave  all memory, including the per-worker copies, is spread
+ *               page by page over the nodes that have memory
+ *   bind:N      all memory is allocated on node N only
+ *
+ * interleave and bind set the process memory policy with
+ * set_mempolicy(2) before anything is allocated, so the worker threads
+ * created afterwards inherit it.  The system call is made directly, as
+ * perf.h does for perf_event_open, so libnuma is not needed.
+ */
+
+#ifndef MEMPOLICY_H
+#define MEMPOLICY_H
+
+#include <stdbool.h>
+
+typedef enum {
+    NUMA_NONE,
+    NUMA_FIRST_TOUCH,
+    NUMA_INTERLEAVE,
+    NUMA_BIND
+} numa_policy_type_t;
+
+typedef struct {
+    numa_policy_type_t type;
+    int node;        /* NUMA_BIND only */
+} numa_policy_t;
+
+/* Parse "none", "firsttouch", "interleave" or "bind:N"; 0 on success. */
+int numa_policy_parse(const char *spec, numa_policy_t *policy);
+
+/* Apply the memory policy to the calling thread and the threads it
+ * creates later; 0 on success, -1 (with a message) on error. */
+int numa_policy_apply(const numa_policy_t *policy);
+
+/* Return the calling thread to the default local allocation, for
+ * callers that run several policies in one process. */
+void numa_policy_reset(void);
+
+/* Whether each worker should replay a private copy of its slice. */
+static inline bool numa_policy_local_ops(const numa_policy_t *policy) {
+    return policy->type != NUMA_NONE;
+}
+
+#endif /* MEMPOLICY_H */
@@ -0,0 +1,47 @@
+/*
+ * perf.h
+ *
+ * Hardware and software event counters around each worker's share of a
+ * timed trial, read through perf_event_open(2).  Every worker opens its
+ * own counters for itself when it starts and reads them when it is done;
+ * the harness then sums them over the threads.
+ *
+ * Counters are opened one by one, so an event the CPU, the kernel or
+ * perf_event_paranoid does not allow simply reads as NAN (a blank CSV
+ * column) while the others still work.  Values are scaled by
+ * time_enabled / time_running when the kernel had to multiplex them.
+ */
+
+#ifndef PERF_H
+#define PERF_H
+
+#include <stdbool.h>
+
+enum {
+    PERF_CYCLES,
+    PERF_INSTRUCTIONS,
+    PERF_CACHE_MISSES,
+    PERF_LLC_MISSES,
+    PERF_CONTEXT_SWITCHES,
+    PERF_CPU_MIGRATIONS,
+    PERF_N_EVENTS
+};
+
+/* CSV column name of each event */
+extern const char *perf_event_names[PERF_N_EVENTS];
+
+typedef struct perf_counters {
+    int fd[PERF_N_EVENTS];
+    double value[PERF_N_EVENTS];    /* NAN if the event was unavailable */
+} perf_counters_t;
+
+/* Open and enable the counters for the calling thread. */
+void perf_counters_start(perf_counters_t *pc);
+
+/* Disable, read and close the counters started by this thread. */
+void perf_counters_stop(perf_counters_t *pc);
+
+/* True if at least one event could be opened so far. */
+bool perf_counters_available(void);
+
+#endif /* PERF_H */
@@ -0,0 +1,48 @@
+/*
+ * pool.h
+ *
+ * Fixed-size node allocator shared by the list implementations.  Each
+ * thread keeps a private free list, so allocating or freeing a node in
+ * the timed region is a couple of pointer moves with no locking.  An
+ * empty free list is refilled from a shared depot of free nodes or, if
+ * the depot is empty too, from a freshly allocated slab.  Nodes freed
+ * by one thread may be reused by another; long free lists spill back
+ * into the depot.
+ *
+ * Build with -DNODE_POOL_ALIGN to round every node up to a whole cache
+ * line and align slabs on cache-line boundaries, so that two nodes never
+ * share a line.
+ *
+ * The implementations allocate through NODE_ALLOC()/NODE_FREE(), which
+ * map to the pool when built with -DUSE_NODE_POOL and to malloc/free
+ * otherwise.  Either way NODE_ALLOC() returns NULL when out of memory,
+ * and the operation then fails (see list_impl_t in harness.h).
+ */
+
+#ifndef POOL_H
+#define POOL_H
+
+#include <stddef.h>
+#include <stdlib.h>
+
+#define CACHE_LINE_SIZE 64
+
+void pool_init(size_t object_size);
+
+/* A free node, or NULL if there is no memory for a new slab. */
+void *pool_alloc(void);
+
+void pool_free(void *ptr);
+
+/* Release every slab.  All nodes handed out by the pool become invalid. */
+void pool_destroy(void);
+
+#ifdef USE_NODE_POOL
+#define NODE_ALLOC(size) pool_alloc()
+#define NODE_FREE(ptr) pool_free(ptr)
+#else
+#define NODE_ALLOC(size) malloc(size)
+#define NODE_FREE(ptr) free(ptr)
+#endif
+
+#endif /* POOL_H */
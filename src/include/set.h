@@ -0,0 +1,62 @@
+/*
+ * set.h
+ *
+ * Ordered set of integer keys behind one interface, so that the
+ * global-lock programs (serial, mutex, rwlock) can swap the data
+ * structure without touching their locking.  Backends:
+ *
+ *   list      the sorted singly linked list of linkedlist.h, O(n) per op
+ *   skiplist  a skip list with geometric tower heights, O(log n)
+ *   array     a sorted array searched with binary search; inserts and
+ *             deletes shift the tail, but every probe is cache friendly
+ *
+ * Like linkedlist.h, every backend keeps one global set and is not
+ * thread safe: callers serialize writers themselves.  member() only
+ * reads, so concurrent members under a read lock are fine.
+ */
+
+#ifndef SET_H
+#define SET_H
+
+#include <stdbool.h>
+#include <stddef.h>
+
+typedef struct {
+    const char *name;
+    bool (*member)(int value);
+    int (*insert)(int value);     /* 1 if added, 0 if present, -1 out of memory */
+    bool (*delete)(int value);
+    void (*clear)(void);          /* free every element */
+    /* Optional: fill the empty set from n ascending keys in one pass,
+     * for backends where inserting them one by one is costly; 0, or -1
+     * if out of memory. */
+    int (*load)(const int *keys, size_t n);
+    /* Optional: seed a randomized backend; clear() restarts its random
+     * choices from this seed, so every trial builds the same structure. */
+    void (*seed)(unsigned long seed);
+} set_backend_t;
+
+extern const set_backend_t set_list_backend;
+extern const set_backend_t set_skiplist_backend;
+extern const set_backend_t set_array_backend;
+
+/* Look a backend up by name; prints the choices and returns NULL if
+ * there is none. */
+const set_backend_t *set_backend_find(const char *name);
+
+/* The backend a program works on, the list unless set_backend_select()
+ * picked another.  select has the signature of an impl_option_t
+ * handler, so programs can offer it directly as --set. */
+extern const set_backend_t *set_backend;
+int set_backend_select(const char *name);
+
+/* Bulk-load set_backend from n ascending keys if it supports it: 1 if
+ * it did, 0 if the keys are to be inserted one by one, -1 if out of
+ * memory.  Has the signature of list_impl_t's load, so programs can
+ * offer it directly. */
+int set_backend_load(const int *keys, int n);
+
+/* Seed set_backend from the run seed, if it makes random choices. */
+void set_backend_seed(unsigned long seed);
+
+#endif /* SET_H */
@@ -3,7 +3,17 @@
 #ifndef TIMING_H
 #define TIMING_H
 
+#include <stdint.h>
+#include <time.h>
+
 void time_start(void);
 double time_stop(void);
 
+/* Monotonic timestamp in nanoseconds, for per-operation measurements. */
+static inline uint64_t time_now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+}
+
 #endif /* TIMING_H */
\ No newline at end of file
@@ -0,0 +1,37 @@
+/*
+ * topology.h
+ *
+ * CPU topology for pinning worker threads.  The CPUs this process may
+ * run on (its affinity mask, which the experiment driver narrows to the
+ * job's CPU set) are read together with their socket and core ids from
+ * sysfs and put in the order in which threads should be placed:
+ *
+ *   compact  fill one socket first, one hardware thread per core, and
+ *            only then the second hardware threads of its cores
+ *   scatter  round-robin over sockets, one hardware thread per core
+ *            before any SMT sibling is used
+ *   smt      both hardware threads of a core before the next core
+ *
+ * Worker i runs on cpus[i % count], so more threads than CPUs simply
+ * wrap around (oversubscription).
+ */
+
+#ifndef TOPOLOGY_H
+#define TOPOLOGY_H
+
+typedef enum {
+    PIN_NONE,
+    PIN_COMPACT,
+    PIN_SCATTER,
+    PIN_SMT
+} pin_policy_t;
+
+/* Parse "none", "compact", "scatter" or "smt"; 0 on success. */
+int pin_policy_parse(const char *name, pin_policy_t *policy);
+
+/* Return the usable CPUs in placement order for policy in *cpus
+ * (malloc'ed) and their number; 0 if the affinity mask is unavailable,
+ * -1 if there is no memory for the list. */
+int topology_cpu_order(pin_policy_t policy, int **cpus);
+
+#endif /* TOPOLOGY_H */
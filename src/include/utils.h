@@ -1,6 +1,7 @@
 #ifndef UTILS_H
 #define UTILS_H
 
-int generate_random_value(void);
+/* Uniform random integer in [0, range), drawn from rand(). */
+int generate_random_value(int range);
 
 #endif /* UTILS_H */
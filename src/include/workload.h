@@ -4,6 +4,13 @@
 #define WORKLOAD_H
 
 #include <stddef.h>
+#include <stdint.h>
+
+/* Default key range: keys are drawn from [0, WORKLOAD_KEY_SPACE). */
+#define WORKLOAD_KEY_SPACE (1 << 16)
+/* Largest --key-range accepted, and the largest a Zipf table may cover. */
+#define WORKLOAD_MAX_KEY_RANGE (1 << 30)
+#define WORKLOAD_MAX_ZIPF_RANGE (1 << 24)
 
 
 typedef enum {
@@ -19,12 +26,127 @@ typedef struct {
 } operation_t;
 
 
+/*
+ * Key distributions for the operations.  Initial keys are always drawn
+ * uniformly from the key range; only the keys the operations touch
+ * follow the distribution.
+ *
+ *   uniform              every key in [0, key_range) equally likely
+ *   zipf[:THETA]         key of popularity rank r drawn with probability
+ *                        proportional to 1/(r+1)^THETA (default 0.99)
+ *   hotset[:FRAC[:PROB]] PROB of the operations (default 0.8) go to a
+ *                        hot set of FRAC of the keys (default 0.2)
+ *   sequential           operation i uses key i mod key_range
+ *
+ * Zipf and hot-set ranks are scattered over the key range by a fixed
+ * bijection, so the popular keys are spread along the list rather than
+ * clustered at its head.
+ */
+typedef enum {
+    KEY_DIST_UNIFORM,
+    KEY_DIST_ZIPF,
+    KEY_DIST_HOTSET,
+    KEY_DIST_SEQUENTIAL
+} key_dist_type_t;
+
+#define KEY_DIST_COUNT (KEY_DIST_SEQUENTIAL + 1)
+
+typedef struct {
+    key_dist_type_t type;
+    int key_range;
+    double theta;           /* zipf */
+    double hot_fraction;    /* hotset */
+    double hot_prob;        /* hotset */
+} key_dist_t;
+
+#define KEY_DIST_DEFAULT {KEY_DIST_UNIFORM, WORKLOAD_KEY_SPACE, 0.99, 0.2, 0.8}
+
+/* Parse a distribution spec as listed above into dist, keeping its
+ * key_range; 0 on success, -1 (with a message) on error. */
+int key_dist_parse(const char *spec, key_dist_t *dist);
+
+/* Check dist and an initial list of n keys against each other and the
+ * limits above; 0 if usable, -1 (with a message) otherwise. */
+int key_dist_validate(const key_dist_t *dist, long n);
+
+/* Write the spec string of dist (e.g. "zipf:0.99") into buf. */
+void key_dist_format(const key_dist_t *dist, char *buf, size_t size);
+
+/* Generate m operations with the given mix; dist may be NULL for
+ * uniform keys over the default key range.  NULL if m is 0 or there is
+ * no memory for them. */
 operation_t *generate_operations(size_t m,
                                  double m_member_frac,
                                  double m_insert_frac,
-                                 double m_delete_frac);
+                                 double m_delete_frac,
+                                 const key_dist_t *dist);
 
 
 void free_operations(operation_t *ops);
 
+/* Draw n unique random keys from [0, key_range) in ascending order;
+ * NULL if there is no memory for them. */
+int *generate_initial_keys(int n, int key_range);
+
+/*
+ * Workload files
+ *
+ * A workload file fixes both the initial list and the operation
+ * sequence, so that every implementation and every run can replay
+ * exactly the same work.  Layout, in native byte order:
+ *
+ *   workload_header_t
+ *   int32_t keys[n]          initial keys, strictly ascending
+ *   operation_t ops[m]       packed 8-byte records, at ops_offset
+ *
+ * ops_offset is a multiple of 8 so that the records can be used in
+ * place from a read-only mapping of the file.  Keys must lie strictly
+ * between INT_MIN and INT_MAX, which the lists use as sentinels.
+ */
+
+#define WORKLOAD_MAGIC "LLWKLD1"
+#define WORKLOAD_VERSION 2
+
+typedef struct {
+    char magic[8];
+    uint32_t version;
+    uint32_t header_size;
+    uint64_t n;                 /* initial keys */
+    uint64_t m;                 /* operations */
+    double member_frac;
+    double insert_frac;
+    double delete_frac;
+    uint64_t seed;              /* seed the file was generated from */
+    uint32_t key_dist;          /* key_dist_type_t of the operations */
+    uint32_t key_range;
+    double theta;
+    double hot_fraction;
+    double hot_prob;
+    uint64_t keys_offset;       /* byte offsets from the start of the file */
+    uint64_t ops_offset;
+} workload_header_t;
+
+/* A workload file mapped into memory; keys and ops point into the mapping. */
+typedef struct {
+    const workload_header_t *header;
+    const int *keys;
+    const operation_t *ops;
+    void *map;
+    size_t map_size;
+} workload_file_t;
+
+/* Write a workload file; header supplies n, m, the fractions, the seed
+ * and the key distribution. */
+int workload_write(const char *path, const workload_header_t *header,
+                   const int *keys, const operation_t *ops);
+
+/* Map a workload file read-only and validate its header, its key
+ * distribution and key range, the initial keys (strictly ascending, in
+ * [0, key_range)) and every operation record (valid type, key in
+ * [0, key_range)); 0 on success, -1 (with a message) if the file is
+ * unreadable or corrupt. */
+int workload_map(const char *path, workload_file_t *wl);
+
+void workload_unmap(workload_file_t *wl);
+
 #endif /* WORKLOAD_H */
\ No newline at end of file
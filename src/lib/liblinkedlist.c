@@ -0,0 +1,342 @@
+#include <limits.h>
+#include <pthread.h>
+#include <stdbool.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#include "harness.h"
+#include "liblinkedlist.h"
+#include "mempolicy.h"
+#include "workload.h"
+
+#define LL_MAX_OPTIONS 32
+
+static const list_impl_t *const impls[] = {
+    &serial_impl, &mutex_impl, &rwlock_impl, &finegrained_impl,
+    &optimistic_impl, &lazy_impl, &lockfree_impl, &flatcombining_impl,
+};
+#define N_IMPLS (sizeof(impls) / sizeof(impls[0]))
+
+// Options set by the calls rather than by ll_set_option().
+static const char *const call_options[] = {"trials", "warmup", "csv", "workload"};
+
+// The implementations, the harness and rand() are process-wide state.
+static pthread_mutex_t library_lock = PTHREAD_MUTEX_INITIALIZER;
+
+struct ll_set {
+    const list_impl_t *impl;
+    // Options in the order given, replayed onto fresh harness options
+    // (and implementation defaults) for every workload and run.
+    char *names[LL_MAX_OPTIONS];
+    char *values[LL_MAX_OPTIONS];
+    int n_options;
+    // The workload: generated keys and operations, or a mapped file,
+    // and its parameters (n, m, mix, keys, seed) in opts.
+    harness_options_t workload;
+    int *keys;
+    operation_t *ops;
+    workload_file_t wl;
+    bool loaded;
+};
+
+struct ll_results {
+    int trials;
+    int columns;
+    char (*names)[HARNESS_COLUMN_NAME];
+    double *data;
+    bool failed;    /* collect() could not allocate the results */
+};
+
+int ll_api_version(void) {
+    return LL_API_VERSION;
+}
+
+const char *const *ll_impl_names(void) {
+    static const char *names[N_IMPLS + 1];
+
+    if (names[0] == NULL) {
+        for (size_t i = 0; i < N_IMPLS; i++) {
+            names[i] = impls[i]->name;
+        }
+    }
+    return names;
+}
+
+ll_set_t *ll_set_create(const char *impl) {
+    for (size_t i = 0; i < N_IMPLS; i++) {
+        if (strcmp(impl, impls[i]->name) == 0) {
+            ll_set_t *set = calloc(1, sizeof(ll_set_t));
+            if (set == NULL) {
+                perror("calloc");
+                return NULL;
+            }
+            set->impl = impls[i];
+            return set;
+        }
+    }
+    fprintf(stderr, "Unknown implementation '%s'.\n", impl);
+    return NULL;
+}
+
+static void unload(ll_set_t *set) {
+    if (!set->loaded) {
+        return;
+    }
+    if (set->wl.map != NULL) {
+        workload_unmap(&set->wl);
+    } else {
+        free_operations(set->ops);
+        free(set->keys);
+    }
+    set->keys = NULL;
+    set->ops = NULL;
+    memset(&set->wl, 0, sizeof(set->wl));
+    set->loaded = false;
+}
+
+void ll_set_destroy(ll_set_t *set) {
+    if (set == NULL) {
+        return;
+    }
+    unload(set);
+    for (int i = 0; i < set->n_options; i++) {
+        free(set->names[i]);
+        free(set->values[i]);
+    }
+    free(set);
+}
+
+// Fresh harness options with the set's options applied in order.
+// Called with library_lock held.
+static int apply_options(const ll_set_t *set, harness_options_t *opts) {
+    harness_options_init(set->impl, opts);
+    for (int i = 0; i < set->n_options; i++) {
+        if (harness_set_option(opts, set->names[i], set->values[i]) != 0) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
+int ll_set_option(ll_set_t *set, const char *name, const char *value) {
+    harness_options_t opts;
+    int status;
+
+    for (size_t i = 0; i < sizeof(call_options) / sizeof(call_options[0]); i++) {
+        if (strcmp(name, call_options[i]) == 0) {
+            fprintf(stderr, "Option '%s' is an argument of the calls, not an option of the set.\n", name);
+            return -1;
+        }
+    }
+    if (set->n_options == LL_MAX_OPTIONS) {
+        fprintf(stderr, "More than %d options.\n", LL_MAX_OPTIONS);
+        return -1;
+    }
+    pthread_mutex_lock(&library_lock);
+    status = apply_options(set, &opts);
+    if (status == 0) {
+        status = harness_set_option(&opts, name, value);
+    }
+    pthread_mutex_unlock(&library_lock);
+    if (status != 0) {
+        return -1;
+    }
+    set->names[set->n_options] = strdup(name);
+    set->values[set->n_options] = value != NULL ? strdup(value) : NULL;
+    if (set->names[set->n_options] == NULL || (value != NULL && set->values[set->n_options] == NULL)) {
+        perror("strdup");
+        free(set->names[set->n_options]);
+        free(set->values[set->n_options]);
+        return -1;
+    }
+    set->n_options++;
+    return 0;
+}
+
+int ll_set_generate(ll_set_t *set, int n, long m, double member_frac,
+                    double insert_frac, double delete_frac) {
+    harness_options_t opts;
+
+    if (n < 0 || m <= 0) {
+        fprintf(stderr, "The list size must be non-negative and the number of operations positive.\n");
+        return -1;
+    }
+    pthread_mutex_lock(&library_lock);
+    if (apply_options(set, &opts) != 0 || key_dist_validate(&opts.keys, n) != 0) {
+        pthread_mutex_unlock(&library_lock);
+        return -1;
+    }
+    if (!opts.seeded) {
+        opts.seed = (unsigned long)time(NULL);
+    }
+    // The same ring length as the programs use under --duration.
+    if (opts.duration > 0 && m < DURATION_RING_OPS) {
+        m = DURATION_RING_OPS;
+    }
+    // Same order as workload_gen and the programs, so a seed reproduces
+    // their keys and operations exactly.
+    srand((unsigned int)opts.seed);
+    int *keys = generate_initial_keys(n, opts.keys.key_range);
+    operation_t *ops = generate_operations(m, member_frac, insert_frac, delete_frac, &opts.keys);
+    pthread_mutex_unlock(&library_lock);
+    if (keys == NULL || ops == NULL) {
+        free_operations(ops);
+        free(keys);
+        return -1;
+    }
+
+    unload(set);
+    opts.n_initial_nodes = n;
+    opts.n_total_operations = m;
+    opts.member_frac = member_frac;
+    opts.insert_frac = insert_frac;
+    opts.delete_frac = delete_frac;
+    set->workload = opts;
+    set->keys = keys;
+    set->ops = ops;
+    set->loaded = true;
+    return 0;
+}
+
+int ll_set_load_workload(ll_set_t *set, const char *path) {
+    workload_file_t wl;
+
+    if (workload_map(path, &wl) != 0) {
+        return -1;
+    }
+    if (wl.header->n > INT_MAX || wl.header->m == 0) {
+        fprintf(stderr, "%s: workload must have at most %d keys and at least one operation.\n",
+                path, INT_MAX);
+        workload_unmap(&wl);
+        return -1;
+    }
+    unload(set);
+    memset(&set->workload, 0, sizeof(set->workload));
+    set->workload.n_initial_nodes = (int)wl.header->n;
+    set->workload.n_total_operations = (long)wl.header->m;
+    set->workload.member_frac = wl.header->member_frac;
+    set->workload.insert_frac = wl.header->insert_frac;
+    set->workload.delete_frac = wl.header->delete_frac;
+    set->workload.seed = wl.header->seed;
+    set->workload.keys.type = (key_dist_type_t)wl.header->key_dist;
+    set->workload.keys.key_range = (int)wl.header->key_range;
+    set->workload.keys.theta = wl.header->theta;
+    set->workload.keys.hot_fraction = wl.header->hot_fraction;
+    set->workload.keys.hot_prob = wl.header->hot_prob;
+    set->wl = wl;
+    set->loaded = true;
+    return 0;
+}
+
+unsigned long ll_set_seed(const ll_set_t *set) {
+    return set->workload.seed;
+}
+
+// harness_report_fn collecting every timed trial into the results.  An
+// allocation failure is recorded for ll_set_run() to report.
+static void collect(int trial, double elapsed_time, const harness_row_t *row, void *arg) {
+    ll_results_t *results = (ll_results_t *)arg;
+
+    if (results->failed) {
+        return;
+    }
+    if (results->data == NULL) {
+        results->columns = row->count + 1;
+        results->names = calloc(results->columns, sizeof(*results->names));
+        results->data = malloc((size_t)results->trials * results->columns * sizeof(double));
+        if (results->names == NULL || results->data == NULL) {
+            perror("malloc");
+            results->failed = true;
+            return;
+        }
+        snprintf(results->names[0], sizeof(results->names[0]), "time");
+        for (int i = 0; i < row->count; i++) {
+            memcpy(results->names[i + 1], row->names[i], sizeof(row->names[i]));
+        }
+    }
+    // Every trial of a run reports the same columns.
+    double *out = &results->data[(size_t)trial * results->columns];
+    out[0] = elapsed_time;
+    memcpy(&out[1], row->values, (results->columns - 1) * sizeof(double));
+}
+
+ll_results_t *ll_set_run(ll_set_t *set, long threads, int trials, int warmup) {
+    harness_options_t opts;
+    ll_results_t *results;
+
+    if (!set->loaded) {
+        fprintf(stderr, "No workload: call ll_set_generate() or ll_set_load_workload() first.\n");
+        return NULL;
+    }
+    if (trials <= 0 || warmup < 0) {
+        fprintf(stderr, "Trials must be positive and warmup non-negative.\n");
+        return NULL;
+    }
+    results = calloc(1, sizeof(ll_results_t));
+    if (results == NULL) {
+        perror("calloc");
+        return NULL;
+    }
+    results->trials = trials;
+
+    pthread_mutex_lock(&library_lock);
+    int status = apply_options(set, &opts);
+    if (status == 0) {
+        opts.num_threads = threads;
+        opts.trials = trials;
+        opts.warmup = warmup;
+        opts.n_initial_nodes = set->workload.n_initial_nodes;
+        opts.n_total_operations = set->workload.n_total_operations;
+        opts.member_frac = set->workload.member_frac;
+        opts.insert_frac = set->workload.insert_frac;
+        opts.delete_frac = set->workload.delete_frac;
+        opts.seed = set->workload.seed;
+        opts.keys = set->workload.keys;
+        status = numa_policy_apply(&opts.numa);
+    }
+    if (status == 0) {
+        const int *keys = set->wl.map != NULL ? set->wl.keys : set->keys;
+        const operation_t *ops = set->wl.map != NULL ? set->wl.ops : set->ops;
+        status = harness_run(set->impl, &opts, keys, ops, collect, results);
+        if (opts.numa.type == NUMA_INTERLEAVE || opts.numa.type == NUMA_BIND) {
+            numa_policy_reset();
+        }
+    }
+    pthread_mutex_unlock(&library_lock);
+
+    if (status != 0 || results->failed) {
+        ll_results_free(results);
+        return NULL;
+    }
+    return results;
+}
+
+int ll_results_trials(const ll_results_t *results) {
+    return results->trials;
+}
+
+int ll_results_columns(const ll_results_t *results) {
+    return results->columns;
+}
+
+const char *ll_results_column(const ll_results_t *results, int column) {
+    if (column < 0 || column >= results->columns) {
+        return NULL;
+    }
+    return results->names[column];
+}
+
+const double *ll_results_data(const ll_results_t *results) {
+    return results->data;
+}
+
+void ll_results_free(ll_results_t *results) {
+    if (results == NULL) {
+        return;
+    }
+    free(results->names);
+    free(results->data);
+    free(results);
+}
@@ -4,22 +4,28 @@
 #include <stdio.h>
 
 #include "linkedlist.h"
+#include "set.h"
+#include "pool.h"
+#include "utils.h"
 
 static node_t *head = NULL;
 
-void list_init(int n) {
+int list_init(int n, int key_range) {
     // Empty any existing list
     list_free();
 
     int count = 0;
-    // Populate the list with unique values between 0 and 65535
+    // Populate the list with unique values between 0 and key_range - 1
     while (count < n) {
-        int val = rand() % 65536;
+        int val = generate_random_value(key_range);
         // Attempt to insert; if successful increment count
-        if (list_insert(val)) {
-            count++;
+        int inserted = list_insert(val);
+        if (inserted < 0) {
+            return -1;
         }
+        count += inserted;
     }
+    return 0;
 }
 
 bool list_member(int value) {
@@ -36,7 +42,7 @@ bool list_member(int value) {
     return false;
 }
 
-bool list_insert(int value) {
+int list_insert(int value) {
     // First check if value already exists
     node_t *curr = head;
     node_t *pred = NULL;
@@ -46,13 +52,13 @@ bool list_insert(int value) {
     }
     if (curr != NULL && curr->data == value) {
         // Duplicate found
-        return false;
+        return 0;
     }
     // Create new node
-    node_t *new_node = (node_t *)malloc(sizeof(node_t));
+    node_t *new_node = (node_t *)NODE_ALLOC(sizeof(node_t));
     if (!new_node) {
         perror("malloc");
-        exit(EXIT_FAILURE);
+        return -1;
     }
     new_node->data = value;
     // Insert at head or between pred and curr
@@ -63,7 +69,7 @@ bool list_insert(int value) {
         new_node->next = pred->next;
         pred->next = new_node;
     }
-    return true;
+    return 1;
 }
 
 bool list_delete(int value) {
@@ -83,7 +89,7 @@ bool list_delete(int value) {
     } else {
         pred->next = curr->next;
     }
-    free(curr);
+    NODE_FREE(curr);
     return true;
 }
 
@@ -91,8 +97,16 @@ void list_free(void) {
     node_t *curr = head;
     while (curr != NULL) {
         node_t *next = curr->next;
-        free(curr);
+        NODE_FREE(curr);
         curr = next;
     }
     head = NULL;
-}
\ No newline at end of file
+}
+
+const set_backend_t set_list_backend = {
+    .name = "list",
+    .member = list_member,
+    .insert = list_insert,
+    .delete = list_delete,
+    .clear = list_free,
+};
@@ -0,0 +1,215 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <limits.h>
+#include <stdint.h>
+#include <stddef.h>
+#include <stdbool.h>
+#include <stdatomic.h>
+#include "workload.h"
+#include "harness.h"
+#include "pool.h"
+#include "ebr.h"
+
+// Linked list node structure.  The low bit of next marks the node as
+// logically deleted (Harris); the pointer and the mark change together
+// in a single CAS.
+struct list_node_s {
+    int data;
+    _Atomic(uintptr_t) next;
+    ebr_node_t reclaim;
+};
+
+#define MARK_BIT ((uintptr_t)1)
+
+static inline struct list_node_s* Ptr(uintptr_t link) {
+    return (struct list_node_s*)(link & ~MARK_BIT);
+}
+
+static inline bool IsMarked(uintptr_t link) {
+    return (link & MARK_BIT) != 0;
+}
+
+static inline uintptr_t Link(struct list_node_s* node_p) {
+    return (uintptr_t)node_p;
+}
+
+// Sentinels at both ends: every real key lies strictly between them.
+static struct list_node_s tail = {INT_MAX, 0, {NULL}};
+static struct list_node_s head = {INT_MIN, (uintptr_t)&tail, {NULL}};
+
+static uintptr_t Load(struct list_node_s* node_p) {
+    return atomic_load_explicit(&node_p->next, memory_order_acquire);
+}
+
+static bool CAS(struct list_node_s* node_p, uintptr_t expected, uintptr_t desired) {
+    return atomic_compare_exchange_strong_explicit(&node_p->next, &expected, desired,
+                                                   memory_order_acq_rel, memory_order_acquire);
+}
+
+static void FreeNode(ebr_node_t* reclaim_p) {
+    NODE_FREE((char*)reclaim_p - offsetof(struct list_node_s, reclaim));
+}
+
+// Michael's search: return the first node with data >= value in curr
+// and its predecessor in pred, physically unlinking every marked node
+// met on the way.  The thread that unlinks a node retires it.
+static bool Find(int value, struct list_node_s** pred_pp, struct list_node_s** curr_pp) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+    uintptr_t succ;
+
+retry:
+    pred_p = &head;
+    curr_p = Ptr(Load(pred_p));
+    for (;;) {
+        succ = Load(curr_p);
+        while (IsMarked(succ)) {
+            if (!CAS(pred_p, Link(curr_p), Link(Ptr(succ)))) {
+                goto retry;
+            }
+            ebr_retire(&curr_p->reclaim);
+            curr_p = Ptr(succ);
+            succ = Load(curr_p);
+        }
+        if (curr_p->data >= value) {
+            *pred_pp = pred_p;
+            *curr_pp = curr_p;
+            return curr_p->data == value;
+        }
+        pred_p = curr_p;
+        curr_p = Ptr(succ);
+    }
+}
+
+// Function to check if a value is in the list (no CAS, no helping)
+static int Member(int value) {
+    struct list_node_s* curr_p;
+    int found;
+
+    if (ebr_enter() != 0) {
+        return -1;
+    }
+    curr_p = Ptr(Load(&head));
+    while (curr_p->data < value) {
+        curr_p = Ptr(Load(curr_p));
+    }
+    found = curr_p->data == value && !IsMarked(Load(curr_p));
+    ebr_exit();
+    return found;
+}
+
+// Function to insert a value into the list
+static int Insert(int value) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+    struct list_node_s* temp_p = NULL;
+    int result;
+
+    if (ebr_enter() != 0) {
+        return -1;
+    }
+    for (;;) {
+        if (Find(value, &pred_p, &curr_p)) {
+            result = 0;
+            break;
+        }
+        if (temp_p == NULL) {
+            temp_p = NODE_ALLOC(sizeof(struct list_node_s));
+            if (temp_p == NULL) {
+                result = -1;
+                break;
+            }
+            temp_p->data = value;
+        }
+        atomic_store_explicit(&temp_p->next, Link(curr_p), memory_order_relaxed);
+        if (CAS(pred_p, Link(curr_p), Link(temp_p))) {
+            temp_p = NULL;
+            result = 1;
+            break;
+        }
+    }
+    ebr_exit();
+    // The node was never published if the key turned out to be present.
+    NODE_FREE(temp_p);
+    return result;
+}
+
+// Function to delete a value from the list: mark curr's next pointer
+// (logical delete), then try to swing pred past it (physical delete)
+static int Delete(int value) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+    uintptr_t succ;
+    int result;
+
+    if (ebr_enter() != 0) {
+        return -1;
+    }
+    for (;;) {
+        if (!Find(value, &pred_p, &curr_p)) {
+            result = 0;
+            break;
+        }
+        succ = Load(curr_p);
+        if (IsMarked(succ) || !CAS(curr_p, succ, succ | MARK_BIT)) {
+            continue;
+        }
+        if (CAS(pred_p, Link(curr_p), succ)) {
+            ebr_retire(&curr_p->reclaim);
+        } else {
+            // Someone changed pred; let a fresh search unlink the node.
+            Find(value, &pred_p, &curr_p);
+        }
+        result = 1;
+        break;
+    }
+    ebr_exit();
+    return result;
+}
+
+static int Setup(const harness_options_t* opts) {
+    (void)opts;
+    ebr_init(FreeNode);
+    return 0;
+}
+
+// Function to free the entire linked list and every retired node
+static void FreeList(void) {
+    struct list_node_s* curr_p = Ptr(Load(&head));
+    struct list_node_s* temp_p;
+
+    while (curr_p != &tail) {
+        temp_p = curr_p;
+        curr_p = Ptr(Load(curr_p));
+        NODE_FREE(temp_p);
+    }
+    atomic_store(&head.next, Link(&tail));
+    ebr_drain();
+}
+
+static int Execute(const operation_t* op) {
+    switch (op->type) {
+        case OP_MEMBER:
+            return Member(op->key);
+        case OP_INSERT:
+            return Insert(op->key);
+        case OP_DELETE:
+            return Delete(op->key);
+    }
+    return 0;
+}
+
+const list_impl_t lockfree_impl = {
+    .name = "lockfree",
+    .threaded = true,
+    .node_size = sizeof(struct list_node_s),
+    .setup = Setup,
+    .execute = Execute,
+    .clear = FreeList,
+};
+
+#ifndef LINKEDLIST_LIBRARY
+int main(int argc, char* argv[]) {
+    return harness_main(argc, argv, &lockfree_impl);
+}
+#endif
@@ -0,0 +1,29 @@
+#include <time.h>
+
+#include "lockstat.h"
+
+const char *lock_mode_names[LOCK_N_MODES] = {"read", "write"};
+
+__thread lockstat_t *lockstat_self = NULL;
+
+static double ns_per_tick = 1.0;
+
+// Count ticks over a short sleep against the monotonic clock.  The TSC
+// runs at a constant rate on every CPU this benchmark targets, so one
+// measurement per process is enough.
+void lockstat_calibrate(void) {
+    struct timespec pause = {0, 20 * 1000 * 1000};
+    uint64_t ns0 = time_now_ns();
+    uint64_t t0 = lockstat_ticks();
+
+    nanosleep(&pause, NULL);
+    uint64_t ns1 = time_now_ns();
+    uint64_t t1 = lockstat_ticks();
+    if (t1 > t0) {
+        ns_per_tick = (double)(ns1 - ns0) / (double)(t1 - t0);
+    }
+}
+
+double lockstat_ns_per_tick(void) {
+    return ns_per_tick;
+}
@@ -0,0 +1,121 @@
+#define _GNU_SOURCE
+#include <errno.h>
+#include <linux/mempolicy.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+
+#include "mempolicy.h"
+
+// Nodes a mask can name; the kernel ignores the last bit of maxnode.
+#define MAX_NODES 1024
+#define MASK_LONGS (MAX_NODES / (8 * sizeof(unsigned long)))
+
+typedef struct {
+    unsigned long bits[MASK_LONGS];
+} node_mask_t;
+
+static void mask_set(node_mask_t *mask, int node) {
+    mask->bits[node / (8 * sizeof(unsigned long))] |= 1UL << (node % (8 * sizeof(unsigned long)));
+}
+
+int numa_policy_parse(const char *spec, numa_policy_t *policy) {
+    char *end;
+
+    policy->node = -1;
+    if (strcmp(spec, "none") == 0) {
+        policy->type = NUMA_NONE;
+        return 0;
+    }
+    if (strcmp(spec, "firsttouch") == 0) {
+        policy->type = NUMA_FIRST_TOUCH;
+        return 0;
+    }
+    if (strcmp(spec, "interleave") == 0) {
+        policy->type = NUMA_INTERLEAVE;
+        return 0;
+    }
+    if (strncmp(spec, "bind:", 5) == 0) {
+        long node = strtol(spec + 5, &end, 10);
+        if (end != spec + 5 && *end == '\0' && node >= 0 && node < MAX_NODES - 1) {
+            policy->type = NUMA_BIND;
+            policy->node = (int)node;
+            return 0;
+        }
+    }
+    fprintf(stderr, "Unknown NUMA policy '%s' (none, firsttouch, interleave, bind:N).\n", spec);
+    return -1;
+}
+
+// Parse a sysfs node list such as "0-1,3" into mask; the number of
+// nodes, or 0 if the list is unavailable (no NUMA support).
+static int read_node_list(const char *path, node_mask_t *mask) {
+    char buf[4096];
+    int count = 0;
+    FILE *f = fopen(path, "r");
+
+    if (f == NULL) {
+        return 0;
+    }
+    if (fgets(buf, sizeof(buf), f) == NULL) {
+        buf[0] = '\0';
+    }
+    fclose(f);
+    for (char *p = buf; *p != '\0' && *p != '\n';) {
+        char *end;
+        long lo = strtol(p, &end, 10), hi = lo;
+        if (end == p) {
+            break;
+        }
+        if (*end == '-') {
+            p = end + 1;
+            hi = strtol(p, &end, 10);
+        }
+        for (long node = lo; node <= hi && node < MAX_NODES - 1; node++) {
+            mask_set(mask, (int)node);
+            count++;
+        }
+        p = *end == ',' ? end + 1 : end;
+    }
+    return count;
+}
+
+int numa_policy_apply(const numa_policy_t *policy) {
+    node_mask_t mask;
+    int mode;
+
+    memset(&mask, 0, sizeof(mask));
+    switch (policy->type) {
+        case NUMA_NONE:
+        case NUMA_FIRST_TOUCH:
+            // Local allocation is the kernel's default policy.
+            return 0;
+        case NUMA_INTERLEAVE:
+            if (read_node_list("/sys/devices/system/node/has_memory", &mask) == 0) {
+                mask_set(&mask, 0);
+            }
+            mode = MPOL_INTERLEAVE;
+            break;
+        case NUMA_BIND:
+            mask_set(&mask, policy->node);
+            mode = MPOL_BIND;
+            break;
+        default:
+            return -1;
+    }
+    if (syscall(SYS_set_mempolicy, mode, mask.bits, (unsigned long)MAX_NODES) != 0) {
+        fprintf(stderr, "set_mempolicy: %s", strerror(errno));
+        if (policy->type == NUMA_BIND) {
+            fprintf(stderr, " (is node %d online and does it have memory?)", policy->node);
+        }
+        fprintf(stderr, "\n");
+        return -1;
+    }
+    return 0;
+}
+
+void numa_policy_reset(void) {
+    syscall(SYS_set_mempolicy, MPOL_DEFAULT, NULL, 0UL);
+}
@@ -0,0 +1,200 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <limits.h>
+#include <stddef.h>
+#include <pthread.h>
+#include <stdatomic.h>
+#include "workload.h"
+#include "harness.h"
+#include "pool.h"
+#include "ebr.h"
+
+// Linked list node structure with its own mutex.  The next pointer is
+// read without holding any lock during traversal, so it is atomic.
+struct list_node_s {
+    int data;
+    _Atomic(struct list_node_s*) next;
+    pthread_mutex_t mutex;
+    ebr_node_t reclaim;
+};
+
+// Sentinels at both ends: every real key lies strictly between them,
+// so pred and curr are never NULL.
+static struct list_node_s tail = {INT_MAX, NULL, PTHREAD_MUTEX_INITIALIZER, {NULL}};
+static struct list_node_s head = {INT_MIN, &tail, PTHREAD_MUTEX_INITIALIZER, {NULL}};
+
+static struct list_node_s* Next(struct list_node_s* node_p) {
+    return atomic_load_explicit(&node_p->next, memory_order_acquire);
+}
+
+// Search without locks for the first node with data >= value.
+static void Find(int value, struct list_node_s** pred_pp, struct list_node_s** curr_pp) {
+    struct list_node_s* pred_p = &head;
+    struct list_node_s* curr_p = Next(pred_p);
+
+    while (curr_p->data < value) {
+        pred_p = curr_p;
+        curr_p = Next(curr_p);
+    }
+    *pred_pp = pred_p;
+    *curr_pp = curr_p;
+}
+
+// With pred and curr locked, check that pred is still reachable from
+// the head and still points at curr.
+static int Validate(struct list_node_s* pred_p, struct list_node_s* curr_p) {
+    struct list_node_s* node_p = &head;
+
+    while (node_p->data <= pred_p->data) {
+        if (node_p == pred_p) {
+            return Next(pred_p) == curr_p;
+        }
+        node_p = Next(node_p);
+    }
+    return 0;
+}
+
+// Find and lock pred and curr, retrying until the pair validates.
+static void LockWindow(int value, struct list_node_s** pred_pp, struct list_node_s** curr_pp) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+
+    for (;;) {
+        Find(value, &pred_p, &curr_p);
+        pthread_mutex_lock(&pred_p->mutex);
+        pthread_mutex_lock(&curr_p->mutex);
+        if (Validate(pred_p, curr_p)) {
+            *pred_pp = pred_p;
+            *curr_pp = curr_p;
+            return;
+        }
+        pthread_mutex_unlock(&curr_p->mutex);
+        pthread_mutex_unlock(&pred_p->mutex);
+    }
+}
+
+static void UnlockWindow(struct list_node_s* pred_p, struct list_node_s* curr_p) {
+    pthread_mutex_unlock(&curr_p->mutex);
+    pthread_mutex_unlock(&pred_p->mutex);
+}
+
+// Function to check if a value is in the list
+static int Member(int value) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+    int found;
+
+    LockWindow(value, &pred_p, &curr_p);
+    found = (curr_p->data == value);
+    UnlockWindow(pred_p, curr_p);
+    return found;
+}
+
+// Function to insert a value into the list
+static int Insert(int value) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+    struct list_node_s* temp_p;
+
+    LockWindow(value, &pred_p, &curr_p);
+    if (curr_p->data == value) {
+        UnlockWindow(pred_p, curr_p);
+        return 0;
+    }
+    temp_p = NODE_ALLOC(sizeof(struct list_node_s));
+    if (temp_p == NULL) {
+        UnlockWindow(pred_p, curr_p);
+        return -1;
+    }
+    temp_p->data = value;
+    atomic_init(&temp_p->next, curr_p);
+    pthread_mutex_init(&temp_p->mutex, NULL);
+    atomic_store_explicit(&pred_p->next, temp_p, memory_order_release);
+    UnlockWindow(pred_p, curr_p);
+    return 1;
+}
+
+// Function to delete a value from the list
+static int Delete(int value) {
+    struct list_node_s* pred_p;
+    struct list_node_s* curr_p;
+
+    LockWindow(value, &pred_p, &curr_p);
+    if (curr_p->data != value) {
+        UnlockWindow(pred_p, curr_p);
+        return 0;
+    }
+    atomic_store_explicit(&pred_p->next, Next(curr_p), memory_order_release);
+    UnlockWindow(pred_p, curr_p);
+    ebr_retire(&curr_p->reclaim);
+    return 1;
+}
+
+static void FreeNode(struct list_node_s* node_p) {
+    pthread_mutex_destroy(&node_p->mutex);
+    NODE_FREE(node_p);
+}
+
+static void FreeRetired(ebr_node_t* reclaim_p) {
+    FreeNode((struct list_node_s*)((char*)reclaim_p - offsetof(struct list_node_s, reclaim)));
+}
+
+static int Setup(const harness_options_t* opts) {
+    (void)opts;
+    ebr_init(FreeRetired);
+    return 0;
+}
+
+// Function to free the entire linked list and every retired node
+static void FreeList(void) {
+    struct list_node_s* curr_p = Next(&head);
+    struct list_node_s* temp_p;
+
+    while (curr_p != &tail) {
+        temp_p = curr_p;
+        curr_p = Next(curr_p);
+        FreeNode(temp_p);
+    }
+    atomic_store(&head.next, &tail);
+    ebr_drain();
+}
+
+// Every operation runs inside an epoch section: an unlinked node may
+// still be under another thread's traversal or waiting on its mutex, so
+// Delete retires it and the epoch scheme frees it once no section that
+// could have seen it is still open.
+static int Execute(const operation_t* op) {
+    int result = 0;
+
+    if (ebr_enter() != 0) {
+        return -1;
+    }
+    switch (op->type) {
+        case OP_MEMBER:
+            result = Member(op->key);
+            break;
+        case OP_INSERT:
+            result = Insert(op->key);
+            break;
+        case OP_DELETE:
+            result = Delete(op->key);
+            break;
+    }
+    ebr_exit();
+    return result;
+}
+
+const list_impl_t optimistic_impl = {
+    .name = "optimistic",
+    .threaded = true,
+    .node_size = sizeof(struct list_node_s),
+    .setup = Setup,
+    .execute = Execute,
+    .clear = FreeList,
+};
+
+#ifndef LINKEDLIST_LIBRARY
+int main(int argc, char* argv[]) {
+    return harness_main(argc, argv, &optimistic_impl);
+}
+#endif
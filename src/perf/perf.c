@@ -0,0 +1,90 @@
+#define _GNU_SOURCE
+#include <math.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <string.h>
+#include <unistd.h>
+#include <stdatomic.h>
+#include <sys/ioctl.h>
+#include <sys/syscall.h>
+#include <linux/perf_event.h>
+
+#include "perf.h"
+
+const char *perf_event_names[PERF_N_EVENTS] = {
+    "cycles", "instructions", "cache_misses", "llc_misses", "context_switches", "cpu_migrations"
+};
+
+static const struct {
+    uint32_t type;
+    uint64_t config;
+} events[PERF_N_EVENTS] = {
+    {PERF_TYPE_HARDWARE, PERF_COUNT_HW_CPU_CYCLES},
+    {PERF_TYPE_HARDWARE, PERF_COUNT_HW_INSTRUCTIONS},
+    {PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_MISSES},
+    {PERF_TYPE_HW_CACHE, PERF_COUNT_HW_CACHE_LL |
+                         (PERF_COUNT_HW_CACHE_OP_READ << 8) |
+                         (PERF_COUNT_HW_CACHE_RESULT_MISS << 16)},
+    {PERF_TYPE_SOFTWARE, PERF_COUNT_SW_CONTEXT_SWITCHES},
+    {PERF_TYPE_SOFTWARE, PERF_COUNT_SW_CPU_MIGRATIONS},
+};
+
+static atomic_bool any_available;
+
+static int open_event(int event, bool exclude_kernel) {
+    struct perf_event_attr attr;
+
+    memset(&attr, 0, sizeof(attr));
+    attr.size = sizeof(attr);
+    attr.type = events[event].type;
+    attr.config = events[event].config;
+    attr.disabled = 1;
+    attr.exclude_kernel = exclude_kernel;
+    attr.exclude_hv = 1;
+    attr.read_format = PERF_FORMAT_TOTAL_TIME_ENABLED | PERF_FORMAT_TOTAL_TIME_RUNNING;
+    // This thread, on whichever CPU it runs.
+    return (int)syscall(SYS_perf_event_open, &attr, 0, -1, -1, 0);
+}
+
+void perf_counters_start(perf_counters_t *pc) {
+    for (int i = 0; i < PERF_N_EVENTS; i++) {
+        // Counting kernel time needs perf_event_paranoid < 2; fall back
+        // to user space only rather than giving up on the event.
+        pc->fd[i] = open_event(i, false);
+        if (pc->fd[i] < 0) {
+            pc->fd[i] = open_event(i, true);
+        }
+        pc->value[i] = NAN;
+    }
+    for (int i = 0; i < PERF_N_EVENTS; i++) {
+        if (pc->fd[i] >= 0) {
+            ioctl(pc->fd[i], PERF_EVENT_IOC_RESET, 0);
+            ioctl(pc->fd[i], PERF_EVENT_IOC_ENABLE, 0);
+        }
+    }
+}
+
+void perf_counters_stop(perf_counters_t *pc) {
+    uint64_t data[3];   // value, time_enabled, time_running
+
+    for (int i = 0; i < PERF_N_EVENTS; i++) {
+        if (pc->fd[i] >= 0) {
+            ioctl(pc->fd[i], PERF_EVENT_IOC_DISABLE, 0);
+        }
+    }
+    for (int i = 0; i < PERF_N_EVENTS; i++) {
+        if (pc->fd[i] < 0) {
+            continue;
+        }
+        if (read(pc->fd[i], data, sizeof(data)) == (ssize_t)sizeof(data) && data[2] > 0) {
+            pc->value[i] = (double)data[0] * ((double)data[1] / (double)data[2]);
+            atomic_store_explicit(&any_available, true, memory_order_relaxed);
+        }
+        close(pc->fd[i]);
+        pc->fd[i] = -1;
+    }
+}
+
+bool perf_counters_available(void) {
+    return atomic_load_explicit(&any_available, memory_order_relaxed);
+}
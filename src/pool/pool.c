@@ -0,0 +1,208 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdint.h>
+#include <pthread.h>
+
+#include "pool.h"
+
+// Objects carved from one slab
+#define SLAB_OBJECTS 1024
+// Objects moved between a thread cache and the depot at a time
+#define BATCH 64
+
+typedef struct free_node {
+    struct free_node *next;
+} free_node_t;
+
+typedef struct slab {
+    struct slab *next;
+} slab_t;
+
+typedef struct {
+    free_node_t *head;
+    size_t count;
+    unsigned long generation;   // pool generation the nodes belong to
+} thread_cache_t;
+
+static size_t object_size = 0;
+static size_t slab_header = 0;
+static slab_t *slabs = NULL;
+static free_node_t *depot = NULL;
+// Objects of the newest slab not handed out yet, from carve onwards.
+static char *carve = NULL;
+static size_t carve_left = 0;
+static unsigned long generation = 0;
+static pthread_mutex_t pool_mutex = PTHREAD_MUTEX_INITIALIZER;
+
+static pthread_key_t cache_key;
+static pthread_once_t cache_key_once = PTHREAD_ONCE_INIT;
+static __thread thread_cache_t cache = {NULL, 0, 0};
+
+static size_t round_up(size_t value, size_t align) {
+    return (value + align - 1) / align * align;
+}
+
+// Move the whole list onto the depot.  Caller holds pool_mutex.
+static void depot_push(free_node_t *head, size_t count) {
+    free_node_t *tail = head;
+    if (head == NULL) {
+        return;
+    }
+    while (--count > 0 && tail->next != NULL) {
+        tail = tail->next;
+    }
+    tail->next = depot;
+    depot = head;
+}
+
+// Thread exit: hand the cached nodes back so other threads can use them.
+static void flush_cache(void *unused) {
+    (void)unused;
+    pthread_mutex_lock(&pool_mutex);
+    if (cache.generation == generation) {
+        depot_push(cache.head, cache.count);
+    }
+    pthread_mutex_unlock(&pool_mutex);
+    cache.head = NULL;
+    cache.count = 0;
+}
+
+static void make_cache_key(void) {
+    pthread_key_create(&cache_key, flush_cache);
+}
+
+// Refill an empty cache with up to BATCH nodes from the depot or, when
+// the depot is empty, with the next BATCH objects carved from the newest
+// slab (allocating one when it is used up).  Never more than BATCH, so
+// that the cache is a full BATCH of frees away from the spill threshold
+// in pool_free().  -1 if a slab cannot be allocated.  Caller holds
+// pool_mutex.
+static int refill(void) {
+    if (depot != NULL) {
+        free_node_t *node = depot;
+        size_t count = 1;
+        while (count < BATCH && node->next != NULL) {
+            node = node->next;
+            count++;
+        }
+        cache.head = depot;
+        cache.count = count;
+        depot = node->next;
+        node->next = NULL;
+        return 0;
+    }
+
+    if (carve_left == 0) {
+        size_t bytes = slab_header + SLAB_OBJECTS * object_size;
+#ifdef NODE_POOL_ALIGN
+        slab_t *slab = aligned_alloc(CACHE_LINE_SIZE, round_up(bytes, CACHE_LINE_SIZE));
+#else
+        slab_t *slab = malloc(bytes);
+#endif
+        if (slab == NULL) {
+            perror("malloc");
+            return -1;
+        }
+        slab->next = slabs;
+        slabs = slab;
+        carve = (char *)slab + slab_header;
+        carve_left = SLAB_OBJECTS;
+    }
+
+    // Thread the batch in address order.  This is the first touch of
+    // its objects, made by the thread that will use them, so under
+    // --numa firsttouch every batch lands on its own thread's node.
+    size_t count = carve_left < BATCH ? carve_left : BATCH;
+    for (size_t i = 0; i < count; i++) {
+        free_node_t *node = (free_node_t *)(carve + i * object_size);
+        node->next = (i + 1 < count) ? (free_node_t *)(carve + (i + 1) * object_size) : NULL;
+    }
+    cache.head = (free_node_t *)carve;
+    cache.count = count;
+    carve += count * object_size;
+    carve_left -= count;
+    return 0;
+}
+
+void pool_init(size_t size) {
+    pthread_once(&cache_key_once, make_cache_key);
+    pool_destroy();
+    if (size < sizeof(free_node_t)) {
+        size = sizeof(free_node_t);
+    }
+#ifdef NODE_POOL_ALIGN
+    object_size = round_up(size, CACHE_LINE_SIZE);
+    slab_header = CACHE_LINE_SIZE;
+#else
+    object_size = round_up(size, sizeof(void *));
+    slab_header = round_up(sizeof(slab_t), sizeof(void *));
+#endif
+}
+
+void *pool_alloc(void) {
+    if (cache.generation != generation) {
+        // Nodes cached before the last pool_destroy() no longer exist.
+        cache.head = NULL;
+        cache.count = 0;
+        cache.generation = generation;
+        pthread_setspecific(cache_key, &cache);
+    }
+    if (cache.head == NULL) {
+        pthread_mutex_lock(&pool_mutex);
+        int status = refill();
+        pthread_mutex_unlock(&pool_mutex);
+        if (status != 0) {
+            return NULL;
+        }
+    }
+    free_node_t *node = cache.head;
+    cache.head = node->next;
+    cache.count--;
+    return node;
+}
+
+void pool_free(void *ptr) {
+    free_node_t *node = (free_node_t *)ptr;
+
+    if (node == NULL) {
+        return;
+    }
+    if (cache.generation != generation) {
+        cache.head = NULL;
+        cache.count = 0;
+        cache.generation = generation;
+        pthread_setspecific(cache_key, &cache);
+    }
+    node->next = cache.head;
+    cache.head = node;
+    cache.count++;
+
+    // Spill half of an overfull cache to the depot.
+    if (cache.count >= 2 * BATCH) {
+        free_node_t *spill = cache.head;
+        free_node_t *last = spill;
+        for (size_t i = 1; i < BATCH; i++) {
+            last = last->next;
+        }
+        cache.head = last->next;
+        cache.count -= BATCH;
+        last->next = NULL;
+        pthread_mutex_lock(&pool_mutex);
+        depot_push(spill, BATCH);
+        pthread_mutex_unlock(&pool_mutex);
+    }
+}
+
+void pool_destroy(void) {
+    pthread_mutex_lock(&pool_mutex);
+    while (slabs != NULL) {
+        slab_t *next = slabs->next;
+        free(slabs);
+        slabs = next;
+    }
+    depot = NULL;
+    carve = NULL;
+    carve_left = 0;
+    generation++;
+    pthread_mutex_unlock(&pool_mutex);
+}
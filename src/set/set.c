@@ -0,0 +1,45 @@
+#include <stdio.h>
+#include <string.h>
+
+#include "set.h"
+
+static const set_backend_t *backends[] = {
+    &set_list_backend,
+    &set_skiplist_backend,
+    &set_array_backend,
+};
+
+const set_backend_t *set_backend = &set_list_backend;
+
+const set_backend_t *set_backend_find(const char *name) {
+    for (size_t i = 0; i < sizeof(backends) / sizeof(backends[0]); i++) {
+        if (strcmp(name, backends[i]->name) == 0) {
+            return backends[i];
+        }
+    }
+    fprintf(stderr, "Unknown set backend '%s' (list, skiplist, array).\n", name);
+    return NULL;
+}
+
+int set_backend_select(const char *name) {
+    const set_backend_t *backend = set_backend_find(name);
+
+    if (backend == NULL) {
+        return -1;
+    }
+    set_backend = backend;
+    return 0;
+}
+
+int set_backend_load(const int *keys, int n) {
+    if (set_backend->load == NULL) {
+        return 0;
+    }
+    return set_backend->load(keys, (size_t)n) == 0 ? 1 : -1;
+}
+
+void set_backend_seed(unsigned long seed) {
+    if (set_backend->seed != NULL) {
+        set_backend->seed(seed);
+    }
+}
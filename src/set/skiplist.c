@@ -0,0 +1,136 @@
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#include "set.h"
+
+// Enough levels for 2^20 keys at p = 1/2; taller towers are capped.
+#define SKIP_MAX_LEVEL 20
+
+// Towers have different heights, so nodes are sized individually with
+// malloc rather than taken from the fixed-size node pool.
+typedef struct skip_node {
+    int data;
+    int level;
+    struct skip_node *next[];
+} skip_node_t;
+
+static struct {
+    skip_node_t node;
+    skip_node_t *next[SKIP_MAX_LEVEL];
+} head = {{0, SKIP_MAX_LEVEL}, {NULL}};
+
+#define SKIP_DEFAULT_SEED 0x9e3779b97f4a7c15ull
+
+static int level = 1;           // levels currently in use
+static uint64_t rng_seed = SKIP_DEFAULT_SEED;
+static uint64_t rng_state = SKIP_DEFAULT_SEED;
+
+// Geometric height with p = 1/2: one coin per trailing one bit of a
+// xorshift draw.  Only inserts call this, and writers are serialized.
+static int random_level(void) {
+    rng_state ^= rng_state << 13;
+    rng_state ^= rng_state >> 7;
+    rng_state ^= rng_state << 17;
+    int height = 1 + __builtin_ctzll(~rng_state);
+    return height < SKIP_MAX_LEVEL ? height : SKIP_MAX_LEVEL;
+}
+
+// Fill update[] with the last node before value on every level and
+// return the first node with data >= value on the bottom level.
+static skip_node_t *find(int value, skip_node_t **update) {
+    skip_node_t *x = &head.node;
+
+    for (int i = level - 1; i >= 0; i--) {
+        while (x->next[i] != NULL && x->next[i]->data < value) {
+            x = x->next[i];
+        }
+        if (update != NULL) {
+            update[i] = x;
+        }
+    }
+    return x->next[0];
+}
+
+static bool skiplist_member(int value) {
+    skip_node_t *x = find(value, NULL);
+    return x != NULL && x->data == value;
+}
+
+static int skiplist_insert(int value) {
+    skip_node_t *update[SKIP_MAX_LEVEL];
+    skip_node_t *x = find(value, update);
+
+    if (x != NULL && x->data == value) {
+        return 0;
+    }
+    int height = random_level();
+    x = malloc(sizeof(skip_node_t) + height * sizeof(skip_node_t *));
+    if (x == NULL) {
+        perror("malloc");
+        return -1;
+    }
+    for (int i = level; i < height; i++) {
+        update[i] = &head.node;
+    }
+    if (height > level) {
+        level = height;
+    }
+    x->data = value;
+    x->level = height;
+    for (int i = 0; i < height; i++) {
+        x->next[i] = update[i]->next[i];
+        update[i]->next[i] = x;
+    }
+    return 1;
+}
+
+static bool skiplist_delete(int value) {
+    skip_node_t *update[SKIP_MAX_LEVEL];
+    skip_node_t *x = find(value, update);
+
+    if (x == NULL || x->data != value) {
+        return false;
+    }
+    for (int i = 0; i < x->level; i++) {
+        update[i]->next[i] = x->next[i];
+    }
+    free(x);
+    while (level > 1 && head.next[level - 1] == NULL) {
+        level--;
+    }
+    return true;
+}
+
+static void skiplist_clear(void) {
+    skip_node_t *x = head.next[0];
+
+    while (x != NULL) {
+        skip_node_t *next = x->next[0];
+        free(x);
+        x = next;
+    }
+    for (int i = 0; i < SKIP_MAX_LEVEL; i++) {
+        head.next[i] = NULL;
+    }
+    level = 1;
+    rng_state = rng_seed;
+}
+
+// Derive the xorshift state from the run seed; it must not be zero.
+static void skiplist_seed(unsigned long seed) {
+    rng_seed = ((uint64_t)seed + 1) * SKIP_DEFAULT_SEED;
+    if (rng_seed == 0) {
+        rng_seed = SKIP_DEFAULT_SEED;
+    }
+    rng_state = rng_seed;
+}
+
+const set_backend_t set_skiplist_backend = {
+    .name = "skiplist",
+    .member = skiplist_member,
+    .insert = skiplist_insert,
+    .delete = skiplist_delete,
+    .clear = skiplist_clear,
+    .seed = skiplist_seed,
+};
@@ -0,0 +1,94 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "set.h"
+
+// Keys in ascending order; grown by doubling, never shrunk until clear.
+static int *keys = NULL;
+static size_t count = 0;
+static size_t capacity = 0;
+
+// Index of the first key >= value, or count if there is none.
+static size_t lower_bound(int value) {
+    size_t lo = 0, hi = count;
+
+    while (lo < hi) {
+        size_t mid = lo + (hi - lo) / 2;
+        if (keys[mid] < value) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+
+static bool array_member(int value) {
+    size_t i = lower_bound(value);
+    return i < count && keys[i] == value;
+}
+
+static int array_insert(int value) {
+    size_t i = lower_bound(value);
+
+    if (i < count && keys[i] == value) {
+        return 0;
+    }
+    if (count == capacity) {
+        size_t grown = capacity ? 2 * capacity : 1024;
+        int *p = realloc(keys, grown * sizeof(int));
+        if (p == NULL) {
+            perror("realloc");
+            return -1;
+        }
+        keys = p;
+        capacity = grown;
+    }
+    memmove(&keys[i + 1], &keys[i], (count - i) * sizeof(int));
+    keys[i] = value;
+    count++;
+    return 1;
+}
+
+static bool array_delete(int value) {
+    size_t i = lower_bound(value);
+
+    if (i == count || keys[i] != value) {
+        return false;
+    }
+    memmove(&keys[i], &keys[i + 1], (count - i - 1) * sizeof(int));
+    count--;
+    return true;
+}
+
+// The snapshot is already in order, so it is copied in as it is.
+static int array_load(const int *values, size_t n) {
+    size_t size = n > 1024 ? n : 1024;
+
+    keys = malloc(size * sizeof(int));
+    if (keys == NULL) {
+        perror("malloc");
+        return -1;
+    }
+    memcpy(keys, values, n * sizeof(int));
+    count = n;
+    capacity = size;
+    return 0;
+}
+
+static void array_clear(void) {
+    free(keys);
+    keys = NULL;
+    count = 0;
+    capacity = 0;
+}
+
+const set_backend_t set_array_backend = {
+    .name = "array",
+    .member = array_member,
+    .insert = array_insert,
+    .delete = array_delete,
+    .clear = array_clear,
+    .load = array_load,
+};
@@ -0,0 +1,144 @@
+#define _GNU_SOURCE
+#include <sched.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "topology.h"
+
+typedef struct {
+    int cpu;
+    int socket;
+    int core;
+    int smt;        // index of this CPU among its core's hardware threads
+    int core_rank;  // index of its core among the cores of its socket
+} cpu_info_t;
+
+static pin_policy_t sort_policy;
+
+int pin_policy_parse(const char *name, pin_policy_t *policy) {
+    static const char *names[] = {"none", "compact", "scatter", "smt"};
+
+    for (int i = 0; i < (int)(sizeof(names) / sizeof(names[0])); i++) {
+        if (strcmp(name, names[i]) == 0) {
+            *policy = (pin_policy_t)i;
+            return 0;
+        }
+    }
+    fprintf(stderr, "Unknown pinning policy '%s' (none, compact, scatter, smt).\n", name);
+    return -1;
+}
+
+// Read a small integer from sysfs; -1 if it is missing, e.g. in a
+// container that hides the topology.
+static int read_topology(int cpu, const char *field) {
+    char path[128];
+    int value = -1;
+
+    snprintf(path, sizeof(path), "/sys/devices/system/cpu/cpu%d/topology/%s", cpu, field);
+    FILE *f = fopen(path, "r");
+    if (f != NULL) {
+        if (fscanf(f, "%d", &value) != 1) {
+            value = -1;
+        }
+        fclose(f);
+    }
+    return value;
+}
+
+static int compare_int(int a, int b) {
+    return (a > b) - (a < b);
+}
+
+static int compare_cpus(const void *pa, const void *pb) {
+    const cpu_info_t *a = pa;
+    const cpu_info_t *b = pb;
+    int c = 0;
+
+    switch (sort_policy) {
+        case PIN_COMPACT:
+            if ((c = compare_int(a->socket, b->socket)) == 0 &&
+                (c = compare_int(a->smt, b->smt)) == 0) {
+                c = compare_int(a->core_rank, b->core_rank);
+            }
+            break;
+        case PIN_SCATTER:
+            if ((c = compare_int(a->smt, b->smt)) == 0 &&
+                (c = compare_int(a->core_rank, b->core_rank)) == 0) {
+                c = compare_int(a->socket, b->socket);
+            }
+            break;
+        case PIN_SMT:
+        case PIN_NONE:
+            if ((c = compare_int(a->socket, b->socket)) == 0 &&
+                (c = compare_int(a->core_rank, b->core_rank)) == 0) {
+                c = compare_int(a->smt, b->smt);
+            }
+            break;
+    }
+    return c != 0 ? c : compare_int(a->cpu, b->cpu);
+}
+
+int topology_cpu_order(pin_policy_t policy, int **cpus) {
+    cpu_set_t mask;
+    int count = 0;
+
+    *cpus = NULL;
+    if (sched_getaffinity(0, sizeof(mask), &mask) != 0) {
+        perror("sched_getaffinity");
+        return 0;
+    }
+    cpu_info_t *info = malloc(CPU_COUNT(&mask) * sizeof(cpu_info_t));
+    if (info == NULL) {
+        perror("malloc");
+        return -1;
+    }
+    for (int cpu = 0; cpu < CPU_SETSIZE; cpu++) {
+        if (CPU_ISSET(cpu, &mask)) {
+            int socket = read_topology(cpu, "physical_package_id");
+            int core = read_topology(cpu, "core_id");
+            info[count].cpu = cpu;
+            info[count].socket = socket >= 0 ? socket : 0;
+            // Without topology information every CPU is its own core.
+            info[count].core = core >= 0 ? core : cpu;
+            count++;
+        }
+    }
+
+    // CPUs are visited in ascending order, so the first CPU seen on a
+    // (socket, core) pair is its hardware thread 0, the next one 1, ...
+    // The first time a socket shows a core, that core gets the next rank.
+    for (int i = 0; i < count; i++) {
+        info[i].smt = 0;
+        info[i].core_rank = 0;
+        int seen_core = 0;
+        for (int j = 0; j < i; j++) {
+            if (info[j].socket != info[i].socket) {
+                continue;
+            }
+            if (info[j].core == info[i].core) {
+                info[i].smt++;
+                if (!seen_core) {
+                    info[i].core_rank = info[j].core_rank;
+                    seen_core = 1;
+                }
+            } else if (!seen_core && info[j].smt == 0) {
+                info[i].core_rank++;
+            }
+        }
+    }
+
+    sort_policy = policy;
+    qsort(info, count, sizeof(cpu_info_t), compare_cpus);
+    *cpus = malloc(count * sizeof(int));
+    if (*cpus == NULL) {
+        perror("malloc");
+        free(info);
+        return -1;
+    }
+    for (int i = 0; i < count; i++) {
+        (*cpus)[i] = info[i].cpu;
+    }
+    free(info);
+    return count;
+}
@@ -1,6 +1,13 @@
+#include <stdint.h>
 #include <stdlib.h>
 #include "utils.h"
 
-int generate_random_value() {
-    return rand() % (1 << 16);
+int generate_random_value(int range) {
+    if (range <= (1 << 16)) {
+        return rand() % range;
+    }
+    // One rand() has only 31 bits; combine two so that large ranges
+    // are covered without a noticeable modulo bias.
+    uint64_t wide = ((uint64_t)rand() << 31) | (uint64_t)rand();
+    return (int)(wide % (uint64_t)range);
 }
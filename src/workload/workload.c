@@ -1,24 +1,247 @@
 
 
+#include <math.h>
+#include <stdbool.h>
+#include <stdint.h>
 #include <stdlib.h>
 #include <stdio.h>
 #include <string.h>
 #include <time.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
 
+#include "utils.h"
 #include "workload.h"
 
+// Multiplier of the bijection rank -> key.  It is prime and larger
+// than any key range, so it is coprime with the range.
+#define SCATTER_PRIME 2654435761ull
+
+static const char *key_dist_names[] = {"uniform", "zipf", "hotset", "sequential"};
+
+int key_dist_parse(const char *spec, key_dist_t *dist) {
+    const char *colon = strchr(spec, ':');
+    size_t len = colon != NULL ? (size_t)(colon - spec) : strlen(spec);
+    int found = -1;
+
+    for (int i = 0; i < (int)(sizeof(key_dist_names) / sizeof(key_dist_names[0])); i++) {
+        if (strlen(key_dist_names[i]) == len && strncmp(spec, key_dist_names[i], len) == 0) {
+            found = i;
+        }
+    }
+    if (found < 0) {
+        fprintf(stderr, "Unknown key distribution '%s' (uniform, zipf[:THETA], "
+                        "hotset[:FRAC[:PROB]], sequential).\n", spec);
+        return -1;
+    }
+    dist->type = (key_dist_type_t)found;
+    if (dist->type == KEY_DIST_ZIPF) {
+        dist->theta = 0.99;
+        bool ok = colon == NULL || sscanf(colon + 1, "%lf", &dist->theta) == 1;
+        if (!ok || dist->theta < 0) {
+            fprintf(stderr, "Invalid Zipf parameter in '%s'.\n", spec);
+            return -1;
+        }
+    } else if (dist->type == KEY_DIST_HOTSET) {
+        dist->hot_fraction = 0.2;
+        dist->hot_prob = 0.8;
+        bool ok = colon == NULL ||
+                  sscanf(colon + 1, "%lf:%lf", &dist->hot_fraction, &dist->hot_prob) >= 1;
+        if (!ok || dist->hot_fraction <= 0 || dist->hot_fraction >= 1 ||
+            dist->hot_prob < 0 || dist->hot_prob > 1) {
+            fprintf(stderr, "Invalid hot-set parameters in '%s'.\n", spec);
+            return -1;
+        }
+    } else if (colon != NULL) {
+        fprintf(stderr, "Key distribution '%s' takes no parameters.\n", key_dist_names[found]);
+        return -1;
+    }
+    return 0;
+}
+
+int key_dist_validate(const key_dist_t *dist, long n) {
+    if (dist->key_range <= 0 || dist->key_range > WORKLOAD_MAX_KEY_RANGE) {
+        fprintf(stderr, "Key range must be between 1 and %d.\n", WORKLOAD_MAX_KEY_RANGE);
+        return -1;
+    }
+    if (n < 0 || n > dist->key_range) {
+        fprintf(stderr, "Number of initial nodes must be between 0 and the key range (%d).\n",
+                dist->key_range);
+        return -1;
+    }
+    if (dist->type == KEY_DIST_ZIPF && dist->key_range > WORKLOAD_MAX_ZIPF_RANGE) {
+        fprintf(stderr, "Zipf keys support a key range of at most %d.\n", WORKLOAD_MAX_ZIPF_RANGE);
+        return -1;
+    }
+    return 0;
+}
+
+void key_dist_format(const key_dist_t *dist, char *buf, size_t size) {
+    switch (dist->type) {
+        case KEY_DIST_ZIPF:
+            snprintf(buf, size, "zipf:%g", dist->theta);
+            break;
+        case KEY_DIST_HOTSET:
+            snprintf(buf, size, "hotset:%g:%g", dist->hot_fraction, dist->hot_prob);
+            break;
+        default:
+            snprintf(buf, size, "%s", key_dist_names[dist->type]);
+            break;
+    }
+}
+
+static double random_unit(void) {
+    return rand() / ((double)RAND_MAX + 1.0);
+}
+
+// Map popularity ranks onto keys.  Multiplying by a number coprime with
+// the range is a bijection; the +1 keeps rank 0 off key 0, the list head.
+static int scatter(uint64_t rank, int key_range) {
+    return (int)((rank + 1) * SCATTER_PRIME % (uint64_t)key_range);
+}
+
+// Walker/Vose alias table for ranks 0..n-1 with weight 1/(rank+1)^theta.
+// Building it calls pow() once per rank; drawing a rank afterwards is
+// one table lookup and one comparison.
+typedef struct {
+    float *prob;
+    uint32_t *alias;
+    int n;
+} alias_table_t;
+
+// Returns -1 if there is no memory for the table.
+static int zipf_table_init(alias_table_t *t, int n, double theta) {
+    double *scaled = malloc(n * sizeof(double));
+    uint32_t *small = malloc(n * sizeof(uint32_t));
+    uint32_t *large = malloc(n * sizeof(uint32_t));
+    t->prob = malloc(n * sizeof(float));
+    t->alias = malloc(n * sizeof(uint32_t));
+    t->n = n;
+    if (scaled == NULL || small == NULL || large == NULL || t->prob == NULL || t->alias == NULL) {
+        perror("malloc");
+        free(t->alias);
+        free(t->prob);
+        free(large);
+        free(small);
+        free(scaled);
+        return -1;
+    }
+
+    double sum = 0;
+    for (int i = 0; i < n; i++) {
+        scaled[i] = 1.0 / pow(i + 1, theta);
+        sum += scaled[i];
+    }
+    int n_small = 0, n_large = 0;
+    for (int i = 0; i < n; i++) {
+        scaled[i] *= n / sum;
+        if (scaled[i] < 1.0) {
+            small[n_small++] = i;
+        } else {
+            large[n_large++] = i;
+        }
+    }
+    while (n_small > 0 && n_large > 0) {
+        uint32_t s = small[--n_small];
+        uint32_t l = large[--n_large];
+        t->prob[s] = (float)scaled[s];
+        t->alias[s] = l;
+        scaled[l] -= 1.0 - scaled[s];
+        if (scaled[l] < 1.0) {
+            small[n_small++] = l;
+        } else {
+            large[n_large++] = l;
+        }
+    }
+    // Whatever is left is 1 up to rounding error.
+    while (n_large > 0) {
+        uint32_t l = large[--n_large];
+        t->prob[l] = 1.0f;
+        t->alias[l] = l;
+    }
+    while (n_small > 0) {
+        uint32_t s = small[--n_small];
+        t->prob[s] = 1.0f;
+        t->alias[s] = s;
+    }
+    free(large);
+    free(small);
+    free(scaled);
+    return 0;
+}
+
+static int zipf_table_draw(const alias_table_t *t) {
+    int i = generate_random_value(t->n);
+    return random_unit() < t->prob[i] ? i : (int)t->alias[i];
+}
+
+static void zipf_table_destroy(alias_table_t *t) {
+    free(t->prob);
+    free(t->alias);
+}
+
+// Fill in the keys of ops[0..m) according to dist; -1 if out of memory.
+static int assign_keys(operation_t *ops, size_t m, const key_dist_t *dist) {
+    int range = dist->key_range;
+    alias_table_t zipf;
+    int hot_n;
+
+    switch (dist->type) {
+        case KEY_DIST_UNIFORM:
+            for (size_t i = 0; i < m; i++) {
+                ops[i].key = generate_random_value(range);
+            }
+            break;
+        case KEY_DIST_ZIPF:
+            if (zipf_table_init(&zipf, range, dist->theta) != 0) {
+                return -1;
+            }
+            for (size_t i = 0; i < m; i++) {
+                ops[i].key = scatter(zipf_table_draw(&zipf), range);
+            }
+            zipf_table_destroy(&zipf);
+            break;
+        case KEY_DIST_HOTSET:
+            hot_n = (int)(range * dist->hot_fraction);
+            if (hot_n < 1) {
+                hot_n = 1;
+            }
+            for (size_t i = 0; i < m; i++) {
+                int rank;
+                if (random_unit() < dist->hot_prob || hot_n == range) {
+                    rank = generate_random_value(hot_n);
+                } else {
+                    rank = hot_n + generate_random_value(range - hot_n);
+                }
+                ops[i].key = scatter(rank, range);
+            }
+            break;
+        case KEY_DIST_SEQUENTIAL:
+            for (size_t i = 0; i < m; i++) {
+                ops[i].key = (int)(i % (size_t)range);
+            }
+            break;
+    }
+    return 0;
+}
+
 operation_t *generate_operations(size_t m,
                                  double m_member_frac,
                                  double m_insert_frac,
-                                 double m_delete_frac)
+                                 double m_delete_frac,
+                                 const key_dist_t *dist)
 {
+    static const key_dist_t uniform = KEY_DIST_DEFAULT;
+
     if (m == 0) {
         return NULL;
     }
     operation_t *ops = (operation_t *)malloc(m * sizeof(operation_t));
     if (!ops) {
         perror("malloc");
-        exit(EXIT_FAILURE);
+        return NULL;
     }
 
     size_t m_member = (size_t)((double)m * m_member_frac);
@@ -39,10 +262,11 @@ operation_t *generate_operations(size_t m,
     for (size_t i = 0; i < m_delete; i++, index++) {
         ops[index].type = OP_DELETE;
     }
-    // Assign random keys.  Keys are always set before shuffling to
-    // avoid biasing key distribution by operation type.
-    for (size_t i = 0; i < m; i++) {
-        ops[i].key = rand() & 0xFFFF; // 0–65535 inclusive
+    // Assign keys.  Keys are always set before shuffling to avoid
+    // biasing key distribution by operation type.
+    if (assign_keys(ops, m, dist != NULL ? dist : &uniform) != 0) {
+        free(ops);
+        return NULL;
     }
    
     for (size_t i = m - 1; i > 0; i--) {
@@ -56,4 +280,186 @@ operation_t *generate_operations(size_t m,
 
 void free_operations(operation_t *ops) {
     free(ops);
-}
\ No newline at end of file
+}
+
+// Draw n unique random keys and return them in ascending order.
+int *generate_initial_keys(int n, int key_range) {
+    // One bit per key, so that large key ranges stay affordable.
+    unsigned char *seen = calloc(key_range / 8 + 1, 1);
+    int *keys = malloc((n > 0 ? n : 1) * sizeof(int));
+    if (seen == NULL || keys == NULL) {
+        perror("malloc");
+        free(keys);
+        free(seen);
+        return NULL;
+    }
+    int count = 0;
+    while (count < n) {
+        int value = generate_random_value(key_range);
+        unsigned char bit = 1u << (value % 8);
+        if (!(seen[value / 8] & bit)) {
+            seen[value / 8] |= bit;
+            count++;
+        }
+    }
+    count = 0;
+    for (int value = 0; value < key_range; value++) {
+        if (seen[value / 8] & (1u << (value % 8))) {
+            keys[count++] = value;
+        }
+    }
+    free(seen);
+    return keys;
+}
+
+// The records are mapped straight from disk, so their layout is the file format.
+_Static_assert(sizeof(operation_t) == 8, "operation_t must be an 8-byte record");
+
+static int write_all(FILE *f, const void *data, size_t size) {
+    return size == 0 || fwrite(data, 1, size, f) == size ? 0 : -1;
+}
+
+int workload_write(const char *path, const workload_header_t *params,
+                   const int *keys, const operation_t *ops) {
+    static const char padding[8];
+    workload_header_t header = *params;
+    size_t keys_size = header.n * sizeof(int);
+
+    memset(header.magic, 0, sizeof(header.magic));
+    memcpy(header.magic, WORKLOAD_MAGIC, sizeof(WORKLOAD_MAGIC));
+    header.version = WORKLOAD_VERSION;
+    header.header_size = sizeof(header);
+    header.keys_offset = sizeof(header);
+    header.ops_offset = (header.keys_offset + keys_size + 7) & ~(uint64_t)7;
+
+    FILE *f = fopen(path, "wb");
+    if (f == NULL) {
+        perror(path);
+        return -1;
+    }
+    if (write_all(f, &header, sizeof(header)) != 0 ||
+        write_all(f, keys, keys_size) != 0 ||
+        write_all(f, padding, header.ops_offset - header.keys_offset - keys_size) != 0 ||
+        write_all(f, ops, header.m * sizeof(operation_t)) != 0) {
+        perror(path);
+        fclose(f);
+        return -1;
+    }
+    if (fclose(f) != 0) {
+        perror(path);
+        return -1;
+    }
+    return 0;
+}
+
+// Check the records of a mapped file against its header: the harness
+// builds the list straight from the keys, which must be a sorted
+// snapshot strictly between the sentinels, and indexes per-type arrays
+// by op type.  NULL if they are sound, else what is wrong, in detail.
+static const char *check_records(const workload_header_t *h, const void *map, char *detail,
+                                 size_t size) {
+    const int *keys = (const int *)((const char *)map + h->keys_offset);
+    const operation_t *ops = (const operation_t *)((const char *)map + h->ops_offset);
+    int range = (int)h->key_range;
+
+    if (h->key_range == 0 || h->key_range > WORKLOAD_MAX_KEY_RANGE) {
+        snprintf(detail, size, "key range %u is not between 1 and %d", (unsigned int)h->key_range,
+                 WORKLOAD_MAX_KEY_RANGE);
+        return detail;
+    }
+    if (h->n > h->key_range) {
+        snprintf(detail, size, "%llu initial keys do not fit the key range %d",
+                 (unsigned long long)h->n, range);
+        return detail;
+    }
+    for (uint64_t i = 0; i < h->n; i++) {
+        if (keys[i] < 0 || keys[i] >= range || (i > 0 && keys[i] <= keys[i - 1])) {
+            snprintf(detail, size, "initial key %llu (%d) is out of order or outside [0, %d)",
+                     (unsigned long long)i, keys[i], range);
+            return detail;
+        }
+    }
+    for (uint64_t i = 0; i < h->m; i++) {
+        if ((unsigned int)ops[i].type > OP_DELETE) {
+            snprintf(detail, size, "operation %llu has invalid type %u", (unsigned long long)i,
+                     (unsigned int)ops[i].type);
+            return detail;
+        }
+        if (ops[i].key < 0 || ops[i].key >= range) {
+            snprintf(detail, size, "operation %llu has key %d outside [0, %d)",
+                     (unsigned long long)i, ops[i].key, range);
+            return detail;
+        }
+    }
+    return NULL;
+}
+
+int workload_map(const char *path, workload_file_t *wl) {
+    struct stat st;
+    int flags = MAP_PRIVATE;
+    int fd = open(path, O_RDONLY);
+
+    memset(wl, 0, sizeof(*wl));
+    if (fd < 0 || fstat(fd, &st) != 0) {
+        perror(path);
+        if (fd >= 0) {
+            close(fd);
+        }
+        return -1;
+    }
+    if ((size_t)st.st_size < sizeof(workload_header_t)) {
+        fprintf(stderr, "%s: not a workload file\n", path);
+        close(fd);
+        return -1;
+    }
+#ifdef MAP_POPULATE
+    // Fault the whole file in now rather than inside the timed region.
+    flags |= MAP_POPULATE;
+#endif
+    void *map = mmap(NULL, st.st_size, PROT_READ, flags, fd, 0);
+    close(fd);
+    if (map == MAP_FAILED) {
+        perror(path);
+        return -1;
+    }
+
+    const workload_header_t *h = map;
+    const char *error = NULL;
+    char detail[96];
+    if (memcmp(h->magic, WORKLOAD_MAGIC, sizeof(WORKLOAD_MAGIC)) != 0) {
+        error = "not a workload file";
+    } else if (h->version != WORKLOAD_VERSION || h->header_size != sizeof(*h)) {
+        error = "unsupported workload file version";
+    } else if (h->ops_offset % 8 != 0 || h->keys_offset % sizeof(int) != 0 ||
+               h->keys_offset > (uint64_t)st.st_size || h->ops_offset > (uint64_t)st.st_size ||
+               h->n > (uint64_t)st.st_size / sizeof(int) ||
+               h->m > (uint64_t)st.st_size / sizeof(operation_t) ||
+               h->keys_offset + h->n * sizeof(int) > h->ops_offset ||
+               h->ops_offset + h->m * sizeof(operation_t) > (uint64_t)st.st_size) {
+        error = "truncated or corrupt workload file";
+    } else if (h->key_dist >= KEY_DIST_COUNT) {
+        snprintf(detail, sizeof(detail), "unknown key distribution %u", (unsigned int)h->key_dist);
+        error = detail;
+    } else {
+        error = check_records(h, map, detail, sizeof(detail));
+    }
+    if (error != NULL) {
+        fprintf(stderr, "%s: %s\n", path, error);
+        munmap(map, st.st_size);
+        return -1;
+    }
+
+    wl->header = h;
+    wl->keys = (const int *)((const char *)map + h->keys_offset);
+    wl->ops = (const operation_t *)((const char *)map + h->ops_offset);
+    wl->map = map;
+    wl->map_size = st.st_size;
+    return 0;
+}
+
+void workload_unmap(workload_file_t *wl) {
+    if (wl->map != NULL) {
+        munmap(wl->map, wl->map_size);
+    }
+    memset(wl, 0, sizeof(*wl));
+}
@@ -0,0 +1,94 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <getopt.h>
+#include "workload.h"
+
+// Write a workload file for the linked list programs' --workload option.
+// Keys and operations are drawn exactly as the programs draw them, so
+// "--seed S" here and "--seed S" on a program produce the same work.
+
+static void usage(const char *prog) {
+    fprintf(stderr, "Usage: %s [--seed S] [--keys SPEC] [--key-range R] <output> <n_initial_nodes> <n_total_operations> <member_frac> <insert_frac> <delete_frac>\n", prog);
+}
+
+int main(int argc, char *argv[]) {
+    static const struct option long_opts[] = {
+        {"seed", required_argument, NULL, 's'},
+        {"keys", required_argument, NULL, 'k'},
+        {"key-range", required_argument, NULL, 'r'},
+        {"help", no_argument, NULL, 'h'},
+        {NULL, 0, NULL, 0}
+    };
+    workload_header_t header;
+    key_dist_t keys = KEY_DIST_DEFAULT;
+    int c;
+
+    memset(&header, 0, sizeof(header));
+    header.seed = (uint64_t)time(NULL);
+    while ((c = getopt_long(argc, argv, "", long_opts, NULL)) != -1) {
+        switch (c) {
+            case 's':
+                header.seed = strtoul(optarg, NULL, 10);
+                break;
+            case 'k':
+                if (key_dist_parse(optarg, &keys) != 0) {
+                    return 1;
+                }
+                break;
+            case 'r':
+                keys.key_range = atoi(optarg);
+                break;
+            default:
+                usage(argv[0]);
+                return 1;
+        }
+    }
+    if (argc - optind != 6) {
+        usage(argv[0]);
+        return 1;
+    }
+
+    const char *path = argv[optind];
+    int n = atoi(argv[optind + 1]);
+    long m = atol(argv[optind + 2]);
+    header.member_frac = atof(argv[optind + 3]);
+    header.insert_frac = atof(argv[optind + 4]);
+    header.delete_frac = atof(argv[optind + 5]);
+    if (m <= 0) {
+        fprintf(stderr, "Number of operations must be positive.\n");
+        return 1;
+    }
+    if (key_dist_validate(&keys, n) != 0) {
+        return 1;
+    }
+    header.n = n;
+    header.m = m;
+    header.key_dist = keys.type;
+    header.key_range = keys.key_range;
+    header.theta = keys.theta;
+    header.hot_fraction = keys.hot_fraction;
+    header.hot_prob = keys.hot_prob;
+
+    srand((unsigned int)header.seed);
+    int *initial_keys = generate_initial_keys(n, keys.key_range);
+    operation_t *ops = generate_operations(m, header.member_frac, header.insert_frac,
+                                           header.delete_frac, &keys);
+    if (initial_keys == NULL || ops == NULL) {
+        free_operations(ops);
+        free(initial_keys);
+        return 1;
+    }
+    int status = workload_write(path, &header, initial_keys, ops);
+    free_operations(ops);
+    free(initial_keys);
+    if (status != 0) {
+        return 1;
+    }
+    char spec[64];
+    key_dist_format(&keys, spec, sizeof(spec));
+    printf("Wrote %s: n=%d m=%ld keys=%s range=%d seed=%lu\n", path, n, m, spec, keys.key_range,
+           (unsigned long)header.seed);
+    return 0;
+}